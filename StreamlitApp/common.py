@@ -0,0 +1,130 @@
+# Helpers shared by the pages of the app: figures, live tables and precomputed features. Only light
+# modules are imported here; pandas, scikit-learn and the other heavy dependencies are imported by the
+# helpers and pages that use them, so a page only pays for what it shows.
+import streamlit as st
+import functools
+import os
+import sys
+import threading
+
+# Directories
+current_dir = os.path.dirname(os.path.abspath(__file__))
+figures_dir = os.path.join(current_dir, 'Figures')
+sys.path.append(os.path.dirname(current_dir))
+
+from piu.assets import FigureStore, DEFAULT_WIDTH
+from piu import metrics
+
+# Display widths offered for the figures (None keeps the original resolution)
+figure_widths = {"Standard": DEFAULT_WIDTH, "Compact": 800, "Original": None}
+
+# One figure store per server process, shared by every session
+_figure_store = None
+
+@st.cache_resource
+def figure_store():
+    global _figure_store
+    _figure_store = FigureStore(figures_dir)
+    return _figure_store
+
+# Hit/miss counts of the current figure store, exported by one collector whatever the number of stores
+# created (clearing the resource cache creates a new one)
+def figure_store_counts():
+    store = _figure_store
+    return (0, 0) if store is None else (store.hits, store.misses)
+
+metrics.REGISTRY.add_collector(metrics.cache_collector("figures", figure_store_counts), key="figures")
+
+# Serve a figure from the store, downscaled to the selected width
+def show_figure(name, caption=None, use_column_width=False):
+    width = figure_widths[st.session_state.get("figure_size", "Standard")]
+    image = figure_store().get(name, width)
+    metrics.REGISTRY.inc("piu_image_bytes_total", len(image))
+    st.image(image, caption=caption, use_column_width=use_column_width)
+
+# st.cache_data with hit/miss counters: a lookup that runs the function body is a miss. Streamlit computes
+# a missing value in the calling thread, so a thread-local flag tells the two apart.
+_cache_lookup = threading.local()
+
+def counted_cache_data(name):
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _cache_lookup.missed = True
+            return func(*args, **kwargs)
+
+        cached = st.cache_data(compute)
+
+        @functools.wraps(func)
+        def lookup(*args, **kwargs):
+            _cache_lookup.missed = False
+            value = cached(*args, **kwargs)
+            result = "miss" if _cache_lookup.missed else "hit"
+            metrics.REGISTRY.inc("piu_cache_requests_total", cache=name, result=result)
+            return value
+
+        lookup.clear = cached.clear
+        return lookup
+    return decorate
+
+# Metrics endpoint / file exporters configured by the PIU_METRICS_* environment variables, started once
+@st.cache_resource
+def metrics_exporters():
+    return metrics.start_exporters()
+
+# Counts per age group x sex x sii x internet use, updated from the new participants only
+@st.cache_resource
+def aggregate_cube(source, source_key):
+    from piu import cube
+    return cube.load_cube(source)
+
+# Live tables, recomputed only when the underlying csv file changes on disk
+@counted_cache_data("tables")
+def live_table(name, source, source_key):
+    from piu import data, tables
+    frame = aggregate_cube(source, source_key) if name in tables.CUBE_TABLES else data.load(source)
+    return tables.to_markdown(getattr(tables, name)(frame))
+
+def show_table(name, source):
+    from piu import data
+    st.markdown(live_table(name, source, data.source_key(source)))
+
+# Precomputed preprocessing stages (encoded/scaled features, PCs) from the feature store
+@st.cache_resource
+def feature_stage(stage, source_key):
+    from piu.features import FeatureStore
+    return FeatureStore("cleaned").get(stage)
+
+# Repeated stratified k-fold results of the Modeling configs, read from the evaluation cache only: the
+# cross-validation itself is run offline (`python -m piu.evaluation`), never inside a page request
+CV_COMMAND = "python -m piu.evaluation gbm_default gbm rf hgb ordinal --jobs -1"
+STACKING_COMMAND = "python -m piu.stacking gbm rf --no-refit --jobs -1"
+
+def cv_results():
+    from piu import evaluation
+    return evaluation.cached_results(list(evaluation.CONFIGS))
+
+def cv_missing_notice():
+    st.info(f"The cross-validation results are not computed yet. Run `{CV_COMMAND}` to show them.")
+
+# Base models and stacking / soft-voting ensembles of GBM and RF, on their cached out-of-fold predictions;
+# only the meta-learners are fitted here, once per version of the training data. Missing predictions
+# raise FileNotFoundError, which is not cached, so the results show up once `python -m piu.stacking` ran
+@st.cache_resource
+def stacking_results(source_hash):
+    from piu import stacking
+    results = {}
+    for meta in stacking.META_LEARNERS:
+        ensemble = stacking.StackingEnsemble(["gbm", "rf"], meta).fit(refit=False, compute=False)
+        *base, combined = ensemble.cv_results()
+        results.update({result.name: result for result in base})
+        results[meta] = combined
+    return results
+
+# The ensemble results, or None when `python -m piu.stacking` has not been run
+def ensemble_results():
+    from piu.features import file_hash
+    try:
+        return stacking_results(file_hash("cleaned"))
+    except FileNotFoundError:
+        return None
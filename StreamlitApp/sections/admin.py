@@ -0,0 +1,38 @@
+import streamlit as st
+
+from piu import metrics
+
+# Performance Section
+def performance():
+    import pandas as pd
+
+    st.header("Performance")
+    st.markdown("""
+        Rolling timings of the last page runs of this server process (all sessions), cache counters, figure
+        bytes and memory. The same numbers are exported in the Prometheus text format when `PIU_METRICS_PORT`
+        or `PIU_METRICS_FILE` is set.
+        """)
+    samples = metrics.REGISTRY.samples()
+    rss = sum(value for name, _, _, value in samples if name == "piu_process_resident_memory_bytes")
+    image_bytes = sum(value for name, _, _, value in samples if name == "piu_image_bytes_total")
+    columns = st.columns(2)
+    columns[0].metric("Process RSS", f"{rss / 2 ** 20:.0f} MiB")
+    columns[1].metric("Figure bytes sent", f"{image_bytes / 2 ** 20:.1f} MiB")
+
+    st.markdown("### Page runs")
+    pages = pd.DataFrame(metrics.REGISTRY.summaries("piu_page_seconds"))
+    if len(pages):
+        st.dataframe(pages.sort_values("p95_ms", ascending=False).round(1), hide_index=True)
+
+    st.markdown("### Caches")
+    caches = pd.DataFrame([{**dict(labels), "requests": value} for name, _, labels, value in samples
+                           if name == "piu_cache_requests_total"])
+    if len(caches):
+        caches = caches.pivot_table(index="cache", columns="result", values="requests", fill_value=0)
+        caches["hit rate (%)"] = 100 * caches.get("hit", 0) / caches.sum(axis=1).where(lambda t: t > 0)
+        st.dataframe(caches.round(1))
+
+    with st.expander("Prometheus text"):
+        st.code(metrics.REGISTRY.render(), language="text")
+
+performance()
@@ -0,0 +1,466 @@
+import streamlit as st
+
+from common import aggregate_cube, counted_cache_data, show_figure, show_table
+from piu import data, tables
+
+# Interactive EDA explorer: charts are drawn from compact summaries aggregated on the server and
+# cached per (feature, filter combination, data version)
+@counted_cache_data("explorer")
+def explorer_summary(column, age_groups, sexes, sii_values, source_key):
+    from piu import aggregates
+    import numpy as np
+    df = data.load("train_df", columns=aggregates.FILTER_COLUMNS + [column])
+    values = df[column].to_numpy(dtype="float64", na_value=np.nan)
+    value_range = (np.nanmin(values), np.nanmax(values))
+    selected = df[aggregates.filter_mask(df, age_groups, sexes, sii_values)]
+    if selected.empty:
+        return {"rows": 0}
+    return {
+        "rows": len(selected),
+        "histogram": aggregates.histogram(selected[column], bins=30, value_range=value_range),
+        "box": aggregates.box_stats(selected, column, "sii"),
+        "describe": aggregates.describe(selected, [column]),
+        "crosstab": aggregate_cube("train_df", source_key).table(
+            "age_group", "sii", age_group=list(age_groups), sex=list(sexes), sii=list(sii_values)).rename(
+            columns=lambda v: tables.SII_LABELS.get(v, v)),
+    }
+
+def eda_explorer(key, columns):
+    import altair as alt
+    with st.expander("Interactive explorer (filter by age group, sex and sii)"):
+        filters = st.columns(4)
+        column = filters[0].selectbox("Feature", columns, key=f"{key}_column")
+        age_groups = filters[1].multiselect("Age group", tables.AGE_GROUPS, default=tables.AGE_GROUPS,
+                                            key=f"{key}_age")
+        sexes = filters[2].multiselect("Sex", list(tables.SEX_LABELS), default=list(tables.SEX_LABELS),
+                                       format_func=tables.SEX_LABELS.get, key=f"{key}_sex")
+        sii_options = list(tables.SII_LABELS) + [tables.MISSING]
+        sii_values = filters[3].multiselect("sii", sii_options, default=sii_options,
+                                            format_func=lambda v: tables.SII_LABELS.get(v, v), key=f"{key}_sii")
+        summary = explorer_summary(column, tuple(age_groups), tuple(sexes), tuple(sii_values),
+                                   data.source_key("train_df"))
+        if not summary["rows"]:
+            st.info("No participants match the selected filters.")
+            return
+
+        charts = st.columns(2)
+        histogram = alt.Chart(summary["histogram"]).mark_bar().encode(
+            x=alt.X("bin_start:Q", bin="binned", title=column), x2="bin_end:Q", y=alt.Y("count:Q", title="Count"))
+        charts[0].altair_chart(histogram, use_container_width=True)
+        box = alt.Chart(summary["box"]).encode(x=alt.X("group:N", title="sii", sort=None))
+        box = (box.mark_rule().encode(y=alt.Y("whisker_low:Q", title=column), y2="whisker_high:Q")
+               + box.mark_bar(size=30).encode(y="q1:Q", y2="q3:Q")
+               + box.mark_tick(color="white", size=30).encode(y="median:Q"))
+        charts[1].altair_chart(box, use_container_width=True)
+        st.dataframe(summary["describe"])
+        st.dataframe(summary["crosstab"])
+
+# EDA Section
+def eda():
+    st.header("Exploratory Data Analysis (EDA)")
+
+    # Subsections within EDA
+    eda_subsections = ["Age & Gender", "SII and PCIAT", "Internet Use", "Children Global Assessment Scale", 
+                       "Physical Measures", "Bioelectric Impedance Analysis", "FitnessGram", "Sleep Disturbance", 
+                       "Physical Activity Questionnaire"]
+    eda_selected = st.selectbox("Select EDA subsection", eda_subsections)
+    if eda_selected == "Age & Gender":
+        age_gender()
+    elif eda_selected == "SII and PCIAT":
+        sii_pciat_visualization()
+    elif eda_selected == "Internet Use":
+        internet_use()
+    elif eda_selected == "Children Global Assessment Scale":
+        cgas_analysis()
+    elif eda_selected == "Physical Measures":
+        physical_measure_analysis()
+    elif eda_selected == "Bioelectric Impedance Analysis":
+        bia_analysis()
+    elif eda_selected == "FitnessGram":
+        FitnessGram()
+    elif eda_selected == "Sleep Disturbance":
+        sleep_analysis()
+    elif eda_selected == "Physical Activity Questionnaire":
+        paq_analysis()
+
+# Age and Gender Subsection
+def age_gender():
+    st.write("Let's first take a quick look at the basic demographics.")
+    st.markdown("## Age Group Distribution")
+    show_table("age_group_counts", "train")
+    st.markdown("## Sex Category Distribution")
+    show_table("sex_counts", "train")
+    show_figure("Gender.png", use_column_width=True)
+    st.markdown("""
+    **Notes:**
+    - The distribution of enrollment by season is relatively balanced.
+    - There is a higher number of males across most age groups, with fewer females particularly visible in younger 
+    age groups.
+    """)
+
+# SII and PCIAT Visualization Subsection
+def sii_pciat_visualization():
+    st.subheader("Severity Impairment Index (SII) Parent-Child Internet Addiction Test (PCIAT) Total Score Visualization")
+    st.markdown("""
+        Let's have a brief overview of SII and PCIAT:
+        
+        The Severity Impairment Index (SII) is a measure used to assess the level of impairment caused by a 
+        particular condition or behavior. In the context of internet addiction or other behavioral studies, the 
+        SII evaluates the severity of the impairment in daily functioning caused by the condition. It quantifies
+        the degree to which an individual’s life is disrupted by the behavior, such as problematic internet use,
+        by considering factors like emotional distress, relationship issues, academic or work performance, and 
+        overall well-being.
+        
+        The Parent-Child Internet Addiction Test (PCIAT) assesses internet addiction in children and adolescents by 
+        combining self-assessment from the child and observations from the parent. It covers topics like time spent 
+        online, emotional impact, and consequences on daily life, school, and social interactions. The test aims to
+        provide a comprehensive view of internet use and its effects from both perspectives. In the present, scores 
+        for 20 questions are provided with missing values that cuase reduction in the total score.
+        """)
+    st.write("Here you will find visualizations of SII/PCIAT distribution and related statistics.")
+    show_figure("Distribution of SII.png", use_column_width=True)
+    show_figure("Distribution of PCIAT_Total.png", use_column_width=True)
+    st.markdown("""
+    **Notes:**
+    - 40% of the samples are not affected by the Internet use.
+    - 31% of the samples are not evaluated at all, which is quite a large missingness value!
+    - Only ~10% of the samples are affected by internet use moderately or severely.
+    - 446 samples scored 0 on all PCIAT questions.
+    """)
+    st.write("Now, let's take a closer look here!")
+    show_figure("SII and PCIAT_Total Box.png", use_column_width=True)
+    show_figure("SII by Age Pi-Chart.png", use_column_width=True)
+    st.markdown("Tabular statistics of SII")
+    show_table("sii_by_age_group", "train_df")
+    st.markdown("""
+        **Notes:**
+        - Higher sii scores are generally associated with older age groups.
+        - There is an increasing-decreasing trend seen in the box plots of PCIAT_Total scores with age groups indicating
+        that the peak of internet-related problems occur during teenage period.
+        - Based on the pie-chart, 
+            - sii scores are more skewed towards the None and Mild categories.
+            - Young adults have a significant missingness.
+            - Teenagers seem to have more balanced categories.
+            """)
+
+# Internet Use Subsection
+def internet_use():
+    st.subheader("Internet Use Analysis")
+    st.write("Here you will find visualizations of the internet use distribution and related statistics.")
+    show_figure("Internet Use Box.png", use_column_width=True)
+    show_figure("Internet Use Pi.png", use_column_width=True)
+    show_table("internet_use_by_sex", "train")
+    st.markdown("""
+    **Notes:**
+    - Based on the bar plots, 16.6% of the Internet usage data is missing. 38.5% of samples used the Internet less 
+    than hour a day.
+    - Box plots shows that higher daily internet use is correlated with older age. However, considerable overlap 
+    in age ranges within each Internet usage category is observed.
+    - The pie charts for age groups are well aligned and shows the same.
+    - Internet use in both genders is almost similar.
+    """)
+    show_figure("Internet Use Box2.png", use_column_width=True)
+    show_figure("Internet Use Pi2.png", use_column_width=True)
+    st.markdown("""
+                **Notes:**
+                - In the box plots, despite the considerable overlap between the different SII and internet use categories,
+                we see a positive trend between PIU impairment and internet use, with people with higher SII scores spending
+                more time online.
+                - However, when the relationship between PCIAT_Total and hours of Internet use is further broken down
+                by age group (bottom boxplot), the non-linear relationship between age, Internet use and PCIAT_Total 
+                score emerges, with adolescents standing out as the most affected age group across all categories of 
+                Internet use.
+                - The pie charts also show that there is a significant proportion of participants (83 in total),
+                of all ages, who spend very little time online (less than 1 hour per day) but have high SII scores 
+                (20.7% with SII 2 - moderately impaired and 14.7% with SII = 3 - severely impaired).
+                """)
+
+# Children Global Assessment Scale Subsection
+def cgas_analysis():
+    st.subheader("Children Global Assessment Scale")
+    st.markdown("""
+    The Children's Global Assessment Scale (CGAS) is a clinician-rated tool used to assess the overall
+    functioning of children and adolescents. It evaluates a child’s psychological, social, and academic
+    functioning on a scale from 1 to 100, with higher scores indicating better functioning. The scale helps
+    in determining the severity of a child's mental health issues, such as the degree of impairment in
+    various domains of life, including relationships, school performance, and behavior. It is commonly
+    used in clinical settings for monitoring progress, making treatment decisions, and conducting research
+    on child mental health. The scores are divided into categories ranging from very low to high
+    functioning to guide interventions.
+                """)
+    show_figure("CGAS.png", use_column_width=True)
+    show_figure("CGAS2.png", use_column_width=True)
+    show_figure("CGAS3.png", use_column_width=True)
+    st.markdown("""
+    **Notes:**
+    - Since the CGAS is a measure of general functioning, and the SII reflects the severity of the
+    impact of Internet use on that functioning, it is to be expected that this feature, along with
+    Internet use, to be the most important in predicting the SII.
+    - The majority of individuals have CGAS scores between 51-80 (79.7%), i.e. sporadic difficulties to only slight impairments
+    - Two participants have extreme difficulty in functioning.
+    - It would be expected the higher the SII, the lower the median CGAS score, but the decrease is very small here.
+    - However, there are no participants with the highest SII scores (3 or severely problematic internet use) who have
+    good CGAS scores (81-100: good/superior functioning in all domains). This suggests that parental responses to the
+    PCIAT questionnaire (our target variable) may reflect some effects of PIU on global health and functioning.
+    """)
+
+# Physical Measure Subsection
+def physical_measure_analysis():
+    st.subheader("Physical Measure")
+    eda_explorer("physical", ["Physical-BMI", "Physical-Height", "Physical-Weight", "Physical-Waist_Circumference", "Physical-Diastolic_BP", "Physical-HeartRate", "Physical-Systolic_BP"])
+    st.markdown("Let's analyze different aspects of the physical measures. Begin with general statistcs and distribution.")
+    show_figure("Physical Measure1.png", use_column_width=True)
+    st.markdown("""Looking at the histograms, the range for each parameter looks okay, however, the following table show
+                another story with non-physical zero values that must be replaces with nan!""")
+    table_md = """
+    | Physical Measurement          | Count   | Mean        | Std         | Min  | 25%        | 50%        | 75%        | Max        | Missing |
+    |--------------------------------|---------|-------------|-------------|------|------------|------------|------------|------------|---------|
+    | Physical-BMI                   | 3022.0  | 19.33   | 5.11    | 0.0  | 15.86   | 17.94  | 21.57  | 59.13  | 938     |
+    | Physical-Height                | 3027.0  | 55.94   | 7.47    | 33.0 | 50.00   | 55.00  | 62.00  | 78.50  | 933     |
+    | Physical-Weight                | 3076.0  | 89.03   | 44.56   | 0.0  | 57.20   | 77.00  | 113.80 | 315.00 | 884     |
+    | Physical-Waist_Circumference   | 898.0   | 27.27   | 5.56    | 18.0 | 23.00   | 26.00  | 30.00  | 50.00  | 3062    |
+    | Physical-Diastolic_BP          | 2954.0  | 69.64   | 13.61   | 0.0  | 61.00   | 68.00  | 76.00  | 179.00 | 1006    |
+    | Physical-HeartRate             | 2967.0  | 81.59   | 13.66   | 27.0 | 72.00   | 81.00  | 90.50  | 138.00 | 993     |
+    | Physical-Systolic_BP           | 2954.0  | 116.98  | 17.06   | 0.0  | 107.00  | 114.00 | 125.00 | 203.00 | 1006    |
+    """
+    st.markdown(table_md)
+    st.markdown("""Let's take a quick look at statistics without missingness. Missingness issue will be addressed 
+            extensively in the next section.""")
+    table_md = """
+    | Physical Measurement          | Count   | Mean       | Std        | Min   | 25%      | 50%      | 75%      | Max       | Missing |
+    |--------------------------------|---------|------------|------------|-------|----------|----------|----------|-----------|---------|
+    | Physical-BMI                   | 3015 | 19.38      | 5.03       | 8.52  | 15.89    | 17.95    | 21.59    | 59.13     | 945     |
+    | Physical-Height                | 3027 | 55.95      | 7.47       | 33.00 | 50.00    | 55.00    | 62.00    | 78.50     | 933     |
+    | Physical-Weight                | 3015 | 90.84      | 43.16      | 31.80 | 58.20    | 77.80    | 114.30   | 315.00    | 945     |
+    | Physical-Waist_Circumference   | 898  | 27.28      | 5.57       | 18.00 | 23.00    | 26.00    | 30.00    | 50.00     | 3062    |
+    | Physical-Diastolic_BP          | 2953 | 69.67      | 13.55      | 11.00 | 61.00    | 68.00    | 76.00    | 179.00    | 1007    |
+    | Physical-HeartRate             | 2967 | 81.60      | 13.67      | 27.00 | 72.00    | 81.00    | 90.50    | 138.00    | 993     |
+    | Physical-Systolic_BP           | 2953 | 117.02     | 16.93      | 49.00 | 107.00   | 114.00   | 125.00   | 203.00    | 1007    |
+    """
+    st.markdown(table_md)
+    show_figure("Physical Measure2.png", use_column_width=True)
+    st.markdown("""
+    **Notes:**
+    - There are individuals who are unusually tall for their age group or who are extremely overweight.
+    - There are also a few outliers in the waist circumference measurements, which are possible artifacts (e.g. 100 cm
+    for a weight of 40 kg).
+    - The problem with data cleaning here is that we cannot guess which of the data is correct. For example, we may see
+    an unrealistic combination of a waist circumference of 100cm and a weight of 40kg for a participant, but where is
+    the error in the waist circumference or the weight? Or a height of around 175cm for a child of 7 has the height or
+    age been entered incorrectly? Or this is true data and the child has gigantism or another disorder related to the
+    growth hormone?
+                """)
+    table_md = """
+    | Physical-Diastolic_BP | Physical-Systolic_BP | Physical-HeartRate |
+    |-----------------------|----------------------|--------------------|
+    | 1140                 | 179.0                | 139.0              |
+    | 1879                 | 117.0                | 114.0              |
+    | 2386                 | 76.0                 | 116.0              |
+    | 3344                 | 98.0                 | 96.0               |
+    """
+    st.markdown(table_md)
+    st.markdown("""
+    **Note:**
+    - We also know that systolic BP cannot be lower than diastolic BP!
+    """)
+    st.markdown("Now, here is another small problem turns out based on our EDA!")
+    table_md = """
+    | Physical-Diastolic_BP | Physical-Systolic_BP | Physical-HeartRate |
+    |-----------------------|----------------------|--------------------|
+    | 1140                 | 179.0                | 139.0              |
+    | 1879                 | 117.0                | 114.0              |
+    | 2386                 | 76.0                 | 116.0              |
+    | 3344                 | 98.0                 | 96.0               |
+    """
+    st.markdown(table_md)
+    st.markdown("""
+    **Note:**
+    - We also know that systolic BP cannot be lower than diastolic BP! So, a few more nan samples are added!
+    """)
+    show_figure("Physical Measure3.png", use_column_width=True)
+    st.markdown("""
+        **Note:**
+        - The absence of a clear direct correlation between heart rate and blood pressure in the plots suggests that
+        the measurements were likely taken in a resting state or under non-stressful conditions.
+        """)
+    show_figure("Physical Measure4.png", use_column_width=True)
+    st.markdown("""
+        - There does not appear to be a strong, clear correlation between body mass index (BMI) and systolic blood
+        pressure (BP).
+        - As expected, there is a strong positive correlation between systolic and diastolic BP, but there are notable
+        cases of isolated systolic or diastolic hypertension.
+        """)
+    show_figure("Physical Measure5.png", use_column_width=True)
+    st.markdown("""
+        **Notes:**
+        - The positive correlation with the target is for height, weight, and waist circumference, which means that
+        taller and fatter people tend to have a higher SII. But as these physical parameters increase with age, and we
+        already know that SII tends to be highest in adolescents, this could indicate that they acts as a proxy for age
+        (likely reflect age-related trends).
+        - Cardiovascular measures (systolic blood pressure, diastolic blood pressure and heart rate) also change with
+        age, but do not vary as drastically between childhood and adolescence as physical measures, and may not be as
+        sensitive to behaviours such as internet use. They also have a higher degree of variability, as we saw in the
+        graphs above, so the weak correlation may indicate that cardiovascular health is not strongly linked to PIU, or
+        that these data are just more scattered and noisy and the relationship with PIU is diluted.
+        - Overall, these preliminary analysis help us addressing the missingness issues!
+        """)
+
+# Bioelectric Impedance Analysis Subsection
+def bia_analysis():
+    st.subheader("Bioelectric Impedance")
+    eda_explorer("bia", ["BIA-BIA_Activity_Level_num", "BIA-BIA_BMC", "BIA-BIA_BMI", "BIA-BIA_BMR", "BIA-BIA_DEE", "BIA-BIA_ECW", "BIA-BIA_FFM", "BIA-BIA_FFMI", "BIA-BIA_FMI", "BIA-BIA_Fat", "BIA-BIA_Frame_num", "BIA-BIA_ICW", "BIA-BIA_LDM", "BIA-BIA_LST", "BIA-BIA_SMM", "BIA-BIA_TBW"])
+    st.markdown("""Bioelectric Impedance Analysis (BIA) is a technique used to measure the composition of the body by
+                assessing its resistance to electrical flow. It works by passing a small, safe electrical current
+                through the body and measuring the impedance (resistance) encountered. Since different tissues in
+                the body (such as fat, muscle, and bone) conduct electricity differently, BIA can estimate various
+                body parameters, including body fat percentage, lean mass, and total body water. BIA is commonly used
+                in health assessments, fitness evaluations, and clinical settings as a non-invasive and relatively
+                quick method to monitor body composition.""")
+    show_figure("BIA1.png", use_column_width=True)
+    show_figure("BIA2.png", use_column_width=True)
+    st.markdown("""
+        **Notes:**
+        - The distribution of the various bioelectrical impedance analysis measurements in the data set indicates that
+        most of them are not useful: highly skewed, with the majority of participants having marginal values and a few
+        outliers (potential measurement errors).
+        - Some variables, such as Fat Mass Index and Body Fat Percentage, show implausible negative values, and almost
+        all - extreme high values, indicating potential data quality issues.
+        """)
+
+# FitnessGram Vitals and Treadmill Subsection
+def FitnessGram():
+    st.subheader("FitnessGram Vitals and Treadmill")
+    eda_explorer("fitnessgram", ["Fitness_Endurance-Max_Stage", "FGC-FGC_CU", "FGC-FGC_GSND", "FGC-FGC_GSD", "FGC-FGC_PU", "FGC-FGC_SRL", "FGC-FGC_SRR", "FGC-FGC_TL", "Fitness_Endurance-Total_Time_Sec"])
+    st.markdown("""
+                The Treadmill test, part of the FitnessGram's aerobic capacity assessment, involves running or 
+                walking on a treadmill to assess endurance. It may measure the maximum stage of the treadmill test 
+                that the individual can complete, which correlates with aerobic fitness. The Treadmill test is 
+                typically used to evaluate how long an individual can maintain a certain pace or intensity before 
+                reaching fatigue.
+                """)
+    show_figure("VT1.png", use_column_width=True)
+    st.markdown("Let's take a look into possible missingness.")
+    table_md = """
+    | Fitness_Endurance-Max_Stage | Fitness_Endurance-Time_Mins | Fitness_Endurance-Time_Sec |
+    |----------------------------|-----------------------------|----------------------------|
+    | 420                        | 4.0                         | 6.0                        |
+    | 1470                       | 26.0                        | NaN                        |
+    | 2907                       | 1.0                         | 26.0                       |
+    | 3666                       | 2.0                         | NaN                        |
+    """
+    st.markdown(table_md)
+    st.markdown("""
+        **Notes:**
+        - It's possible that during data entry minutes or seconds were left blank (entered as NaN) when they should 
+        have been recorded as 0 minutes/seconds. While the missing seconds are not as important, the missing minutes
+        may actually be missing and treating them as 0 would give an incorrect test result. It is better to 
+        just remove these suspicious cases.
+        - It should also be noted that the age range for participants with Fitness_Endurance-Max_Stage data is 6-12 years.
+        - Let's also calculate the total time in seconds and see the statistics again.
+        """)
+    table_md = """
+    | Fitness Endurance Measurement     | Count  | Mean       | Std        | Min  | 25%   | 50%   | 75%   | Max   | Missing |
+    |-----------------------------------|--------|------------|------------|------|-------|-------|-------|-------|---------|
+    | Fitness_Endurance-Max_Stage       | 739.0  | 4.97       | 1.86       | 0.0  | 4.0   | 5.0   | 6.0   | 28.0  | 3221    |
+    | Fitness_Endurance-Total_Time_Sec  | 739.0  | 469.91     | 188.72     | 5.0  | 362.0 | 476.0 | 590.5 | 1200.0| 3221    |
+    """
+    st.markdown(table_md)
+    st.subheader("FitnessGram Child")
+    st.markdown("""
+        The FitnessGram is a comprehensive fitness assessment tool used primarily in schools to evaluate the physical 
+        fitness levels of children. It is designed to measure various aspects of physical fitness, including aerobic
+        capacity, muscular strength, endurance, flexibility, and body composition.
+
+        One of the key components of the FitnessGram is the Pacer Test (Progressive Aerobic Cardiovascular Endurance 
+        Run), which measures aerobic capacity. Other assessments include the curl-up test (to assess abdominal strength),
+        push-up test (for upper body strength), and sit-and-reach test (to evaluate flexibility). These tests are used
+        to evaluate whether children are meeting the fitness standards and help identify areas where they may need 
+        improvement.
+
+        The data from the FitnessGram is used to track students' fitness over time and can be an important tool for 
+        promoting health and encouraging physical activity in schools.
+        """)
+    show_figure("VT2.png", use_column_width=True)
+    table_md = """
+    | FGC Measurement      | Count   | Mean      | Std       | Min  | 25%   | 50%   | 75%     | Max   | Missing |
+    |----------------------|---------|-----------|-----------|------|-------|-------|---------|-------|---------|
+    | FGC Curl Up           | 2322.0  | 11.26     | 11.81     | 0.0  | 3.0   | 9.00  | 15.75   | 115.0 | 1638    |
+    | FGC Grip Strength (non-dominant)         | 1074.0  | 22.42     | 10.83     | 0.0  | 15.1  | 20.05 | 26.60   | 124.0 | 2886    |
+    | FGC Grip Strength (dominant)          | 1074.0  | 23.52     | 11.15     | 0.0  | 16.2  | 21.20 | 28.18   | 123.8 | 2886    |
+    | FGC Pull Up           | 2310.0  | 5.58      | 7.39      | 0.0  | 0.0   | 3.00  | 9.00    | 51.0  | 1650    |
+    | FGC Sit & Reach (left side)          | 2305.0  | 8.69      | 3.43      | 0.0  | 7.0   | 9.00  | 11.00   | 21.7  | 1655    |
+    | FGC Sit & Reach (right side)          | 2307.0  | 8.81      | 3.42      | 0.0  | 7.0   | 9.00  | 11.00   | 21.0  | 1653    |
+    | FGC Trunk lift           | 2324.0  | 9.25      | 2.99      | 0.0  | 7.0   | 10.00 | 12.00   | 22.0  | 1636    |
+    """
+    st.markdown(table_md)
+    st.markdown("""
+                **Notes:**
+                - Most of the distributions are skewed towards lower performance totals. Strangely, a greater 
+                proportion of participants achieved a healthy fitness zone for the trunk lift. I would expect different
+                ranges for each zone, but the values for different zones overlap significantly. This may be because the
+                zone ranges are different for different ages.
+                - In addition, it also doesn't make sense to call this a children's FitnessGram, since participants of almost
+                all ages (5-21) were tested.
+                """)
+    show_figure("VT3.png", use_column_width=True)
+    st.markdown("""
+        **Note:**
+        - Positive correlation between multiple physical performance measures and the PCIAT_Total score simply does not 
+        make senes, as it suggests that physical performance improves as PIU severity increases ...
+        """)
+
+# Sleep Disturbance Subsection
+def sleep_analysis():
+    st.subheader("Sleep Disturbance")
+    eda_explorer("sleep", ["SDS-SDS_Total_Raw", "SDS-SDS_Total_T"])
+    st.markdown("""
+    The Sleep Disturbance Scale (SDS) is a tool used to assess the severity and impact of sleep disturbances on an
+    individual's daily functioning. It typically consists of a series of questions or items that evaluate various
+    aspects of sleep, such as the quality of sleep, frequency of disturbances (e.g., waking up during the night,
+    difficulty falling asleep), and the impact on daytime functioning (e.g., fatigue, mood). The scale is often used
+    in clinical or research settings to help diagnose sleep disorders or to monitor changes in sleep patterns over
+    time. It is particularly useful for identifying individuals who may be experiencing sleep problems related to
+    conditions like insomnia, sleep apnea, or other health issues.
+    """)
+    show_figure("Sleep Disturbance1.png", use_column_width=True)
+    show_figure("Sleep Disturbance2.png", use_column_width=True)
+    st.markdown("""
+        **Note:**
+        - Both the raw and T-scores for sleep disturbance are moderately variable, with some extreme values indicating
+        severe sleep disturbances in a subset of participants.
+        - Both scores hava a similar distribution given each gender.
+        """)
+    table_md = """
+    | SDS Measurement   | Count   | Mean      | Std       | Min  | 25%   | 50%   | 75%   | Max   | Missing |
+    |-------------------|---------|-----------|-----------|------|-------|-------|-------|-------|---------|
+    | SDS_Total_Raw     | 2609.0  | 41.09     | 10.43     | 17.0 | 33.0  | 39.0  | 46.0  | 96.0  | 1351    |
+    | SDS_Total_T       | 2606.0  | 57.76     | 13.20     | 38.0 | 47.0  | 55.0  | 64.0  | 100.0 | 1354    |
+    """
+    st.markdown(table_md)
+
+# Physical Activity Questionnaire Subsection
+def paq_analysis():
+    st.markdown("""
+        The Physical Activity Questionnaire (PAQ) is a tool commonly used to assess an individual's physical
+        activity levels. It typically involves a self-reported survey that asks respondents about the frequency,
+        duration, and intensity of various physical activities they engage in over a specific time period, such
+        as the past week or month.
+        """)
+    eda_explorer("paq", ["PAQ_A-PAQ_A_Total", "PAQ_C-PAQ_C_Total"])
+    st.subheader("Physical Activity Questionnaire (Adolescents)")
+    show_figure("PA1.png", use_column_width=True)
+    st.subheader("Physical Activity Questionnaire (Children)")
+    show_figure("PA2.png", use_column_width=True)
+    st.markdown("""
+        **Notes:**
+        - Age range for Adolescents (with PAQ_A_Total data): 13 - 18 years.
+        - Age range for Children (with PAQ_C_Total data): 7 - 17 years.
+        - The division into adolescents and children seems to be incorrect (participants with data in the children 
+        columns (PAQ_C_Total) are 7 - 17 years old - overlapping with those with non-missing data in the adolescents 
+        columns - 13 - 18 years old).
+        - Physical activity levels are fairly stable over the seasons, with only minor variations, although are 
+        slightly lower in the fall and winter for adolescents and children, respectively.
+        - There are many missing values for these features
+        """)
+
+eda()
@@ -0,0 +1,54 @@
+import streamlit as st
+
+from common import feature_stage
+from piu import data
+
+# Encoding and Scaling Section
+def encoding_scaling():
+    st.header("Encoding and Scaling")
+    st.markdown("Let's take a look at the remaining parameters and their type:")
+    table_md = """
+    | Instrument                         | Field                                    | Type             |
+    |------------------------------------|------------------------------------------|------------------|
+    | Demographics                       | Basic_Demos-Age                          | float            |
+    | Demographics                       | Basic_Demos-Sex                          | categorical int  |
+    | Children's Global Assessment Scale | CGAS-CGAS_Score                          | int              |
+    | Physical Measures                  | Physical-BMI                             | float            |
+    | Physical Measures                  | Physical-Height                          | float            |
+    | Physical Measures                  | Physical-Weight                          | float            |
+    | Physical Measures                  | Physical-Waist_Circumference             | int              |
+    | Physical Measures                  | Physical-Diastolic_BP                    | int              |
+    | Physical Measures                  | Physical-HeartRate                       | int              |
+    | Physical Measures                  | Physical-Systolic_BP                     | int              |
+    | FitnessGram Vitals and Treadmill   | Fitness_Endurance-Max_Stage              | int              |
+    | FitnessGram Child                  | FGC-FGC_CU                               | int              |
+    | FitnessGram Child                  | FGC-FGC_GSND                             | float            |
+    | FitnessGram Child                  | FGC-FGC_GSD                              | float            |
+    | FitnessGram Child                  | FGC-FGC_PU                               | int              |
+    | FitnessGram Child                  | FGC-FGC_SRL                              | float            |
+    | FitnessGram Child                  | FGC-FGC_SRR                              | float            |
+    | FitnessGram Child                  | FGC-FGC_TL                               | int              |
+    | Parent-Child Internet Addiction Test | PCIAT-PCIAT_Total                      | int              |
+    | Sleep Disturbance Scale            | SDS-SDS_Total_Raw                        | int              |
+    | Sleep Disturbance Scale            | SDS-SDS_Total_T                          | int              |
+    | Internet Use                       | PreInt_EduHx-computerinternet_hoursday   | categorical int  |
+    | SII                                | Severity Impairment Index                | categorical int  |
+    """
+    st.markdown(table_md)
+    st.markdown("""
+        **Notes:**
+        - Binary Encoding (Demographics - Gender): Since 'Basic_Demos-Sex' is already binary (0, 1), we do not need
+        additional encoding. 
+        -  Ordinal Encoding (Internet Use and SII): Given the order of values (0: less than 1h, 1: around 1h, etc.) or
+        (sii = 1 is more sever than sii = 0, etc.), Ordinal Encoding is appropriate since the categories have a 
+        natural ordering.
+        - For the next step, which is PCA, PCIAT-PCIAT_Total will be removed as it has a one-by-one mapping to SII.
+        - All the continuous numerical parameters (int/float) are standard scaled.
+        """)
+    import pandas as pd
+    from piu import model
+    encoded = feature_stage("encoded", data.source_key("cleaned"))
+    st.markdown("The first participants after scaling and encoding:")
+    st.dataframe(pd.DataFrame(encoded["X"][:10], columns=model.FEATURES, index=encoded["ids"][:10]).round(3))
+
+encoding_scaling()
@@ -0,0 +1,91 @@
+import streamlit as st
+
+from common import show_figure
+
+# Introduction Section
+def introduction():
+    st.title("Child Mind Institute — Problematic Internet Use")
+    show_figure("DALL_E_2024_12_02.webp", caption="Generated by GPT 4o DALL.E (2024-12-02, 12.24.03)", use_column_width=True)
+    st.header("Introduction")
+    st.markdown("""
+        **Introduction:**
+        The Healthy Brain Network (HBN) dataset is a clinical sample of about five-thousand 5-22 year-olds who have
+        undergone both clinical and research screenings. The objective of the HBN study is to find biological markers
+        that will improve the diagnosis and treatment of mental health and learning disorders from an objective
+        biological perspective. Two elements of this study are being used for this competition: physical activity data 
+        (wrist-worn accelerometer data, fitness assessments and questionnaires) and internet usage behavior data. However,
+        in this particular app, the wrist-worn data is not being fed to the machine learning models. The goal of this
+        project is to predict from this data a participant's **Severity Impairment Index** (`sii`), a standard measure
+        of problematic internet use. The majority of measures are missing for most participants. In particular, the target
+        sii is missing for a portion of the participants in the training set.
+        
+        **Analytics Type:**
+        This app provides a predictive analysis and classification to determine the severity of Problematic Internet Use 
+        (PIU) based on physical and behavioral data. Specifically, it predicts the Severity Impairment Index (sii), an 
+        ordinal measure of PIU severity, using features derived from clinical assessments, physical metrics, and internet
+        use patterns.
+        
+        **Background & Audience:**
+        Users are primarily mental health professionals, researchers, and data scientists interested in understanding or 
+        predicting mental health indicators from behavioral and physical data. They need a tool that helps them analyze
+        patterns of internet addiction among young people in a simple, interactive way, with a focus on data-driven 
+        predictions that could help identify at-risk individuals early.
+        
+        **Context:**
+        Problematic Internet Use among young people has become a growing concern, linked to various mental health issues
+        and poor academic or social outcomes. Despite the importance of early intervention, it is challenging to objectively
+        identify individuals at risk for PIU due to data sparsity and missing information. The app aims to tackle this
+        challenge by leveraging machine learning models to predict sii levels based on limited but informative features,
+        thus providing a tool to assist mental health professionals in making early, objective assessments.
+        
+        **Data Narrative:**
+        The data-driven solution starts by cleaning and preprocessing the HBN dataset, which involves addressing missingness
+        in various clinical and physical measures, and scaling/encoding the features for machine learning models. Then a PCA 
+        is performed to reduce dimensionality, improving the interpretability and efficiency of subsequent predictions. A
+        Gradient Boosting model is used to classify participants based on their predicted sii, followed by implementing the 
+        random forest model. In this app users are allowed to visualize important aspects of the dataset, such as the 
+        distribution of PIU levels, relationships between physical measures, and the contributions of individual features to
+        predictions, giving a comprehensive overview of the data and model outcomes.
+        
+        **Execution:**
+        The app presents the analysis and results in an interactive web-based format, using Streamlit to enable users to engage
+        with visualizations and predictions easily. The web app includes intuitive, dynamic visualizations like scatter plots, 
+        bar charts, and PCA projections that show the impact of various features on the prediction of sii. Additionally, users
+        can explore individual data points, observe model behavior, and understand the influence of features like age, internet
+        use patterns, and fitness assessments on the predicted outcomes, making the app highly user-centric and accessible for 
+        real-time exploration.
+        
+        [Data Source](https://www.kaggle.com/competitions/child-mind-institute-problematic-internet-use/overview)
+        [GitHub](https://github.com/armankhoshnevis/FDS_Final)
+        """)
+    st.markdown("""
+        ### Tabular Data - HBN Instruments
+        The tabular data in *train.csv* and *test.csv* comprises measurements from a variety of instruments. The
+        fields within each instrument are described in *data_dictionary.csv*. These instruments are:
+
+        * `Demographics` - Information about *age* and *sex* of participants.
+        * `Internet Use` - *Number of hours* of using computer/internet per day.
+        * `Children's Global Assessment Scale` - Numeric scale used by mental health clinicians to rate the general 
+        functioning of youths under the age of 18.
+        * `Physical Measures` - Collection of *blood pressure*, *heart rate*, *height*, *weight* and *waist*, and
+        *hip* measurements.
+        * `FitnessGram Vitals and Treadmill` - Measurements of cardiovascular fitness assessed using the NHANES 
+        treadmill protocol.
+        * `FitnessGram Child` - Health related physical fitness assessment measuring five different parameters 
+        including *aerobic capacity*, *muscular strength*, *muscular endurance*, *flexibility*, and *body composition*.
+        * `Bio-electric Impedance Analysis` - Measure of key body composition elements, including *BMI*, *fat*, 
+        *muscle*, and *water content*.
+        * `Physical Activity Questionnaire` - Information about children's participation in vigorous activities over 
+        the last 7 days.
+        * `Sleep Disturbance Scale` - Scale to *categorize sleep disorders* in children.
+        * `Actigraphy` - Objective measure of ecological physical activity through a research-grade biotracker.
+        * `Parent-Child Internet Addiction Test (PCIAT)` - 20-item scale that measures characteristics and behaviors 
+        associated with compulsive use of the Internet including compulsivity, escapism, and dependency.
+        * **Note** in particular the field PCIAT-PCIAT_Total. The target sii for this competition is derived from 
+        this field as described in the data dictionary: 0 for None, 1 for Mild, 2 for Moderate, and 3 for Severe. 
+        Additionally, each participant has been assigned a unique identifier id.
+        """)
+    st.markdown("Each data science step towards this dataset can be reviewed and explored in the side and top bars!")
+    st.markdown("")
+
+introduction()
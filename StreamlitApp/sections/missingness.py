@@ -0,0 +1,224 @@
+import streamlit as st
+
+from common import show_figure, show_table
+from piu import data
+
+# Live missingness profile from the packed bitmap index of a source file
+@st.cache_resource
+def missingness_index(source, source_key):
+    from piu.missingness import MissingnessIndex
+    return MissingnessIndex.from_source(source)
+
+def missingness_explorer(key, source):
+    import altair as alt
+    index = missingness_index(source, data.source_key(source))
+    st.markdown("### Live Missingness by Instrument")
+    co_missing = index.co_missingness("instrument").rename_axis("Instrument A").reset_index().melt(
+        id_vars="Instrument A", var_name="Instrument B", value_name="Missing both (%)")
+    co_missing["Missing both (%)"] *= 100
+    heatmap = alt.Chart(co_missing).mark_rect().encode(
+        x=alt.X("Instrument A:N", sort=index.instruments), y=alt.Y("Instrument B:N", sort=index.instruments),
+        color=alt.Color("Missing both (%):Q", scale=alt.Scale(scheme="viridis")),
+        tooltip=["Instrument A", "Instrument B", alt.Tooltip("Missing both (%):Q", format=".1f")])
+    st.altair_chart(heatmap, use_container_width=True)
+    st.caption("Diagonal: participants missing the whole instrument; off-diagonal: missing both instruments.")
+    st.dataframe(index.completeness(), hide_index=True)
+    with st.expander("Query participants by missingness"):
+        names = index.instruments + index.columns
+        present = st.multiselect("Observed", names, key=f"{key}_present")
+        missing = st.multiselect("Missing", names, key=f"{key}_missing")
+        how = st.radio("An instrument is missing when", ["all its columns are missing", "any column is missing"],
+                       key=f"{key}_how", horizontal=True)
+        count = index.count(present, missing, "all" if how.startswith("all") else "any")
+        st.metric("Participants", f"{count} ({100 * count / index.n_rows:.1f}%)")
+        st.markdown("Most frequent instrument missingness patterns (True = instrument missing):")
+        st.dataframe(index.pattern_frequencies(top=10).round(2))
+
+# Missingness Section
+def missingness():
+    st.header("Missingness Handling")
+
+    # Subsections within Missingness Handling
+    missingness_subsections = ["Overview", "Weight, Height, & Waist", "Blood Pressures & Heart Rate", 
+                               "Bio-Electric Impedence", "Fitness Gram Child", "Internet Use", "Sleep Disturbance",
+                               "Children's Global Assessment Scale", "Remaining Features", "SII & PCIAT"]
+    missingness_selected = st.selectbox("Select Missingness Handling Subsection", missingness_subsections)
+
+    if missingness_selected == "Overview":
+        overview_miss()
+    elif missingness_selected == "Weight, Height, & Waist":
+        whw_miss()
+    elif missingness_selected == "Blood Pressures & Heart Rate":
+        bphr_miss()
+    elif missingness_selected == "Bio-Electric Impedence":
+        bia_miss()
+    elif missingness_selected == "Fitness Gram Child":
+        fgc_miss()
+    elif missingness_selected == "Internet Use":
+        iu_miss()
+    elif missingness_selected == "Sleep Disturbance":
+        sd_miss()
+    elif missingness_selected == "Children's Global Assessment Scale":
+        cgas_miss()
+    elif missingness_selected == "Remaining Features":
+        remaining_miss()
+    elif missingness_selected == "SII & PCIAT":
+        sii_pciat_miss()
+
+# Missingness Overview Subsection
+def overview_miss():
+    st.markdown("Let's take a look at the missingness heat map and percentage various features.")
+    show_figure("overview_miss1.png", use_column_width=True)
+    show_figure("overview_miss2.png", use_column_width=True)
+    missingness_explorer("overview", "train")
+    st.markdown("""Some of the features have seriouse missingness, while potentiall palying an important role for
+                the prediction task. In the next subsections, this missingness will be addressed, step by step. 
+                Moreover, in most of our missingness handling efforts, Iterative Imputer BayesianRidge and KNN 
+                imputation methods are utilized.""")
+
+# Missingness of Weight, Height, and Waist Subsection
+def whw_miss():
+    show_figure("imp_weight_height.png", use_column_width=True)
+    show_figure("imp_bmi.png", use_column_width=True)
+    st.markdown("""
+        **Notes:**
+        - Age, Height, and Weight are used for the imputation task.
+        - Concerning the Iterative Imputer BayesianRidge method, a minimum value of 30 is specified to help the 
+        imputation as the min of weigth and height is 31.8lb and 33.0 in.
+        - Both methods resulted into almost the same imputation as they display the similar distribution. However,
+        the Iterative Imputer BayesianRidge method is chosen due to a relatively better performance in the imputed
+        distribution of weight.
+        - Distribution of the imputed BMI also seems reasonable.
+        """)
+    st.markdown("""Since weight and height have already been imputed, let's use them along with age to impute waist 
+                circumference.""")
+    show_figure("imp_waistcircum.png", use_column_width=True)
+    st.markdown("""
+        **Notes:**
+        - Waist circumference had 77.32% missingness as it is evident from the above scatter plot. However, 
+        it seems the Bayes method has a more reasonable performance.
+        """)
+
+# Missingness of Blood Pressures and Heart Rate Subsection
+def bphr_miss():
+    st.markdown("""Upon plotting various scatter plots, weight, systolic bp, diastolic bp, and heart rate are imputed
+                together.""")
+    show_figure("imp_bphr1.png", use_column_width=True)
+    show_figure("imp_bphr2.png", use_column_width=True)
+    st.markdown("""
+        **Notes:**
+        - Similar to the previous subsection, a min limit value of 10.0 is provided for the Bayes method as the min
+        value of the diastolic bp is 11.
+        - Again, both imputation methods more or less resulted into the same output.
+        - Both distribution and heatmap of the imputed data seem to preserve the same shape and correlations.
+        """)
+
+# Missingness of the Internet Use Subsection
+def iu_miss():
+    st.markdown("""
+        As concluded in its corresponding EDA section, this parameter can potentially play an important role in 
+        predicting the SII. So, its missingness is handled carefully.
+        
+        Given each SII value, the missingness in the internet use is handled proportion to their original missingness.
+        In other words, missing values are filled such that the relative percentage of each internet use category does
+        not change drastically.
+        """)
+    st.markdown("This is the imputed pie-chart.")
+    show_figure("imp_internetuse.png", use_column_width=True)
+    st.markdown("And this is the non-imputed pie-chart.")
+    show_figure("Internet Use Pi2.png", use_column_width=True)
+
+# Missingness of Bio-electric Impedence Analysis Subsection
+def bia_miss():
+    st.markdown("""
+        Owing to the following reasons, features related to bio-electric impedence analysis are dropped!
+        
+        **Notes:**
+        - Roughly half of the data is missing.
+        - std of most of the features are two or three times greater than their corresponding mean value.
+        - Most of them have extreme min or max values.
+        - Most of them have a very skewed distribution.
+        """)
+    show_figure("BIA2.png", use_column_width=True)
+    show_figure("BIA1.png", use_column_width=True)
+
+# Missingness of Fitness Gram Child Subsection
+def fgc_miss():
+    st.markdown("""
+        All the fitness gram child features are imputed using age, gender, and bmi as auxiliary features. So, let's 
+        first take a quick look at the correlation heatmap of these features.
+        """)
+    show_figure("imp_fgc1.png", use_column_width=True)
+    st.markdown("Now, here is the comparison non-imputed and KNN imputed features.")
+    show_figure("imp_fgc2.png", use_column_width=True)
+
+# Missingness of Sleep Disturbance Subsection
+def sd_miss():
+    st.markdown("Let's first see which potential parameter be an auxilary parameter for imputing the scores.")
+    show_figure("imp_sd1.png", use_column_width=True)
+    st.markdown("Both raw and T scores are imputed using BMI.")
+    show_figure("imp_sd2.png", use_column_width=True)
+
+# Missingness of Children's Global Assessment Scale Subsection
+def cgas_miss():
+    st.markdown("""
+        For this parameter, the aim is to preserve the distribution of the scores.
+        
+        Here, the score is imputed using age, bmi, and weight as auxillary features.
+        """)
+    show_figure("imp_cgas.png", use_column_width=True)
+
+# Missingness of the Remaining Features Subsection
+def remaining_miss():
+    st.markdown("""
+        Let's take a look at the missingness percentages up to now. We have imputed many features while
+        dropping some other features!
+        """)
+    show_figure("imp_remaining1.png", use_column_width=True)
+    missingness_explorer("remaining", "train_df")
+    st.markdown("""
+        **Notes:**
+        - Physical activity questionnaires for both childer and adolescents have a significant missingness. Moreover, 
+        since these features are somehow reflected in other features, their missingness is ignored and they are dropped
+        for the next analysis.
+        - With a similar logic, the minute and second values for the fitness endurance are also dropped.
+        - Let's take a bit closer look at the missingness of the target values in the next subsection.
+        """)
+
+# Missingness of the SII and PCIAT Score Subsection
+def sii_pciat_miss():
+    st.markdown("""
+        In this project, roughly 31% of SII and PCIAT score is missing. However, this number is achieved after some
+        effort described below.
+        
+        First of all, it must be noted that PCIAT and SII have a clear mapping as shown in the following table.
+        """)
+    show_table("pciat_range_by_sii", "train_df")
+    st.markdown("""
+        Second, let's review the mean imputation used for PCIAT question scores and total score.
+        
+        Out of all the samples with 'non-missing' sii value, 65 samples had at least one missing value in one of the 
+        questions in the PCIAT. This missing value would result into an artificail decrease in the PCIAT total score
+        as it is equal to sum of all PCIAT question scores. Therefore, it was decided to detecet samples with no more
+        than 3 missing question scores and use mean-imputation (with rounding!) to fill the missing scores. At the end,
+        only 3 samples remain with more than 3 missing scores.
+        """)
+    show_table("pciat_imputation_summary", "train")
+    st.markdown("""
+        Ultimately, let's take a look at the missing scores before and after the mean-imputation.
+        """)
+    show_figure("imp_pciat1.png", caption='Part of the missing PCIAT score before mean imputation.')
+    show_figure("imp_pciat2.png", caption='Part of the missing PCIAT score after mean imputation.')
+    st.markdown("Let's see the missing percentage one more time!")
+    show_figure("imp_remaining2.png", use_column_width=True)
+    st.markdown("""
+        The ultimate goal of this project is to predict SII or equivalently PCIAT toal score. But, both (not 
+        surperisingly by now), have 31% missingness after the mean-imputation effort, described above.
+        
+        For sure there are some sophisticated ways to address this missingness in the target values. But, these 
+        efforts would be literally translated prediction/classification task that is supposed to be answered in the
+        modeling section. Therefore, for now, use the row-wise deletion for handling this missingness, which decreases 
+        3960 samples to 2733.
+        """)
+
+missingness()
@@ -0,0 +1,315 @@
+import streamlit as st
+
+from common import STACKING_COMMAND, cv_missing_notice, cv_results, ensemble_results
+
+# Cross-validated classification report of one config, generated by the evaluation engine
+def cv_report(name):
+    from piu import evaluation, tables
+    result = cv_results().get(name)
+    if result is None:
+        cv_missing_notice()
+        return
+    st.markdown(f"**Repeated stratified {evaluation.N_SPLITS}-fold cross-validation** ({evaluation.N_REPEATS} "
+                "repeats, mean [95% CI]):")
+    st.markdown(tables.to_markdown(result.report()))
+    st.markdown("The single hold-out split of the notebook (547 participants), which the notes below refer to:")
+
+# Modeling Section
+def modeling():
+    st.header("Modeling")
+    st.write("This section will cover the different predictive models developed and their evaluation metrics.")
+
+    # Subsections within Modeling
+    modeling_subsections = ["Overview", "Imbalance Issue", "Gradient Boosting Classifier", 
+                            "Random Forest", "Model Comparison"]
+    modeling_selected = st.selectbox("Select Modeling Subsection", modeling_subsections)
+
+    if modeling_selected == "Overview":
+        overview_model()
+    elif modeling_selected == "Imbalance Issue":
+        imbalance_model()
+    elif modeling_selected == "Gradient Boosting Classifier":
+        gbm_model()
+    elif modeling_selected == "Random Forest":
+        rf_model()
+    elif modeling_selected == "Model Comparison":    
+        comp_model()
+
+# Overview of Modeling Subsection
+def overview_model():
+    st.markdown("""
+        Since our goal is to predict/classify the sii score, which is an ordinal target variable, we should consider
+        models that are well-suited for classification (since sii takes discrete values like 0, 1, 2, 3) or regression
+        (since it has a clear order). Owing to the imablance issue in the dataset, two models that are initially 
+        suitable for such datasets are chosen.
+        
+        1. Gradient Boosting Classifier (GBM):
+            
+        - Learns sequentially by focusing on the errors of the previous iterations.
+        - Handles imbalanced datasets well when tuned.
+        - Can achieve high precision and recall by optimizing for specific metrics.
+        - It is excellent for capturing patterns in datasets where class boundaries are non-linear and noisy.
+        
+        2. Random Forest Classifier:
+            
+        - It creates multiple independent decision trees, reducing overfitting.
+        - Handles class imbalance better out of the box due to internal bootstrapping and options.
+        - Robust to noisy and imbalanced data.
+        
+        Let's start with addressing the imbalance issue in the next subsection.
+        """)
+
+# Imabalance Subsection
+def imbalance_model():
+    st.markdown("""
+        Let's, first, see how this problem affects the performance of the model in predicting the minority class.
+        
+        Here is the detailed classification report of GradientBoostingClassifier model with default hyper parameters.
+        """)
+    cv_report("gbm_default")
+    st.markdown("**Accuracy Score:** 0.55")
+    classification_report_md = """
+    | Class | Precision | Recall | F1-Score | Support |
+    |-------|-----------|--------|----------|---------|
+    | 0.0   | 0.66      | 0.83   | 0.73     | 315     |
+    | 1.0   | 0.27      | 0.21   | 0.24     | 140     |
+    | 2.0   | 0.38      | 0.14   | 0.20     | 86      |
+    | 3.0   | 0.00      | 0.00   | 0.00     | 6       |
+
+    | Metric          | Precision | Recall | F1-Score | Support |
+    |-----------------|-----------|--------|----------|---------|
+    | **Accuracy**    | -         | -      | 0.55     | 547     |
+    | **Macro Avg**   | 0.32      | 0.30   | 0.29     | 547     |
+    | **Weighted Avg**| 0.50      | 0.55   | 0.51     | 547     |
+    """
+    st.markdown(classification_report_md)
+    st.markdown("""
+        Let's also review some of the key performance parameters here as well.
+        
+        - **Precision**: 0.66 for class `0.0`, meaning that 66% of instances predicted as `0.0` were correct.
+        - **Recall**: 0.83 for class `0.0`, indicating that 83% of the actual `0.0` instances were correctly predicted.
+        - **F1-Score:** The harmonic mean of precision and recall. It balances precision and recall, especially
+        when the data is imbalanced.
+        - **Support:** The number of true instances for each class in the dataset.
+        """)
+    st.markdown("""
+        **Notes:**
+        - Class `0.0` dominates the dataset (315 instances), while class `3.0` is very rare (6 instances). This imbalance
+        skews the model's performance.
+        - The model performs well on class `0.0` (high precision, recall, and F1-Score), likely because of its prevalence
+        in the dataset.
+        - Performance on minority classes (`1.0`, `2.0`, `3.0`) is poor, indicating that the model struggles to generalize
+        for underrepresented classes.
+        - Use techniques like oversampling minority classes (SMOTE) or adjusting class weights in the loss function.
+        """)
+    st.markdown("Let's use SMOTE and fine tune it using grid search")
+    code = """
+    # Define the model and pipeline
+    classifier = GradientBoostingClassifier()
+    smote = SMOTE()
+    pipeline = Pipeline(steps=[('smote', smote), ('classifier', classifier)])
+
+    # Define parameter grid
+    param_grid = {
+        'smote__sampling_strategy': ['auto', 'minority'],
+        'smote__k_neighbors': [3, 4, 5, 6, 10]
+    }
+
+    # Perform grid search
+    grid_search = GridSearchCV(
+        pipeline,
+        param_grid,
+        scoring='f1_weighted',
+        cv=5,
+        verbose=1,
+        n_jobs=2)
+    grid_search.fit(X_train, y_train)
+    """
+    st.code(code, language='python')
+    st.markdown("""
+        And here is the result: Best SMOTE parameters:
+        ```python
+        {'smote__k_neighbors': 5, 'smote__sampling_strategy': 'minority'}
+        ```
+        """)
+
+# Gradient Boosting Classifier Subsection
+def gbm_model():
+    st.markdown("""
+                Once we are done with tuning the SMOTE method to (at least) partially address the imbalance issue, let's
+                get into tuning the Gradient Boosting Classifier.
+                """)
+    code = """
+    param_grid_gb = {
+        'classifier__n_estimators': [50, 100, 200, 300],
+        'classifier__learning_rate': [0.01, 0.05, 0.1, 0.15],
+        'classifier__max_depth': [3, 5, 7],
+    }
+
+    pipeline.set_params(smote__k_neighbors=5, smote__sampling_strategy='minority')
+
+    # Perform grid search for GradientBoostingClassifier
+    grid_search_gb = GridSearchCV(
+        pipeline,
+        param_grid_gb,
+        scoring='f1_weighted',
+        cv=5,
+        verbose=1,
+        n_jobs=-1  # Use all available processors
+    )
+    grid_search_gb.fit(X_train, y_train)
+    """
+    st.code(code, language='python')
+    st.markdown("""
+        And here is the result: Best Gradient Boosting Classifier parameters:
+        ```python
+        Best GradientBoosting parameters: 
+        {'classifier__learning_rate': 0.1, 'classifier__max_depth': 7, 'classifier__n_estimators': 100}
+        ```
+        """)
+    st.markdown("Finally, let's see the performance of the best pipeline!")
+    cv_report("gbm")
+    classification_report_md = """
+    | Class       | Precision | Recall | F1-Score | Support |
+    |-------------|-----------|--------|----------|---------|
+    | 0.0         | 0.64      | 0.81   | 0.72     | 315     |
+    | 1.0         | 0.28      | 0.19   | 0.23     | 140     |
+    | 2.0         | 0.38      | 0.16   | 0.23     | 86      |
+    | 3.0         | 0.14      | 0.50   | 0.22     | 6       |
+
+    | Metric      | Precision | Recall | F1-Score | Support |
+    |-----------------|-------|--------|----------|---------|
+    | **Accuracy**    |       |        | 0.54     | 547     |
+    | **Macro Avg**   | 0.36  | 0.42   | 0.35     | 547     |
+    | **Weighted Avg**| 0.51  | 0.54   | 0.51     | 547     |
+    """
+    st.markdown(classification_report_md)
+    st.markdown("""
+        **Notes:**
+        - The results after fine-tuning indicate that there has been some improvement, especially considering the
+        challenging class imbalance in the dataset.
+        - Class `0.0` (Majority Class): Precision (0.64) and Recall (0.81) are solid, resulting in a strong F1-score
+        (0.72).
+        - Class `1.0` and `2.0` (Minority Classes): These classes still struggle, with Recall at 0.19 for `1.0` and 0.16
+        for `2.0`. Precision for class `2.0` is higher (0.38), but the imbalance and overlap between classes make them
+        harder to predict accurately. Efforts like SMOTE and GradientBoosting fine-tuning improved minority class
+        performance somewhat but not substantially.
+        - Class `3.0` (Rare Class): Remarkably, the Recall for `3.0` is 0.50, meaning half of the rare class samples 
+        were identified. This is a significant improvement over earlier iterations. However, low Precision (0.14)
+        indicates many false positives for this class.
+        """)
+
+# Random Forest Subsection
+def rf_model():
+    st.markdown("Since the SMOTE is already been fine tuned, let's get into the fine tuning of the Random Forest model.")
+    code = """
+    param_grid_rf = {
+        'classifier__n_estimators': [50, 100, 200, 300],
+        'classifier__max_depth': [5, 10, 20, None],
+        'classifier__class_weight': ['balanced', 'balanced_subsample'],
+        'classifier__max_features': ['sqrt', 'log2', None],
+        'classifier__min_samples_split': [2, 5, 10, 20],
+        'classifier__min_samples_leaf': [1, 2, 5, 10],
+    }
+    
+    # Define Random Forest model and pipeline
+    rf_classifier = RandomForestClassifier(random_state=42)
+    smote = SMOTE(sampling_strategy='minority', k_neighbors=5)  # Use the best SMOTE params
+    pipeline = Pipeline(steps=[('smote', smote), ('classifier', rf_classifier)])
+
+    # Perform grid search
+    grid_search_rf = GridSearchCV(
+        pipeline,
+        param_grid_rf,
+        scoring='f1_weighted',
+        cv=5,
+        verbose=1,
+        n_jobs=-1
+    )
+    grid_search_rf.fit(X_train, y_train)
+    """
+    st.code(code)
+    st.markdown("""
+        And here is the result: Best Random Forest parameters:
+        ```python
+        Best GradientBoosting parameters: 
+        {'classifier__class_weight': 'balanced_subsample', 'classifier__max_depth': 10, 'classifier__max_features': 'sqrt', 'classifier__min_samples_leaf': 1, 'classifier__min_samples_split': 10, 'classifier__n_estimators': 300}
+        ```
+        """)
+    st.markdown("Let's see the performance of the best pipeline!")
+    cv_report("rf")
+    classification_report_md = """
+    | Class       | Precision | Recall | F1-Score | Support |
+    |-------------|-----------|--------|----------|---------|
+    | 0.0         | 0.67      | 0.80   | 0.73     | 315     |
+    | 1.0         | 0.34      | 0.25   | 0.29     | 140     |
+    | 2.0         | 0.35      | 0.15   | 0.21     | 86      |
+    | 3.0         | 0.12      | 0.67   | 0.21     | 6       |
+
+    | Metric          | Precision | Recall | F1-Score | Support |
+    |-----------------|-----------|--------|----------|---------|
+    | **Accuracy**    |           |        | 0.56     | 547     |
+    | **Macro Avg**   | 0.37      | 0.47   | 0.36     | 547     |
+    | **Weighted Avg**| 0.53      | 0.56   | 0.53     | 547     |
+    """
+    st.markdown(classification_report_md)
+    st.markdown("""
+        - Class `0.0` (Majority Class):
+            - Precision (0.67): Indicates that 67% of predictions for this class are correct.
+            - Recall (0.80): Reflects that 80% of the true 0.0 instances were identified.
+            - F1-score (0.73): Highlights strong overall performance for this class, as expected for the majority class.
+        - Class `1.0` and `2.0` (Minority Classes):
+            - Class `1.0`:
+                - Precision (0.34) and Recall (0.25) are moderate, leading to a F1-score (0.29). The model struggles to
+                identify and correctly predict this class, though it slightly outperforms class `2.0`.
+            - Class `2.0`:
+                - Precision (0.35) is comparable to class `1.0`, but Recall (0.15) is much lower, indicating a greater
+                difficulty in capturing true instances of this class. The F1-score (0.21) remains low, highlighting the
+                need for more focused optimization for this class.
+        - Class `3.0` (Rare Class):
+            - Precision (0.12): Many false positives, reflecting difficulty in making correct predictions.
+            - Recall (0.67): The model captures two-thirds of true 3.0 instances, a strong improvement.
+            - F1-score (0.21): Shows significant recall improvements but struggles with precision.
+        """)
+
+# Comparison Subsection
+def comp_model():
+    st.markdown("Lastly, let's make a comparison!")
+    import pandas as pd
+    from piu import evaluation, model, tables
+    results = cv_results()
+    if "gbm" not in results or "rf" not in results:
+        cv_missing_notice()
+        return
+    gbm, rf = results["gbm"], results["rf"]
+    st.markdown(f"Mean ± half-width of the 95% CI over {len(gbm.confusion)} cross-validation folds:")
+    st.markdown(tables.to_markdown(evaluation.comparison([gbm, rf])))
+
+    # Metrics on which each model is ahead
+    means = pd.DataFrame({result.label: result.summary()["mean"] for result in (gbm, rf)})
+    names = {**{f"f1_{i}": f"class `{float(c)}` F1-score" for i, c in enumerate(model.CLASSES)},
+             "f1_weighted": "weighted F1-score", "recall_macro": "macro recall", "accuracy": "accuracy",
+             "qwk": "QWK"}
+    leader = means.loc[list(names)].idxmax(axis=1)
+    st.markdown("\n".join(f"- Strengths of {result.label}: "
+                          + (", ".join(names[m] for m in leader.index[leader == result.label]) or "none")
+                          for result in (gbm, rf)))
+
+    st.markdown("Summed confusion matrices over the folds (rows: true sii, share of the row):")
+    columns = st.columns(2)
+    for column, result in zip(columns, (gbm, rf)):
+        column.markdown(f"**{result.label}**")
+        column.dataframe(result.confusion_matrix(normalize=True))
+
+    ensembles = ensemble_results()
+    if ensembles is None:
+        st.info(f"The model ensembles are not computed yet. Run `{STACKING_COMMAND}` to show them.")
+        return
+    st.markdown(f"""
+        Finally, the two models can be combined on their out-of-fold predictions from {len(ensembles["gbm"].confusion)}
+        stratified folds: a logistic regression on the class probabilities of both (stacking) or their mean (soft
+        voting), scored on the same folds:
+        """)
+    st.markdown(tables.to_markdown(evaluation.comparison(list(ensembles.values()))))
+
+modeling()
@@ -0,0 +1,54 @@
+import streamlit as st
+
+from common import counted_cache_data, feature_stage, show_figure
+from piu import data
+
+# Cumulative explained variance of the PCA stage
+@counted_cache_data("pca_variance")
+def explained_variance(source_key):
+    import pandas as pd
+    pca = feature_stage("pcs", source_key)["pca"]
+    cumulative = pd.DataFrame({"Number of PCs": range(1, len(pca.cumulative_variance_) + 1),
+                               "Cumulative explained variance": pca.cumulative_variance_})
+    return cumulative, pca.n_components_
+
+# PCA and Dimensionality Reduction Section
+def pca_section():
+    st.header("PCA and Dimensionality Reduction Section")
+    st.markdown("""
+        In this section, each step of PCA and the ultimate dimensionality reduction aim is presented. 
+        Let's get into it!
+        """)
+    st.markdown("""
+        - **Step 0:** As reviewed in the previous section, features are now ready (cleaned, scaled, and encoded) to start 
+        the PCA.
+        - **Step 1:** Dropping the target variable (sii), the scree plot determines the number of required PCs. 12 PCs
+        are chosen as they explained 95% of the cumulative variability. The feature numbers are now halfed!
+        """)
+    show_figure("pc_1.png", use_column_width=True)
+    cumulative, n_components = explained_variance(data.source_key("cleaned"))
+    st.line_chart(cumulative, x="Number of PCs", y="Cumulative explained variance")
+    st.caption(f"Recomputed from the current data: {n_components} PCs explain at least 95% of the variance.")
+    st.markdown("""
+        - **Step 2:** Let's visualize the data points, eventhough high differentiability is not expected!
+        """)
+    show_figure("pc_2.png", use_column_width=True)
+    st.markdown("""
+        - **Step 3:** Just out of curiosity, let's see how would K-Mean clustering work!
+        """)
+    show_figure("pc_3.png", use_column_width=True)
+    st.markdown("""
+        - **Step 4:** Now, let's visualize the contribution of features in PCs.
+        """)
+    show_figure("pc_4.png", use_column_width=True)
+    show_figure("pc_5.png", use_column_width=True)
+    st.markdown("""
+        Features are as follows:
+        
+        0: Basic_Demos-Age, 1: Basic_Demos-Sex, 2: CGAS-CGAS_Score, 3: Physical-BMI, 4: Physical-Height, 
+        5: Physical-Weight, 6: Physical-Waist_Circumference, 7: Physical-Diastolic_BP, 8: Physical-HeartRate, 
+        9: Physical-Systolic_BP, 10: FGC-FGC_CU, 11: FGC-FGC_GSND, 12: FGC-FGC_GSD, 13: FGC-FGC_PU, 14: FGC-FGC_SRL,
+        15: FGC-FGC_SRR, 16: FGC-FGC_TL, 17: SDS-SDS_Total_Raw, 18: SDS-SDS_Total_T, 19: PreInt_EduHx-computerinternet_hoursday
+        """)
+
+pca_section()
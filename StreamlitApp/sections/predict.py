@@ -0,0 +1,54 @@
+import streamlit as st
+
+from piu import data, tables
+
+# Compiled (affine-folded) pipeline per model, loaded once per server process
+@st.cache_resource
+def compiled_model(name):
+    from piu import model
+    from piu.fastpath import CompiledPipeline
+    pipeline, metadata = model.load_or_train(name)
+    return CompiledPipeline(pipeline), metadata
+
+# Predict Section
+def predict_section():
+    from piu import model
+    import numpy as np
+    import time
+
+    st.header("Predict")
+    st.markdown("""
+        Enter the measurements of a participant to get the predicted Severity Impairment Index (sii) and the
+        probability of each class. The defaults are the medians of the cleaned training data.
+        """)
+    model_names = {"Gradient Boosting Classifier": "gbm", "Random Forest": "rf",
+                   "Histogram Gradient Boosting": "hgb"}
+    selected_model = st.radio("Model", list(model_names), horizontal=True)
+    with st.spinner("Loading the model (it is trained once if no stored version exists)..."):
+        compiled, metadata = compiled_model(model_names[selected_model])
+
+    medians = data.load("cleaned", columns=model.FEATURES).median()
+    sex_labels = tables.SEX_LABELS
+    internet_labels = tables.INTERNET_USE_LABELS
+    with st.form("predict_form"):
+        values = {}
+        columns = st.columns(3)
+        for i, feature in enumerate(model.SCALED_COLUMNS):
+            values[feature] = columns[i % 3].number_input(feature, value=round(float(medians[feature]), 2))
+        values["Basic_Demos-Sex"] = columns[0].selectbox("Basic_Demos-Sex", list(sex_labels),
+                                                         format_func=sex_labels.get)
+        values["PreInt_EduHx-computerinternet_hoursday"] = columns[1].selectbox(
+            "PreInt_EduHx-computerinternet_hoursday", list(internet_labels), format_func=internet_labels.get)
+        submitted = st.form_submit_button("Predict sii")
+
+    if submitted:
+        row = np.array([[values[feature] for feature in model.FEATURES]], dtype=float)
+        start = time.perf_counter()
+        proba = compiled.predict_proba(row)[0]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        predicted = int(compiled.classes_[np.argmax(proba)])
+        st.markdown(f"**Predicted sii:** {tables.SII_LABELS[predicted]}")
+        st.bar_chart({"Probability": {tables.SII_LABELS[int(c)]: p for c, p in zip(compiled.classes_, proba)}})
+        st.caption(f"Scored in {elapsed_ms:.1f} ms with model version {metadata['version']}.")
+
+predict_section()
@@ -0,0 +1,239 @@
+"""Benchmark of the preprocessing -> PCA -> classifier pipeline at growing cohort sizes.
+
+Every stage of Notebooks/Modeling.ipynb (plus csv loading and imputation) is timed on
+Data/train_df_cleaned.csv and on synthetic upsampled copies of it (rows tiled with a small jitter on
+the continuous features). For each (stage, scale) the wall-clock time and the peak memory growth are
+reported (resident set size sampled every few ms on Linux, so native sklearn allocations count too;
+traced Python allocations elsewhere). Each stage runs --repeat times and the minimum time and memory
+growth are kept, in the results and the baseline alike, so that a single noisy run does not count as
+a regression. A stage that exceeds --stage-timeout is skipped at the larger scales, which shows the
+stage that breaks first as the cohort grows.
+
+    python benchmarks/bench_pipeline.py --scales 1 10 100 --save-baseline
+    python benchmarks/bench_pipeline.py --scales 1 10 100        # exits with 1 on a regression
+
+Baselines are machine specific, so benchmarks/baseline.json is not tracked.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(current_dir))
+
+from piu import data, metrics, model  # noqa: E402
+from piu.impute import ImputationEngine  # noqa: E402
+from piu.reduction import StreamingPCA  # noqa: E402
+
+BASELINE_PATH = os.path.join(current_dir, 'baseline.json')
+
+# Stages that need the output of earlier stages, so they are skipped together with them
+DEPENDS = {'scale_encode': 'load', 'pca': 'scale_encode', 'smote': 'pca', 'gbm_fit': 'smote',
+           'gbm_predict': 'gbm_fit', 'rf_fit': 'smote', 'rf_predict': 'rf_fit', 'hgb_fit': 'smote',
+           'hgb_predict': 'hgb_fit'}
+
+
+def upsample(df, scale, seed=0):
+    """`scale` jittered copies of `df`; the first copy is the original data."""
+    if scale == 1:
+        return df.reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+    out = pd.concat([df] * scale, ignore_index=True)
+    continuous = [c for c in model.SCALED_COLUMNS if c in out.columns]
+    values = out[continuous].to_numpy(dtype='float64', na_value=np.nan)
+    jitter = rng.normal(0, 0.01, size=values.shape) * np.nanstd(values, axis=0)
+    jitter[:len(df)] = 0
+    out[continuous] = values + jitter
+    return out
+
+
+class RSSSampler(threading.Thread):
+    """Background thread recording the peak resident set size while a stage runs."""
+
+    def __init__(self, interval=0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.start_rss = self.peak = metrics.process_rss()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, metrics.process_rss())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, metrics.process_rss())
+        return self.peak - self.start_rss
+
+
+def measure_once(func):
+    """(result, seconds, peak memory growth in MiB) of calling `func`."""
+    gc.collect()
+    if os.path.exists(metrics.STATM_PATH):
+        sampler = RSSSampler()
+        sampler.start()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        peak = sampler.stop()
+    else:
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def measure(func, repeat=3, timeout=None):
+    """(result, minimum seconds, minimum peak memory growth in MiB) over `repeat` calls of `func`.
+
+    The repeats stop early once a call takes longer than `timeout` seconds.
+    """
+    timings, peaks = [], []
+    for _ in range(repeat):
+        result, seconds, peak_mib = measure_once(func)
+        timings.append(seconds)
+        peaks.append(peak_mib)
+        if timeout is not None and seconds > timeout:
+            break
+    return result, min(timings), min(peaks)
+
+
+def stages(scale, workdir):
+    """(name, callable) of every benchmarked stage; callables share intermediate results via `state`."""
+    state = {}
+    cleaned = data.read_csv(data.source_path('cleaned'))
+    raw = data.read_csv(data.source_path('train_df'))
+    csv_path = os.path.join(workdir, f'cleaned_x{scale}.csv')
+    upsample(cleaned, scale).to_csv(csv_path, index=False)
+    state['raw'] = upsample(raw, scale, seed=1)
+
+    def load():
+        state['df'] = data.read_csv(csv_path)
+
+    def impute():
+        engine = ImputationEngine()
+        engine.fit(raw)
+        engine.transform(state['raw'])
+
+    def scale_encode():
+        df = state['df']
+        state['y'] = df[model.TARGET].to_numpy(dtype=int)
+        state['X'] = model.make_preprocessor().fit_transform(model.feature_frame(df))
+
+    def pca():
+        # Exact SVD up to 100k rows, streamed in blocks beyond
+        state['pcs'] = StreamingPCA(variance=model.EXPLAINED_VARIANCE).fit_transform(state['X'])
+
+    def smote():
+        from imblearn.over_sampling import SMOTE
+        state['X_res'], state['y_res'] = SMOTE(random_state=42, **model.SMOTE_PARAMS).fit_resample(
+            state['pcs'], state['y'])
+
+    def fit(name):
+        def run():
+            state[name] = model.make_classifier(name).fit(state['X_res'], state['y_res'])
+        return run
+
+    def predict(name):
+        def run():
+            state[name].predict_proba(state['pcs'])
+        return run
+
+    def hgb_native():
+        # Histogram boosting on the unimputed features, in place of impute + scale_encode + hgb_fit
+        labeled = state['raw'][state['raw'][model.TARGET].notna()]
+        model.build_pipeline('hgb').fit(model.feature_frame(labeled), labeled[model.TARGET].to_numpy(dtype=int))
+
+    return [('load', load), ('impute', impute), ('scale_encode', scale_encode), ('pca', pca),
+            ('smote', smote), ('gbm_fit', fit('gbm')), ('gbm_predict', predict('gbm')),
+            ('rf_fit', fit('rf')), ('rf_predict', predict('rf')), ('hgb_fit', fit('hgb')),
+            ('hgb_predict', predict('hgb')), ('hgb_native', hgb_native)]
+
+
+def run(scales, stage_timeout, repeat=3):
+    results = []
+    exceeded = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in scales:
+            skipped = set()
+            for name, func in stages(scale, workdir):
+                if name in exceeded or DEPENDS.get(name) in skipped:
+                    reason = f'exceeded at x{exceeded[name]}' if name in exceeded else f'needs {DEPENDS[name]}'
+                    results.append({'stage': name, 'scale': scale, 'skipped': reason})
+                    print(f'x{scale:<5} {name:<13} skipped ({reason})', flush=True)
+                    skipped.add(name)
+                    continue
+                _, seconds, peak_mib = measure(func, repeat, stage_timeout)
+                results.append({'stage': name, 'scale': scale, 'seconds': seconds, 'peak_mib': peak_mib})
+                print(f'x{scale:<5} {name:<13} {seconds:9.3f} s {peak_mib:10.1f} MiB', flush=True)
+                if seconds > stage_timeout:
+                    exceeded[name] = scale
+    return results
+
+
+def regressions(results, baseline, tolerance, min_seconds, min_mib):
+    """Stages slower (or hungrier) than the baseline by more than `tolerance`."""
+    reference = {(r['stage'], r['scale']): r for r in baseline if 'seconds' in r}
+    failures = []
+    for r in results:
+        base = reference.get((r['stage'], r['scale']))
+        if base is None or 'seconds' not in r:
+            continue
+        if r['seconds'] > base['seconds'] * (1 + tolerance) and r['seconds'] - base['seconds'] > min_seconds:
+            failures.append(f"{r['stage']} x{r['scale']}: {base['seconds']:.3f} s -> {r['seconds']:.3f} s")
+        if r['peak_mib'] > base['peak_mib'] * (1 + tolerance) and r['peak_mib'] - base['peak_mib'] > min_mib:
+            failures.append(f"{r['stage']} x{r['scale']}: {base['peak_mib']:.1f} MiB -> {r['peak_mib']:.1f} MiB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the sii modeling pipeline stage by stage.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='upsampling factors of train_df_cleaned.csv (e.g. 1 10 100 1000)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage; the minimum is kept')
+    parser.add_argument('--stage-timeout', type=float, default=300.0,
+                        help='seconds after which a stage is skipped at larger scales')
+    parser.add_argument('--output', default=None, help='json file for the results')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='ignore slowdowns below this')
+    parser.add_argument('--min-mib', type=float, default=16.0, help='ignore memory growth below this')
+    args = parser.parse_args()
+
+    results = run(args.scales, args.stage_timeout, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Saved baseline to {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        print('No baseline to compare against; run with --save-baseline first.')
+        return 0
+
+    with open(args.baseline) as f:
+        failures = regressions(results, json.load(f), args.tolerance, args.min_seconds,
+                               args.min_mib)
+    for failure in failures:
+        print(f'REGRESSION {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Shared building blocks for the Child Mind Institute — Problematic Internet Use project.
+
+The Streamlit app (StreamlitApp/app.py), the notebooks and the batch jobs all import from here so
+that every consumer goes through the same code path.
+"""
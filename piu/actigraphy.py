@@ -0,0 +1,118 @@
+"""Streaming feature extraction from the actigraphy series (series_train.parquet).
+
+The HBN release stores the wrist-worn accelerometer data as one parquet partition per participant
+(series_train.parquet/id=<id>/part-0.parquet). Partitions are processed one at a time per worker in
+a process pool: each worker reads only the columns it needs, reduces the series to a fixed set of
+aggregate features with vectorized NumPy and returns a single small row, so memory stays bounded by
+(number of workers x one participant) however many participants are processed. The feature table
+is then joined to train_df_cleaned.csv by `id`.
+
+    python -m piu.actigraphy Data/series_train.parquet -o Data/actigraphy_features.csv --jobs 4
+"""
+import argparse
+import glob
+import os
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from piu import data
+
+SERIES_DIR = os.path.join(data.DATA_DIR, 'series_train.parquet')
+COLUMNS = ['enmo', 'anglez', 'light', 'non-wear_flag', 'time_of_day', 'relative_date_PCIAT']
+PREFIX = 'ACT-'
+
+# Parts of the day (hours) for the activity profile, and the ENMO level counted as active (g)
+DAY_PARTS = {'night': (0, 6), 'morning': (6, 12), 'afternoon': (12, 18), 'evening': (18, 24)}
+ACTIVE_ENMO = 0.1
+NS_PER_HOUR = 3600 * 10 ** 9
+
+
+def participant_files(series_dir=SERIES_DIR):
+    """(id, parquet file) of every participant partition under `series_dir`."""
+    paths = sorted(glob.glob(os.path.join(series_dir, 'id=*', '*.parquet')))
+    return [(os.path.basename(os.path.dirname(path)).split('=', 1)[1], path) for path in paths]
+
+
+def series_features(series):
+    """Aggregate features of one participant's series (a dict of equal-length NumPy arrays)."""
+    non_wear = series['non-wear_flag'].astype(bool)
+    worn = ~non_wear
+    enmo = series['enmo'][worn]
+    anglez = series['anglez'][worn]
+    hours = series['time_of_day'][worn] // NS_PER_HOUR
+
+    features = {
+        'n_observations': len(non_wear),
+        'n_days': len(np.unique(series['relative_date_PCIAT'])),
+        'nonwear_fraction': float(non_wear.mean()) if len(non_wear) else np.nan,
+    }
+    if len(enmo):
+        p50, p95 = np.percentile(enmo, [50, 95])
+        features.update({
+            'enmo_mean': enmo.mean(), 'enmo_std': enmo.std(), 'enmo_max': enmo.max(),
+            'enmo_p50': p50, 'enmo_p95': p95,
+            'anglez_mean': anglez.mean(), 'anglez_std': anglez.std(),
+            'light_mean': np.nanmean(series['light'][worn]),
+            'active_fraction': (enmo > ACTIVE_ENMO).mean(),
+        })
+        # Mean ENMO per part of the day in one pass: bin every sample, then weighted bincounts
+        edges = [start for start, _ in DAY_PARTS.values()][1:]
+        part = np.digitize(hours, edges)
+        sums = np.bincount(part, weights=enmo, minlength=len(DAY_PARTS))
+        counts = np.bincount(part, minlength=len(DAY_PARTS))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        features.update({f'enmo_{name}': mean for name, mean in zip(DAY_PARTS, means)})
+    return {PREFIX + name: value for name, value in features.items()}
+
+
+def extract_file(item):
+    """Read one participant partition (only the needed columns) and return its feature row."""
+    import pyarrow.parquet as pq
+
+    participant, path = item
+    table = pq.read_table(path, columns=COLUMNS)
+    series = {column: table.column(column).to_numpy() for column in COLUMNS}
+    return {'id': participant, **series_features(series)}
+
+
+def extract(series_dir=SERIES_DIR, n_jobs=None, chunksize=4):
+    """Feature table (one row per participant) of every partition under `series_dir`."""
+    files = participant_files(series_dir)
+    if not files:
+        raise FileNotFoundError(f'No participant partitions (id=*/*.parquet) under {series_dir}')
+    if n_jobs == 1:
+        rows = [extract_file(item) for item in files]
+    else:
+        with Pool(processes=n_jobs) as pool:
+            rows = list(pool.imap_unordered(extract_file, files, chunksize=chunksize))
+    return pd.DataFrame(rows).sort_values('id').reset_index(drop=True)
+
+
+def join_features(features, source='cleaned'):
+    """Left-join actigraphy features to a tabular source by participant id."""
+    df = data.load(source)
+    features = features.astype({'id': df['id'].dtype})
+    return df.merge(features, on='id', how='left')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract actigraphy features per participant.')
+    parser.add_argument('series_dir', nargs='?', default=SERIES_DIR)
+    parser.add_argument('-o', '--output', default=os.path.join(data.DATA_DIR, 'actigraphy_features.csv'))
+    parser.add_argument('--joined', default=None, help='also write train_df_cleaned joined with the features')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: all cores)')
+    args = parser.parse_args()
+
+    features = extract(args.series_dir, args.jobs)
+    features.to_csv(args.output, index=False)
+    print(f'Extracted features of {len(features)} participants -> {args.output}')
+    if args.joined:
+        join_features(features).to_csv(args.joined, index=False)
+        print(f'Joined features -> {args.joined}')
+
+
+if __name__ == '__main__':
+    main()
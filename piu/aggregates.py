@@ -0,0 +1,78 @@
+"""Server-side aggregations behind the interactive EDA charts.
+
+The app never ships participant rows to the browser: each chart is drawn from a compact summary
+(histogram counts, box-plot quantiles, descriptive statistics) computed here with vectorized NumPy/pandas
+on the rows that pass the age group / sex / sii filters.
+"""
+import numpy as np
+import pandas as pd
+
+from piu import tables
+
+FILTER_COLUMNS = ['Basic_Demos-Age', 'Basic_Demos-Sex', 'sii']
+BOX_COLUMNS = ['group', 'q1', 'median', 'q3', 'count', 'min', 'max', 'whisker_low', 'whisker_high']
+
+
+def filter_mask(df, age_groups=None, sexes=None, sii_values=None):
+    """Boolean mask of the rows in the selected age groups, sexes and sii values (None keeps all)."""
+    mask = np.ones(len(df), dtype=bool)
+    if age_groups is not None:
+        mask &= tables.age_group(df['Basic_Demos-Age']).isin(age_groups).to_numpy()
+    if sexes is not None:
+        mask &= df['Basic_Demos-Sex'].isin(sexes).to_numpy(dtype=bool, na_value=False)
+    if sii_values is not None:
+        sii = df['sii'].to_numpy(dtype='float64', na_value=np.nan)
+        # 'Missing' selects the participants without a sii
+        selected = [v for v in sii_values if v != tables.MISSING]
+        mask &= np.isin(sii, selected) | (np.isnan(sii) & (tables.MISSING in sii_values))
+    return mask
+
+
+def histogram(values, bins=30, value_range=None):
+    """Counts per bin of the non-missing `values`; pass `value_range` to keep bins stable across filters."""
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    if value_range is None:
+        value_range = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    return pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+
+
+def box_stats(df, column, by):
+    """Box-plot summary of `column` per group of `by`: quartiles, 1.5 IQR whiskers and counts."""
+    values = pd.Series(df[column].to_numpy(dtype='float64', na_value=np.nan), index=df.index)
+    if not values.notna().any():
+        return pd.DataFrame(columns=BOX_COLUMNS)
+    groups = df[by].astype('Float64').fillna(-1).astype(int) if by == 'sii' else df[by]
+    grouped = values.groupby(groups, observed=True)
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'median', 'q3']
+    stats['count'] = grouped.count()
+    stats['min'] = grouped.min()
+    stats['max'] = grouped.max()
+    iqr = stats['q3'] - stats['q1']
+    stats['whisker_low'] = np.maximum(stats['min'], stats['q1'] - 1.5 * iqr)
+    stats['whisker_high'] = np.minimum(stats['max'], stats['q3'] + 1.5 * iqr)
+    stats = stats[stats['count'] > 0].reset_index(names='group')
+    if by == 'sii':
+        stats['group'] = stats['group'].map(lambda g: tables.MISSING if g == -1 else tables.SII_LABELS[g])
+    return stats
+
+
+def describe(df, columns):
+    """Count, mean, std, quartiles, extremes and missing count per column, like the EDA tables."""
+    values = df[columns].to_numpy(dtype='float64', na_value=np.nan)
+    with np.errstate(all='ignore'):
+        summary = pd.DataFrame({
+            'Count': np.sum(~np.isnan(values), axis=0),
+            'Mean': np.nanmean(values, axis=0),
+            'Std': np.nanstd(values, axis=0, ddof=1),
+            'Min': np.nanmin(values, axis=0) if len(values) else np.nan,
+            '25%': np.nanpercentile(values, 25, axis=0) if len(values) else np.nan,
+            '50%': np.nanpercentile(values, 50, axis=0) if len(values) else np.nan,
+            '75%': np.nanpercentile(values, 75, axis=0) if len(values) else np.nan,
+            'Max': np.nanmax(values, axis=0) if len(values) else np.nan,
+            'Missing': np.sum(np.isnan(values), axis=0),
+        }, index=columns)
+    return summary.round(2)
+
@@ -0,0 +1,76 @@
+"""Figure asset store for the Streamlit app.
+
+On a cache miss, a figure is decoded from disk, downscaled to the requested display width and
+re-encoded as WebP; each width offered by the app is a separate variant, so a figure is decoded once
+per width. The encoded variants are kept in a least-recently-used cache with a byte budget, so
+repeated reruns (and concurrent sessions sharing the same store) of a cached variant never touch the
+disk or the PNG decoder again. The decoded source images are not kept: at full resolution they are
+far larger than the encoded variants.
+"""
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+# Widths (in px) offered to the app; None serves the figure at its original resolution
+DEFAULT_WIDTH = 1200
+DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+WEBP_QUALITY = 85
+
+
+class FigureStore:
+    """Lazily loaded, byte-bounded LRU cache of encoded figure variants keyed by (name, width)."""
+
+    def __init__(self, figures_dir, budget_bytes=DEFAULT_BUDGET_BYTES, quality=WEBP_QUALITY):
+        self.figures_dir = figures_dir
+        self.budget_bytes = budget_bytes
+        self.quality = quality
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, width=DEFAULT_WIDTH):
+        """Return the WebP bytes of figure `name`, no wider than `width` pixels."""
+        key = (name, width)
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        # Encode outside the lock so that one slow figure does not block the other sessions
+        data = self._encode(name, width)
+
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = data
+                self.nbytes += len(data)
+                self._evict()
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.nbytes = 0
+
+    def _encode(self, name, width):
+        with Image.open(os.path.join(self.figures_dir, name)) as image:
+            image.load()
+            if width is not None and image.width > width:
+                height = round(image.height * width / image.width)
+                image = image.resize((width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format="WEBP", quality=self.quality, method=4)
+        return buffer.getvalue()
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it alone exceeds the budget
+        while self.nbytes > self.budget_bytes and len(self._cache) > 1:
+            _, data = self._cache.popitem(last=False)
+            self.nbytes -= len(data)
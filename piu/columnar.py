@@ -0,0 +1,103 @@
+"""Columnar (Arrow/Feather) cache of the csv files in Data/.
+
+`python -m piu.columnar` converts every csv once into an uncompressed Feather v2 file under
+Data/cache/, keeping the typed dtypes from `piu.data.downcast` (Season columns as categoricals,
+PCIAT items and other integer fields as nullable Int8/Int16). Reads are memory-mapped and projected,
+so a section that needs a single instrument only pages in those columns instead of parsing the whole
+82-column csv. A cache file remembers the fingerprint of the csv it was built from and is rebuilt
+automatically once the csv changes.
+"""
+import argparse
+import os
+
+from piu import data, jobs
+
+CACHE_DIR = os.path.join(data.DATA_DIR, 'cache')
+FINGERPRINT_KEY = b'piu.source_fingerprint'
+
+# Columns missing from data_dictionary.csv, assigned to the instrument they are derived from
+EXTRA_INSTRUMENTS = {'sii': 'Parent-Child Internet Addiction Test'}
+
+
+def available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def cache_path(name):
+    return os.path.join(CACHE_DIR, os.path.splitext(data.SOURCES[name])[0] + '.arrow')
+
+
+def _fingerprint(name):
+    mtime_ns, size = data.source_key(name)
+    return f'{mtime_ns}:{size}'.encode()
+
+
+def is_fresh(name):
+    import pyarrow as pa
+
+    path = cache_path(name)
+    if not os.path.exists(path):
+        return False
+    with pa.memory_map(path) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return metadata.get(FINGERPRINT_KEY) == _fingerprint(name)
+
+
+def convert(name):
+    """Write the typed frame of source `name` to its Feather cache file and return the path."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    df = data.read_csv(data.source_path(name))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, FINGERPRINT_KEY: _fingerprint(name)})
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Uncompressed so that reads can be memory-mapped without a decode step; concurrent rebuilds of a
+    # stale cache each write their own temporary file
+    return jobs.atomic_write(cache_path(name), lambda tmp_path: feather.write_feather(
+        table, tmp_path, compression='uncompressed'))
+
+
+def read(name, columns=None):
+    """Read source `name` (only `columns`, if given) from the Feather cache, rebuilding it if stale."""
+    import pyarrow.feather as feather
+
+    if not is_fresh(name):
+        convert(name)
+    table = feather.read_table(cache_path(name), columns=columns, memory_map=True)
+    return table.to_pandas()
+
+
+def column_instruments(columns):
+    """Map each column to its HBN instrument from data_dictionary.csv (None if unknown)."""
+    dictionary = data.load('dictionary')
+    field_instrument = dict(zip(dictionary['Field'], dictionary['Instrument']))
+    field_instrument.update(EXTRA_INSTRUMENTS)
+    # Derived columns (e.g. 'Basic_Demos-Sex-Category') inherit the instrument of their prefix
+    prefix_instrument = {field.split('-')[0]: instrument for field, instrument in field_instrument.items()}
+    return {column: field_instrument.get(column, prefix_instrument.get(column.split('-')[0]))
+            for column in columns}
+
+
+def instrument_columns(name, instruments):
+    """Columns of source `name` that belong to the given HBN instruments (plus `id`)."""
+    return [column for column, instrument in column_instruments(data.column_names(name)).items()
+            if column in data.ID_COLUMNS or instrument in instruments]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the Data/ csv files to the Feather cache.')
+    parser.add_argument('sources', nargs='*', default=['train', 'train_df', 'cleaned'],
+                        choices=sorted(data.SOURCES), help='sources to convert (default: all datasets)')
+    args = parser.parse_args()
+    for name in args.sources:
+        print(f'{data.source_path(name)} -> {convert(name)}')
+
+
+if __name__ == '__main__':
+    main()
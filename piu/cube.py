@@ -0,0 +1,234 @@
+"""Precomputed aggregate cube over age group x sex x sii x internet use.
+
+The participant counts, pie charts and crosstabs of the EDA section are all slices of one small
+table: participant counts, and per measure the sum and the number of non-missing values, for every
+(age group, sex, sii, internet use) cell, with an extra 'Missing' level on each dimension. The cube
+has 4 x 3 x 5 x 5 cells whatever the cohort size, so a lookup only sums a few hundred numbers
+instead of scanning the DataFrame.
+
+The cube remembers the ids it has counted and a hash of each of their rows. When participants are
+appended to a source file, `load_cube` reads the stored cube from Data/cache/ and aggregates only
+the new rows; it rebuilds from scratch if participants were removed or a counted row changed (e.g.
+a corrected sii or PCIAT item).
+
+    python -m piu.cube train
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from piu import data, jobs, tables
+
+CACHE_DIR = os.path.join(data.DATA_DIR, 'cache')
+
+# Dimension levels (a trailing 'Missing' level is added to each) and the column they come from
+DIMENSIONS = {
+    'age_group': tables.AGE_GROUPS,
+    'sex': list(tables.SEX_LABELS),
+    'sii': list(tables.SII_LABELS),
+    'internet_use': list(tables.INTERNET_USE_LABELS),
+}
+DIMENSION_COLUMNS = {
+    'age_group': 'Basic_Demos-Age',
+    'sex': 'Basic_Demos-Sex',
+    'sii': 'sii',
+    'internet_use': 'PreInt_EduHx-computerinternet_hoursday',
+}
+MEASURES = ['Basic_Demos-Age', 'PCIAT-PCIAT_Total', 'Physical-BMI', 'CGAS-CGAS_Score',
+            'SDS-SDS_Total_T', 'PAQ_C-PAQ_C_Total', 'PAQ_A-PAQ_A_Total']
+
+
+def dimension_codes(df, dimension):
+    """Level index of every row along `dimension`; missing or out-of-range values get the last index."""
+    n_levels = len(DIMENSIONS[dimension])
+    column = df[DIMENSION_COLUMNS[dimension]]
+    if dimension == 'age_group':
+        codes = tables.age_group(column).cat.codes.to_numpy().astype(np.int64)
+    else:
+        values = column.to_numpy(dtype='float64', na_value=np.nan)
+        codes = np.where(np.isnan(values), -1, values).astype(np.int64)
+    codes[(codes < 0) | (codes >= n_levels)] = n_levels
+    return codes
+
+
+def _save_arrays(arrays, path):
+    # Through a file object, since np.savez appends .npz to other paths
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+class AggregateCube:
+    """Counts, measure sums and non-missing counts per (age group, sex, sii, internet use) cell."""
+
+    def __init__(self, measures=MEASURES):
+        self.measures = list(measures)
+        self.shape = tuple(len(levels) + 1 for levels in DIMENSIONS.values())
+        self.counts = np.zeros(self.shape, dtype=np.int64)
+        self.sums = np.zeros((len(self.measures),) + self.shape)
+        self.present = np.zeros((len(self.measures),) + self.shape, dtype=np.int64)
+        self.ids = set()
+        self.row_hashes = {}
+
+    @property
+    def columns(self):
+        """Source columns the cube aggregates: the dimension columns and the measures."""
+        return list(dict.fromkeys(list(DIMENSION_COLUMNS.values()) + self.measures))
+
+    def _hashes(self, df):
+        return pd.util.hash_pandas_object(df[self.columns], index=False).to_numpy()
+
+    def changed(self, df):
+        """Whether a counted participant is no longer in `df` or its row differs from the counted one."""
+        ids = df['id'].astype(str).to_numpy()
+        if not self.ids <= set(ids):
+            return True
+        counted = pd.Series(ids).isin(self.ids).to_numpy()
+        stored = np.array([self.row_hashes.get(i, 0) for i in ids[counted]], dtype=np.uint64)
+        return len(self.row_hashes) != len(self.ids) or bool((self._hashes(df[counted]) != stored).any())
+
+    @classmethod
+    def from_frame(cls, df, measures=MEASURES):
+        cube = cls([m for m in measures if m in df.columns])
+        cube.update(df)
+        return cube
+
+    def update(self, df):
+        """Add the participants of `df` not counted yet; returns how many were added."""
+        ids = df['id'].astype(str).to_numpy()
+        new = ~pd.Series(ids).isin(self.ids).to_numpy()
+        if not new.any():
+            return 0
+        df = df[new]
+        size = self.counts.size
+        cells = np.ravel_multi_index([dimension_codes(df, d) for d in DIMENSIONS], self.shape)
+        self.counts += np.bincount(cells, minlength=size).reshape(self.shape)
+        for i, measure in enumerate(self.measures):
+            values = df[measure].to_numpy(dtype='float64', na_value=np.nan)
+            ok = ~np.isnan(values)
+            self.sums[i] += np.bincount(cells[ok], weights=values[ok], minlength=size).reshape(self.shape)
+            self.present[i] += np.bincount(cells[ok], minlength=size).reshape(self.shape)
+        self.ids.update(ids[new])
+        self.row_hashes.update(zip(ids[new], self._hashes(df)))
+        return int(new.sum())
+
+    def _select(self, array, selection, offset=0):
+        """`array` restricted to the selected levels: {dimension: level or list of levels}."""
+        for axis, dimension in enumerate(DIMENSIONS):
+            levels = selection.get(dimension)
+            if levels is None:
+                continue
+            if not isinstance(levels, (list, tuple, set)):
+                levels = [levels]
+            array = array.take([self.level_index(dimension, level) for level in levels], axis=axis + offset)
+        return array
+
+    @staticmethod
+    def level_index(dimension, level):
+        levels = DIMENSIONS[dimension]
+        return len(levels) if level == tables.MISSING else levels.index(level)
+
+    @staticmethod
+    def labels(dimension):
+        return list(DIMENSIONS[dimension]) + [tables.MISSING]
+
+    def count(self, **selection):
+        """Number of participants in the selected cells (unselected dimensions are summed over)."""
+        return int(self._select(self.counts, selection).sum())
+
+    def mean(self, measure, **selection):
+        i = self.measures.index(measure)
+        total = self._select(self.sums[i], selection).sum()
+        present = self._select(self.present[i], selection).sum()
+        return total / present if present else np.nan
+
+    def missing(self, measure, **selection):
+        i = self.measures.index(measure)
+        return self.count(**selection) - int(self._select(self.present[i], selection).sum())
+
+    def marginal(self, dimension, **selection):
+        """Participant counts per level of `dimension` ('Missing' last)."""
+        axis = list(DIMENSIONS).index(dimension)
+        counts = self._select(self.counts, {k: v for k, v in selection.items() if k != dimension})
+        counts = counts.sum(axis=tuple(a for a in range(counts.ndim) if a != axis))
+        return pd.Series(counts, index=self.labels(dimension), name='count')
+
+    def table(self, row, column, **selection):
+        """Participant counts of `row` x `column` levels ('Missing' last), only the selected ones if given."""
+        levels = {dimension: self._selected_labels(dimension, selection.get(dimension)) for dimension in (row, column)}
+        axes = [list(DIMENSIONS).index(row), list(DIMENSIONS).index(column)]
+        counts = self._select(self.counts, {**selection, **levels})
+        counts = counts.sum(axis=tuple(a for a in range(counts.ndim) if a not in axes))
+        if axes[0] > axes[1]:
+            counts = counts.T
+        return pd.DataFrame(counts, index=levels[row], columns=levels[column])
+
+    def _selected_labels(self, dimension, levels):
+        """Labels of `dimension` in their usual order, restricted to `levels` unless it is None."""
+        if levels is None:
+            return self.labels(dimension)
+        if not isinstance(levels, (list, tuple, set)):
+            levels = [levels]
+        return [label for label in self.labels(dimension) if label in levels]
+
+    def save(self, path):
+        ids = sorted(self.ids)
+        arrays = {'counts': self.counts, 'sums': self.sums, 'present': self.present,
+                  'measures': np.array(self.measures), 'ids': np.array(ids),
+                  'row_hashes': np.array([self.row_hashes.get(i, 0) for i in ids], dtype=np.uint64)}
+        jobs.atomic_write(path, lambda tmp_path: _save_arrays(arrays, tmp_path))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as stored:
+            cube = cls(stored['measures'].tolist())
+            cube.counts = stored['counts']
+            cube.sums = stored['sums']
+            cube.present = stored['present']
+            cube.ids = set(stored['ids'].tolist())
+            # Cubes stored before the row hashes have none, and are rebuilt by `load_cube`
+            if 'row_hashes' in stored.files:
+                cube.row_hashes = dict(zip(stored['ids'].tolist(), stored['row_hashes']))
+        return cube
+
+
+def cache_path(name):
+    return os.path.join(CACHE_DIR, f'cube_{name}.npz')
+
+
+def load_cube(name='train'):
+    """Cube of source `name`, updated from the stored cube with only the participants added since.
+
+    The stored cube is rebuilt when participants were removed or any counted row changed.
+    """
+    available = set(data.column_names(name))
+    measures = [m for m in MEASURES if m in available]
+    # Only the id, dimension and measure columns are read (memory-mapped from the Feather cache)
+    df = data.load(name, columns=data.ID_COLUMNS + AggregateCube(measures).columns)
+    path = cache_path(name)
+    cube = None
+    if os.path.exists(path):
+        cube = AggregateCube.load(path)
+        if cube.measures != measures or cube.changed(df):
+            cube = None
+    if cube is None:
+        cube = AggregateCube(measures)
+    if cube.update(df) or not os.path.exists(path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        cube.save(path)
+    return cube
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or update the aggregate cube of a source file.')
+    parser.add_argument('source', nargs='?', default='train', choices=['train', 'train_df'])
+    args = parser.parse_args()
+
+    cube = load_cube(args.source)
+    print(f'{cube.count()} participants -> {cache_path(args.source)}')
+    print(cube.table('age_group', 'sii'))
+
+
+if __name__ == '__main__':
+    main()
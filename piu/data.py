@@ -0,0 +1,124 @@
+"""Cached loaders for the HBN csv files in Data/.
+
+Each file is parsed once per process into a typed DataFrame (string columns as categoricals,
+integer-valued columns as the smallest nullable integer type) and kept in memory until the file on
+disk changes. Callers share the cached frames, so treat them as read-only and copy before mutating.
+Column-projected loads go through the Feather cache in `piu.columnar`.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from piu import metrics
+
+# Directories
+package_dir = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(os.path.dirname(package_dir), 'Data')
+
+# Short names of the csv files shipped with the project
+SOURCES = {
+    'train': 'train.csv',                   # raw Kaggle training set
+    'train_df': 'train_df.csv',             # EDA-cleaned, before imputation
+    'cleaned': 'train_df_cleaned.csv',      # imputed and reduced to the modeling features
+    'dictionary': 'data_dictionary.csv',
+}
+
+# Columns that are identifiers and must stay plain strings
+ID_COLUMNS = ['id']
+SEASONS = ['Spring', 'Summer', 'Fall', 'Winter']
+
+_cache = {}
+_lock = threading.Lock()
+# Loads answered from memory / read from disk, reported by piu.metrics
+hits = 0
+misses = 0
+
+
+def source_path(name):
+    return os.path.join(DATA_DIR, SOURCES[name])
+
+
+def source_key(name):
+    """Cheap fingerprint of a source file; it changes whenever the file is rewritten."""
+    stat = os.stat(source_path(name))
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load(name, columns=None):
+    """Return the typed DataFrame for `name`, re-reading the file only if it changed on disk.
+
+    With `columns`, only those columns are read; they come memory-mapped from the Feather cache
+    (see `piu.columnar`) when pyarrow is installed, and from the csv otherwise.
+    """
+    global hits, misses
+    key = source_key(name)
+    cache_key = (name, None if columns is None else tuple(columns))
+    with _lock:
+        cached = _cache.get(cache_key)
+        if cached is not None and cached[0] == key:
+            hits += 1
+            return cached[1]
+        misses += 1
+
+    from piu import columnar
+
+    if columnar.available():
+        df = columnar.read(name, columns)
+    else:
+        df = read_csv(source_path(name))
+        if columns is not None:
+            df = df[list(columns)]
+
+    with _lock:
+        _cache[cache_key] = (key, df)
+    return df
+
+
+def load_instruments(name, instruments):
+    """Load only the columns of `name` that belong to the given HBN instruments."""
+    from piu import columnar
+
+    return load(name, columns=columnar.instrument_columns(name, instruments))
+
+
+def column_names(name):
+    """Column names of source `name`, read from the csv header only."""
+    columns = pd.read_csv(source_path(name), nrows=0).columns
+    return [c for c in columns if not c.startswith('Unnamed:')]
+
+
+def read_csv(path):
+    df = pd.read_csv(path)
+    df = df.drop(columns=[c for c in df.columns if c.startswith('Unnamed:')])
+    return downcast(df)
+
+
+def downcast(df):
+    """Store strings as categoricals and integer-valued numbers as nullable integers."""
+    df = df.copy()
+    for column in df.columns:
+        values = df[column]
+        if column in ID_COLUMNS:
+            df[column] = values.astype('string')
+        elif column.endswith('Season'):
+            df[column] = pd.Categorical(values, categories=SEASONS)
+        elif values.dtype == object:
+            df[column] = values.astype('category')
+        elif pd.api.types.is_numeric_dtype(values) and _is_integral(values):
+            df[column] = pd.to_numeric(values.astype('Int64'), downcast='integer')
+    return df
+
+
+def _is_integral(values):
+    present = values.dropna().to_numpy()
+    return present.size > 0 and np.array_equal(present, np.round(present))
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+
+
+metrics.REGISTRY.add_collector(metrics.cache_collector('data', lambda: (hits, misses)))
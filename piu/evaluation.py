@@ -0,0 +1,359 @@
+"""Repeated stratified k-fold evaluation of the sii pipelines, with cached results.
+
+The classification reports of the Modeling section come from a single 80/20 split with 547 test
+participants, so a handful of rows move the minority-class scores by several points. `evaluate`
+instead runs repeated stratified k-fold CV (5 folds x 3 repeats by default) over the cleaned data:
+
+- every fold is one task of a process pool; the task fits the preprocessing (scaler / encoder and
+  the PCA stage, or the scaler / encoder alone for the native-missing 'hgb' backend) on its
+  training rows once and reuses it for every model config evaluated (the ordinal configs regress
+  PCIAT_Total and tune their cut points for QWK inside the fold, see `piu.ordinal`);
+- SMOTE goes through `piu.resample`, so configs with the same SMOTE settings share one resampling;
+- a task returns one confusion matrix per config, from which precision, recall, F1, accuracy and
+  the quadratic weighted kappa (QWK) of every fold are computed at once.
+
+The fold scores are summarized by their mean and a 95% confidence interval from the corrected
+resampled t-test (Nadeau & Bengio), which widens the naive interval to account for the overlap of
+the training sets. Confusion matrices are stored as json under Data/cache/evaluation/, keyed by the
+config, the CV settings and the sha256 of the source file, so only new configs or changed data are
+ever refit.
+
+    python -m piu.evaluation gbm rf --jobs 4
+    python -m piu.evaluation hgb --source train_df
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from piu import data, jobs, model, resample
+from piu.features import file_hash
+
+CACHE_DIR = os.path.join(data.DATA_DIR, 'cache', 'evaluation')
+N_SPLITS = 5
+N_REPEATS = 3
+CONFIDENCE = 0.95
+
+# Model configs of the Modeling section
+CONFIGS = {
+    'gbm_default': {'label': 'Gradient Boosting (default)', 'classifier': 'gbm', 'params': {}, 'smote': None},
+    'gbm': {'label': 'Gradient Boosting', 'classifier': 'gbm', 'params': model.BEST_PARAMS['gbm'],
+            'smote': model.SMOTE_PARAMS},
+    'rf': {'label': 'Random Forest', 'classifier': 'rf', 'params': model.BEST_PARAMS['rf'],
+           'smote': model.SMOTE_PARAMS},
+    # Scaled / encoded features without PCA or SMOTE, missing values included on train_df
+    'hgb': {'label': 'Histogram Gradient Boosting', 'classifier': 'hgb',
+            'params': {**model.BEST_PARAMS['hgb'], 'categorical_features': model.CATEGORICAL_POSITIONS},
+            'smote': None},
+    # Regression on PCIAT_Total with QWK-tuned cut points (`piu.ordinal`)
+    'ordinal': {'label': 'Ordinal regression', 'classifier': 'ordinal',
+                'params': {'target': 'total', 'threshold_folds': 5}, 'smote': None},
+}
+# Classifier name of the `piu.ordinal` configs
+ORDINAL = 'ordinal'
+METRICS = ['precision', 'recall', 'f1']
+
+
+def confusion_matrices(y_true, y_pred, labels=model.CLASSES):
+    """(true x predicted) counts of one fold."""
+    positions = {label: i for i, label in enumerate(labels)}
+    true = np.vectorize(positions.get)(y_true)
+    pred = np.vectorize(positions.get)(y_pred)
+    return np.bincount(true * len(labels) + pred, minlength=len(labels) ** 2).reshape(len(labels), len(labels))
+
+
+def _ratio(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator, dtype='float64'),
+                     where=denominator > 0)
+
+
+def fold_scores(confusion):
+    """Scores of a stack of (folds, classes, classes) confusion matrices, one row per fold.
+
+    Zero divisions count as 0, like `classification_report(zero_division=0)`.
+    """
+    confusion = np.asarray(confusion, dtype='float64')
+    n_classes = confusion.shape[-1]
+    tp = np.diagonal(confusion, axis1=1, axis2=2)
+    support = confusion.sum(axis=2)
+    predicted = confusion.sum(axis=1)
+    total = support.sum(axis=1)
+    scores = {
+        'precision': _ratio(tp, predicted),
+        'recall': _ratio(tp, support),
+    }
+    scores['f1'] = _ratio(2 * scores['precision'] * scores['recall'], scores['precision'] + scores['recall'])
+
+    columns = {}
+    for metric in METRICS:
+        for i in range(n_classes):
+            columns[f'{metric}_{i}'] = scores[metric][:, i]
+        columns[f'{metric}_macro'] = scores[metric].mean(axis=1)
+        columns[f'{metric}_weighted'] = (scores[metric] * support).sum(axis=1) / total
+    columns['accuracy'] = tp.sum(axis=1) / total
+
+    columns['qwk'] = quadratic_weighted_kappa(confusion)
+    return pd.DataFrame(columns)
+
+
+def quadratic_weighted_kappa(confusion):
+    """QWK of a stack of (..., classes, classes) confusion matrices: observed against chance disagreement."""
+    confusion = np.asarray(confusion, dtype='float64')
+    n_classes = confusion.shape[-1]
+    grid = np.arange(n_classes)
+    weights = (grid[:, None] - grid[None, :]) ** 2 / (n_classes - 1) ** 2
+    support = confusion.sum(axis=-1)
+    predicted = confusion.sum(axis=-2)
+    total = support.sum(axis=-1)
+    expected = support[..., :, None] * predicted[..., None, :] / total[..., None, None]
+    return 1 - (weights * confusion).sum(axis=(-2, -1)) / (weights * expected).sum(axis=(-2, -1))
+
+
+def corrected_interval(values, test_fraction, confidence=CONFIDENCE):
+    """Mean and confidence interval of CV fold scores from the corrected resampled t-test."""
+    from scipy import stats
+
+    values = np.asarray(values, dtype='float64')
+    n = len(values)
+    mean = values.mean()
+    variance = (1 / n + test_fraction / (1 - test_fraction)) * values.var(ddof=1)
+    half = stats.t.ppf((1 + confidence) / 2, n - 1) * np.sqrt(variance)
+    return mean, mean - half, mean + half
+
+
+class CVResult:
+    """Per-fold confusion matrices of one config, and the reports derived from them."""
+
+    def __init__(self, name, config, confusion, test_fraction, seconds=None):
+        self.name = name
+        self.config = config
+        self.confusion = np.asarray(confusion, dtype=np.int64)
+        self.test_fraction = test_fraction
+        self.seconds = seconds
+
+    @property
+    def label(self):
+        return self.config.get('label', self.name)
+
+    def scores(self):
+        return fold_scores(self.confusion)
+
+    def summary(self, confidence=CONFIDENCE):
+        """Mean, lower and upper bound of every score (one row per score)."""
+        rows = {column: corrected_interval(values, self.test_fraction, confidence)
+                for column, values in self.scores().items()}
+        table = pd.DataFrame.from_dict(rows, orient='index', columns=['mean', 'low', 'high'])
+        # Scores are proportions except the kappa
+        table.loc[table.index != 'qwk'] = table.loc[table.index != 'qwk'].clip(0, 1)
+        return table.clip(-1, 1)
+
+    def report(self, digits=2, confidence=CONFIDENCE):
+        """Classification report with "mean [low, high]" cells and the mean support per fold."""
+        summary = self.summary(confidence)
+        support = self.confusion.sum(axis=2).mean(axis=0)
+
+        def cell(column):
+            mean, low, high = summary.loc[column]
+            return f'{mean:.{digits}f} [{low:.{digits}f}, {high:.{digits}f}]'
+
+        rows = []
+        for i, label in enumerate(model.CLASSES):
+            rows.append([f'{float(label)}'] + [cell(f'{metric}_{i}') for metric in METRICS] + [f'{support[i]:.0f}'])
+        for average, title in (('macro', '**Macro Avg**'), ('weighted', '**Weighted Avg**')):
+            rows.append([title] + [cell(f'{metric}_{average}') for metric in METRICS] + [f'{support.sum():.0f}'])
+        rows.append(['**Accuracy**', '', '', cell('accuracy'), f'{support.sum():.0f}'])
+        rows.append(['**QWK**', '', '', cell('qwk'), f'{support.sum():.0f}'])
+        return pd.DataFrame(rows, columns=['Class', 'Precision', 'Recall', 'F1-Score', 'Support'])
+
+    def confusion_matrix(self, normalize=False):
+        """Confusion matrix summed over the folds (row-normalized to recall with normalize=True)."""
+        total = self.confusion.sum(axis=0)
+        labels = [float(label) for label in model.CLASSES]
+        table = pd.DataFrame(total, index=pd.Index(labels, name='True'), columns=pd.Index(labels, name='Predicted'))
+        return table.div(table.sum(axis=1), axis=0).round(3) if normalize else table
+
+    def to_json(self):
+        return {'name': self.name, 'config': self.config, 'confusion': self.confusion.tolist(),
+                'test_fraction': self.test_fraction, 'seconds': self.seconds}
+
+    @classmethod
+    def from_json(cls, state):
+        return cls(state['name'], state['config'], state['confusion'], state['test_fraction'], state['seconds'])
+
+
+def comparison(results, digits=2):
+    """Per-class F1, weighted F1, macro recall, accuracy and QWK of several configs side by side."""
+    rows = [(f'**Class `{float(label)}` F1-score**', f'f1_{i}') for i, label in enumerate(model.CLASSES)]
+    rows += [('**Weighted Avg F1-score**', 'f1_weighted'), ('**Macro Avg Recall**', 'recall_macro'),
+             ('**Accuracy**', 'accuracy'), ('**QWK**', 'qwk')]
+    summaries = [result.summary() for result in results]
+    table = {'Metric': [title for title, _ in rows]}
+    for result, summary in zip(results, summaries):
+        table[result.label] = [f'{summary.loc[column, "mean"]:.{digits}f} ± '
+                               f'{(summary.loc[column, "high"] - summary.loc[column, "low"]) / 2:.{digits}f}'
+                               for _, column in rows]
+    return pd.DataFrame(table)
+
+
+# Cross-validation
+def cv_folds(y, n_splits=N_SPLITS, n_repeats=N_REPEATS, random_state=42):
+    from sklearn.model_selection import RepeatedStratifiedKFold
+
+    splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+
+def native_features(config):
+    """Whether a config is trained on the scaled / encoded features as they are (no PCA, NaN allowed)."""
+    return config['classifier'] in model.NATIVE_MISSING or config['classifier'] == ORDINAL
+
+
+def fold_transformers(native):
+    """Unfitted (name, step) preprocessing of a fold: scaler / encoder, then PCA unless `native`."""
+    from piu.reduction import StreamingPCA
+
+    steps = [('preprocess', model.make_preprocessor(allow_missing=native))]
+    if not native:
+        steps.append(('pca', StreamingPCA(variance=model.EXPLAINED_VARIANCE)))
+    return steps
+
+
+def _prepare(train_idx, val_idx, native):
+    """Preprocessed (and, unless `native`, PCA-reduced) training and validation rows of one fold."""
+    X, y = jobs.state['X'], jobs.state['y']
+    X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]
+    for _, step in fold_transformers(native):
+        X_train = step.fit_transform(X_train)
+        X_val = step.transform(X_val)
+    return X_train, X_val, resample.array_hash(X_train, y[train_idx])
+
+
+def fit_config(config, X_train, y_train, totals=None, random_state=42, data_key=None):
+    """The classifier of `config` fitted on preprocessed training rows, after SMOTE if the config uses it."""
+    X_fit, y_fit = X_train, y_train
+    if config['smote'] is not None:
+        X_fit, y_fit = resample.default_cache().resample(
+            X_train, y_train, {**config['smote'], 'random_state': random_state}, data_key=data_key)
+    if config['classifier'] == ORDINAL:
+        from piu.ordinal import OrdinalClassifier
+
+        return OrdinalClassifier(random_state=random_state, **config['params']).fit(X_fit, y_fit, totals)
+    estimator = model.CLASSIFIERS[config['classifier']](random_state=random_state, **config['params'])
+    return estimator.fit(np.asarray(X_fit), np.asarray(y_fit))
+
+
+def _evaluate_fold(train_idx, val_idx):
+    """Confusion matrix and fit time of every config on one fold, sharing the fold's preprocessing."""
+    y, totals, random_state = jobs.state['y'], jobs.state['totals'], jobs.state['random_state']
+    prepared = {}
+    results = {}
+    for name, config in jobs.state['configs'].items():
+        native = native_features(config)
+        if native not in prepared:
+            prepared[native] = _prepare(train_idx, val_idx, native)
+        X_train, X_val, data_key = prepared[native]
+
+        start = time.perf_counter()
+        estimator = fit_config(config, X_train, y[train_idx], None if totals is None else totals[train_idx],
+                               random_state, data_key)
+        results[name] = (confusion_matrices(y[val_idx], estimator.predict(X_val)).tolist(),
+                         time.perf_counter() - start)
+    return results
+
+
+def training_data(configs, source='cleaned'):
+    """(X, y, PCIAT totals or None) of `source` for `configs`, checking that they can use its features."""
+    X, y = model.training_data(source)
+    complete = [name for name, config in configs.items() if not native_features(config)]
+    if complete and X.isna().any(axis=None):
+        raise ValueError(f'{complete} need imputed features; {source!r} has missing values')
+    totals = None
+    if any(config['classifier'] == ORDINAL for config in configs.values()):
+        from piu.ordinal import training_totals
+
+        totals = training_totals(source)
+    return X, y, totals
+
+
+def cache_key(config, source, n_splits, n_repeats, random_state):
+    text = json.dumps([{k: v for k, v in config.items() if k != 'label'}, model.FEATURES,
+                       model.EXPLAINED_VARIANCE, file_hash(source), n_splits, n_repeats, random_state],
+                      sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def _cache_path(cache_dir, name, key):
+    return os.path.join(cache_dir, f'{name}-{key}.json')
+
+
+def cached_results(names=('gbm', 'rf'), configs=None, source='cleaned', n_splits=N_SPLITS, n_repeats=N_REPEATS,
+                   random_state=42, cache_dir=CACHE_DIR):
+    """{name: CVResult} of the named configs already in the cache; nothing is fitted."""
+    results = {}
+    for name in names:
+        config = (configs or CONFIGS)[name]
+        path = _cache_path(cache_dir, name, cache_key(config, source, n_splits, n_repeats, random_state))
+        if os.path.exists(path):
+            with open(path) as f:
+                results[name] = CVResult.from_json(json.load(f))
+    return results
+
+
+def _write_json(value, path):
+    with open(path, 'w') as f:
+        json.dump(value, f)
+
+
+def evaluate(names=('gbm', 'rf'), configs=None, source='cleaned', n_splits=N_SPLITS, n_repeats=N_REPEATS,
+             n_jobs=1, random_state=42, cache_dir=CACHE_DIR):
+    """{name: CVResult} of the named configs (`CONFIGS` unless `configs` is given), fitting only uncached ones."""
+    configs = {name: (configs or CONFIGS)[name] for name in names}
+    keys = {name: cache_key(config, source, n_splits, n_repeats, random_state) for name, config in configs.items()}
+    results = cached_results(names, configs, source, n_splits, n_repeats, random_state, cache_dir)
+    todo = {name: config for name, config in configs.items() if name not in results}
+    if todo:
+        X, y, totals = training_data(todo, source)
+        folds = cv_folds(y, n_splits, n_repeats, random_state)
+        fold_results = jobs.map_tasks(_evaluate_fold, folds, n_jobs,
+                                      {'X': X, 'y': y, 'totals': totals, 'configs': todo,
+                                       'random_state': random_state})
+
+        os.makedirs(cache_dir, exist_ok=True)
+        for name, config in todo.items():
+            result = CVResult(name, config, [fold[name][0] for fold in fold_results], 1 / n_splits,
+                              sum(fold[name][1] for fold in fold_results))
+            path = _cache_path(cache_dir, name, keys[name])
+            jobs.atomic_write(path, lambda tmp_path: _write_json(result.to_json(), tmp_path))
+            results[name] = result
+    return {name: results[name] for name in names}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Repeated stratified k-fold evaluation of the sii pipelines.')
+    parser.add_argument('models', nargs='*', default=None,
+                        help=f'model configs among {", ".join(sorted(CONFIGS))} (default: gbm rf)')
+    parser.add_argument('--source', default='cleaned', choices=['train_df', 'cleaned'],
+                        help='train_df keeps the missing features (hgb and ordinal only)')
+    parser.add_argument('--splits', type=int, default=N_SPLITS)
+    parser.add_argument('--repeats', type=int, default=N_REPEATS)
+    parser.add_argument('--jobs', type=int, default=1, help='worker processes (-1: all cores)')
+    args = parser.parse_args()
+    unknown = [name for name in args.models or [] if name not in CONFIGS]
+    if unknown:
+        parser.error(f'unknown model configs {unknown}; choose from {sorted(CONFIGS)}')
+
+    results = evaluate(args.models or ['gbm', 'rf'], source=args.source, n_splits=args.splits, n_repeats=args.repeats,
+                       n_jobs=args.jobs)
+    for result in results.values():
+        print(f'\n{result.label} ({len(result.confusion)} folds, {result.seconds:.0f}s of fitting)')
+        print(result.report().to_string(index=False))
+    print()
+    print(comparison(list(results.values())).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
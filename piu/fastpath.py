@@ -0,0 +1,71 @@
+"""Low-latency scoring path for single participants.
+
+`CompiledPipeline` folds the fitted StandardScaler and PCA of a `piu.model` pipeline into one affine
+map, so preprocessing a participant is a single (n, 20) @ (20, k) product plus a bias instead of a
+chain of sklearn transformers with their input validation. SMOTE only acts during fit and is skipped.
+Pipelines without a PCA step (the native-missing 'hgb' backend) only scale, with the scaler's own
+(x - mean) / scale so the features match sklearn bit for bit (histogram bin edges sit on observed
+values), and missing values stay NaN. Category values the fitted encoder does not know raise a
+ValueError like sklearn's, or encode as NaN for the 'hgb' pipeline (handle_unknown='use_encoded_value').
+RandomForest and GradientBoosting classifiers are replaced by their `piu.trees` compiled form, which
+gives the same probabilities at a fraction of sklearn's per-call cost.
+"""
+import numpy as np
+
+from piu import model
+from piu.trees import compile_classifier
+
+
+class CompiledPipeline:
+    """Affine-folded preprocessing in front of the fitted classifier of a `piu.model` pipeline."""
+
+    def __init__(self, pipeline):
+        preprocess = pipeline.named_steps['preprocess']
+        scaler = preprocess.named_transformers_['scale']
+        encoder = preprocess.named_transformers_['encode']
+        pca = pipeline.named_steps.get('pca')
+
+        # Ordinal encoding is a lookup of each value in its (sorted) category list
+        self.categories_ = [np.asarray(c, dtype='float64') for c in encoder.categories_]
+        # Unknown categories (missing values included) encode as NaN where the encoder allows it, else raise
+        self.allow_unknown_ = encoder.handle_unknown == 'use_encoded_value'
+        n_scaled = len(model.SCALED_COLUMNS)
+
+        self.mean_ = np.zeros(len(model.FEATURES))
+        self.scale_ = np.ones(len(model.FEATURES))
+        self.mean_[:n_scaled] = scaler.mean_
+        self.scale_[:n_scaled] = scaler.scale_
+        self.weights_ = self.bias_ = None
+        if pca is not None:
+            # Scaler as z = x * a + c, then PCA as (z - m) @ C.T  =>  x @ (a[:, None] * C.T) + (c - m) @ C.T
+            a = 1.0 / self.scale_
+            c = -self.mean_ / self.scale_
+            components = pca.components_.T
+            if getattr(pca, 'whiten', False):
+                components = components / np.sqrt(pca.explained_variance_)
+            self.weights_ = np.ascontiguousarray(a[:, None] * components)
+            self.bias_ = (c - pca.mean_) @ components
+        self.n_scaled_ = n_scaled
+
+        self.classifier = compile_classifier(pipeline.named_steps['classifier'])
+        self.classes_ = self.classifier.classes_
+
+    def transform(self, X):
+        """Principal components (or scaled features) of raw feature rows, columns in `model.FEATURES` order."""
+        X = np.array(X, dtype='float64', ndmin=2)
+        for j, categories in enumerate(self.categories_, start=self.n_scaled_):
+            codes = np.searchsorted(categories, X[:, j])
+            known = categories[np.minimum(codes, len(categories) - 1)] == X[:, j]
+            if not self.allow_unknown_ and not known.all():
+                raise ValueError(f'Found unknown categories {np.unique(X[~known, j]).tolist()} in column '
+                                 f'{model.FEATURES[j]!r}')
+            X[:, j] = np.where(known, codes, np.nan)
+        if self.weights_ is None:
+            return (X - self.mean_) / self.scale_
+        return X @ self.weights_ + self.bias_
+
+    def predict_proba(self, X):
+        return self.classifier.predict_proba(self.transform(X))
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
@@ -0,0 +1,195 @@
+"""Feature store: the preprocessing stages of the Modeling notebook, materialized once and shared.
+
+Stages, each computed from the previous one:
+
+- raw: the typed source table (`piu.data`);
+- imputed: id, model features and sii of every participant, with missing features filled by the
+  `piu.impute` engine (skipped for train_df_cleaned.csv, which is already imputed, and with
+  impute=False, which keeps them missing for the native-missing 'hgb' backend);
+- encoded: StandardScaler on the continuous features and OrdinalEncoder on sex / internet use
+  (`model.make_preprocessor`), with the fitted transformer;
+- pcs: the principal components explaining `model.EXPLAINED_VARIANCE` of the variance
+  (`piu.reduction`), with the fitted stage.
+
+A stage's key hashes its parameters and the key of the stage it reads, and the raw key is the
+sha256 of the csv, so editing a file (not just touching it) or changing a parameter invalidates
+exactly the stages downstream of the change. Materialized stages are stored under
+Data/cache/features/ with joblib (arrays memory-mapped on load) and kept in memory per process.
+
+    python -m piu.features --source train_df
+    python -m piu.features --source train_df --keep-missing
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from piu import data, jobs, metrics, model
+
+CACHE_DIR = os.path.join(data.DATA_DIR, 'cache', 'features')
+STAGES = ['raw', 'imputed', 'encoded', 'pcs']
+# Sources whose features were already imputed offline
+IMPUTED_SOURCES = {'cleaned'}
+
+_memory = {}
+_file_hashes = {}
+_lock = threading.Lock()
+# Stage loads of every store answered from memory or disk / computed, reported by piu.metrics
+hits = 0
+misses = 0
+
+
+def _count(store, hit):
+    global hits, misses
+    with _lock:
+        if hit:
+            store.hits += 1
+            hits += 1
+        else:
+            store.misses += 1
+            misses += 1
+
+
+def file_hash(name):
+    """sha256 of a source file, recomputed only when its fingerprint changes."""
+    key = (name, data.source_key(name))
+    with _lock:
+        if key in _file_hashes:
+            return _file_hashes[key]
+    digest = hashlib.sha256()
+    with open(data.source_path(name), 'rb') as f:
+        for block in iter(lambda: f.read(2 ** 20), b''):
+            digest.update(block)
+    with _lock:
+        _file_hashes[key] = digest.hexdigest()
+    return _file_hashes[key]
+
+
+class FeatureStore:
+    """Lazily materialized, disk-cached preprocessing stages of one source file."""
+
+    def __init__(self, source='cleaned', cache_dir=CACHE_DIR, variance=model.EXPLAINED_VARIANCE,
+                 imputer_steps=None, impute=True):
+        self.source = source
+        self.cache_dir = cache_dir
+        self.variance = variance
+        self.imputer_steps = imputer_steps
+        self.impute = impute
+        self.hits = 0
+        self.misses = 0
+
+    def params(self, stage):
+        if stage == 'raw':
+            return {'source': self.source}
+        if stage == 'imputed':
+            from piu.impute import DEFAULT_STEPS
+
+            imputed = self.source in IMPUTED_SOURCES or not self.impute
+            steps = None if imputed else self.imputer_steps or DEFAULT_STEPS
+            return {'features': model.FEATURES, 'target': model.TARGET, 'steps': steps}
+        if stage == 'encoded':
+            params = {'scaled': model.SCALED_COLUMNS, 'encoded': model.ENCODED_COLUMNS}
+            if not self.impute:
+                params['allow_missing'] = True
+            return params
+        return {'variance': self.variance}
+
+    def key(self, stage):
+        """Hash of the stage parameters and of every upstream stage."""
+        if stage == 'raw':
+            upstream = file_hash(self.source)
+        else:
+            upstream = self.key(STAGES[STAGES.index(stage) - 1])
+        text = json.dumps([stage, self.params(stage), upstream], sort_keys=True, default=str)
+        return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+    def path(self, stage):
+        return os.path.join(self.cache_dir, f'{self.source}-{stage}-{self.key(stage)}.joblib')
+
+    def get(self, stage):
+        """Value of `stage`, from memory, then disk, then computed from the upstream stages."""
+        if stage == 'raw':
+            return data.load(self.source)
+        path = self.path(stage)
+        with _lock:
+            value = _memory.get(path)
+        if value is not None:
+            _count(self, True)
+            return value
+        if os.path.exists(path):
+            _count(self, True)
+            value = joblib.load(path, mmap_mode='r')
+        else:
+            _count(self, False)
+            value = getattr(self, f'_compute_{stage}')(self.get(STAGES[STAGES.index(stage) - 1]))
+            os.makedirs(self.cache_dir, exist_ok=True)
+            jobs.atomic_write(path, lambda tmp_path: joblib.dump(value, tmp_path))
+        with _lock:
+            _memory[path] = value
+        return value
+
+    def status(self):
+        """Key of every stage and whether it is already materialized on disk."""
+        return {stage: (self.key(stage), stage == 'raw' or os.path.exists(self.path(stage)))
+                for stage in STAGES}
+
+    def _compute_imputed(self, raw):
+        steps = self.params('imputed')['steps']
+        df = raw[['id'] + model.FEATURES + [model.TARGET]]
+        if steps is not None:
+            from piu.impute import ImputationEngine
+
+            engine = ImputationEngine(steps)
+            df = engine.fit(df).transform(df)
+        features = model.feature_frame(df)
+        features.insert(0, 'id', df['id'].astype(str).to_numpy())
+        features[model.TARGET] = df[model.TARGET].to_numpy(dtype='float64', na_value=np.nan)
+        return features.reset_index(drop=True)
+
+    def _compute_encoded(self, imputed):
+        preprocessor = model.make_preprocessor(allow_missing=not self.impute)
+        X = preprocessor.fit_transform(imputed[model.FEATURES])
+        return {'ids': imputed['id'].to_numpy(), 'X': X, 'y': imputed[model.TARGET].to_numpy(),
+                'preprocessor': preprocessor}
+
+    def _compute_pcs(self, encoded):
+        from piu.reduction import StreamingPCA
+
+        pca = StreamingPCA(variance=self.variance)
+        return {'ids': encoded['ids'], 'X': pca.fit_transform(np.asarray(encoded['X'])), 'y': encoded['y'],
+                'pca': pca}
+
+    def labeled(self, stage='pcs'):
+        """(X, y) of the participants with a sii, from an array stage."""
+        value = self.get(stage)
+        y = np.asarray(value['y'])
+        labeled = ~np.isnan(y)
+        return np.asarray(value['X'])[labeled], y[labeled].astype(int)
+
+
+metrics.REGISTRY.add_collector(metrics.cache_collector('features', lambda: (hits, misses)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Materialize the feature store stages of a source.')
+    parser.add_argument('--source', default='cleaned', choices=['train', 'train_df', 'cleaned'])
+    parser.add_argument('--keep-missing', action='store_true',
+                        help='skip the imputation (up to the encoded stage, for the hgb backend)')
+    args = parser.parse_args()
+
+    store = FeatureStore(args.source, impute=not args.keep_missing)
+    # The PCA stage needs complete rows
+    for stage in STAGES[:-1] if args.keep_missing else STAGES:
+        cached = store.status()[stage][1]
+        value = store.get(stage)
+        shape = value.shape if isinstance(value, pd.DataFrame) else np.shape(value['X'])
+        print(f'{stage:<8} {store.key(stage)}  {shape}  ({"cached" if cached else "computed"})')
+
+
+if __name__ == '__main__':
+    main()
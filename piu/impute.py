@@ -0,0 +1,246 @@
+"""Reusable imputation engine for the Missingness Handling pipeline.
+
+The offline notebook imputed the whole table at once. Here every instrument group is fitted once on
+a reference cohort (by default the 3960 participants of train_df.csv), the fitted engine is persisted
+with joblib, and new participants are imputed in streamed batches against it:
+
+- Iterative Imputer (BayesianRidge) groups keep their fitted regression chain, so a batch costs one
+  pass of `transform` and nothing is refitted.
+- KNN groups query a BallTree built once over the standardized auxiliary features of the complete
+  reference donors, so a batch of m participants costs O(m log n) instead of a pairwise distance
+  matrix against every row.
+
+The groups and their auxiliary features follow the Missingness Handling section of the app.
+
+    python -m piu.impute fit models/imputer.joblib
+    python -m piu.impute apply models/imputer.joblib new_cohort.csv new_cohort_imputed.csv
+"""
+import argparse
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.experimental import enable_iterative_imputer  # noqa: F401
+from sklearn.impute import IterativeImputer
+from sklearn.linear_model import BayesianRidge
+from sklearn.neighbors import BallTree
+
+from piu import data
+
+FGC_COLUMNS = ['FGC-FGC_CU', 'FGC-FGC_GSND', 'FGC-FGC_GSD', 'FGC-FGC_PU', 'FGC-FGC_SRL', 'FGC-FGC_SRR', 'FGC-FGC_TL']
+
+# Imputation groups, applied in order so that later groups can use the columns imputed before them
+DEFAULT_STEPS = [
+    {'name': 'weight_height', 'method': 'bayes', 'min_value': 30.0,
+     'auxiliary': ['Basic_Demos-Age'], 'targets': ['Physical-Height', 'Physical-Weight']},
+    {'name': 'bmi', 'method': 'bmi',
+     'auxiliary': ['Physical-Height', 'Physical-Weight'], 'targets': ['Physical-BMI']},
+    {'name': 'waist', 'method': 'bayes',
+     'auxiliary': ['Basic_Demos-Age', 'Physical-Height', 'Physical-Weight'],
+     'targets': ['Physical-Waist_Circumference']},
+    {'name': 'bp_hr', 'method': 'bayes', 'min_value': 10.0,
+     'auxiliary': ['Physical-Weight'],
+     'targets': ['Physical-Systolic_BP', 'Physical-Diastolic_BP', 'Physical-HeartRate']},
+    {'name': 'fgc', 'method': 'knn',
+     'auxiliary': ['Basic_Demos-Age', 'Basic_Demos-Sex', 'Physical-BMI'], 'targets': FGC_COLUMNS},
+    {'name': 'internet_use', 'method': 'knn', 'categorical': True,
+     'auxiliary': ['Basic_Demos-Age', 'Basic_Demos-Sex', 'Physical-BMI'],
+     'targets': ['PreInt_EduHx-computerinternet_hoursday']},
+    {'name': 'sds', 'method': 'bayes',
+     'auxiliary': ['Physical-BMI'], 'targets': ['SDS-SDS_Total_Raw', 'SDS-SDS_Total_T']},
+    {'name': 'cgas', 'method': 'knn',
+     'auxiliary': ['Basic_Demos-Age', 'Physical-BMI', 'Physical-Weight'], 'targets': ['CGAS-CGAS_Score']},
+]
+
+
+def _values(df, columns):
+    return df[columns].to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _as_float(df, columns):
+    """Copy of `df` with `columns` as float64, so imputed values can be written back in place."""
+    df = df.copy()
+    for column in columns:
+        df[column] = df[column].to_numpy(dtype='float64', na_value=np.nan)
+    return df
+
+
+class BayesImputer:
+    """Iterative Imputer (BayesianRidge) over the auxiliary and target columns of one group."""
+
+    def __init__(self, auxiliary, targets, min_value=None, random_state=0):
+        self.auxiliary = auxiliary
+        self.targets = targets
+        self.min_value = min_value
+        self.random_state = random_state
+
+    def fit(self, df):
+        self.imputer_ = IterativeImputer(
+            estimator=BayesianRidge(),
+            min_value=-np.inf if self.min_value is None else self.min_value,
+            max_iter=10,
+            random_state=self.random_state,
+        )
+        self.imputer_.fit(_values(df, self.auxiliary + self.targets))
+        return self
+
+    def transform(self, X):
+        filled = self.imputer_.transform(X)
+        return filled[:, len(self.auxiliary):]
+
+
+class BMIImputer:
+    """Derive the missing BMI (kg/m^2) from height (in) and weight (lbs)."""
+
+    def __init__(self, auxiliary, targets):
+        self.auxiliary = auxiliary
+        self.targets = targets
+
+    def fit(self, df):
+        return self
+
+    def transform(self, X):
+        height, weight = X[:, 0], X[:, 1]
+        bmi = 703.0 * weight / height ** 2
+        return np.where(np.isnan(X[:, 2]), bmi, X[:, 2])[:, None]
+
+
+class KNNImputer:
+    """Mean (or majority vote, for categorical targets) of the k nearest complete reference donors."""
+
+    def __init__(self, auxiliary, targets, n_neighbors=5, categorical=False):
+        self.auxiliary = auxiliary
+        self.targets = targets
+        self.n_neighbors = n_neighbors
+        self.categorical = categorical
+
+    def fit(self, df):
+        aux = _values(df, self.auxiliary)
+        targets = _values(df, self.targets)
+        donors = ~np.isnan(aux).any(axis=1) & ~np.isnan(targets).any(axis=1)
+
+        self.mean_ = aux[donors].mean(axis=0)
+        self.scale_ = aux[donors].std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+        self.tree_ = BallTree((aux[donors] - self.mean_) / self.scale_)
+        self.donor_targets_ = targets[donors]
+        if self.categorical:
+            self.categories_ = np.unique(self.donor_targets_)
+        return self
+
+    def transform(self, X):
+        n_aux = len(self.auxiliary)
+        aux, targets = X[:, :n_aux], X[:, n_aux:].copy()
+        rows = np.isnan(targets).any(axis=1)
+        if not rows.any():
+            return targets
+
+        # Participants with missing auxiliary features are placed at the donor mean along that axis
+        query = np.where(np.isnan(aux[rows]), self.mean_, aux[rows])
+        k = min(self.n_neighbors, len(self.donor_targets_))
+        _, neighbors = self.tree_.query((query - self.mean_) / self.scale_, k=k)
+        neighbor_values = self.donor_targets_[neighbors]            # (rows, k, targets)
+        if self.categorical:
+            votes = (neighbor_values[..., None] == self.categories_).sum(axis=1)
+            estimate = self.categories_[votes.argmax(axis=-1)]
+        else:
+            estimate = neighbor_values.mean(axis=1)
+
+        missing = np.isnan(targets[rows])
+        targets[rows] = np.where(missing, estimate, targets[rows])
+        return targets
+
+
+IMPUTERS = {'bayes': BayesImputer, 'bmi': BMIImputer, 'knn': KNNImputer}
+
+
+class ImputationEngine:
+    """Fit the per-instrument imputers once, then impute any number of participants batch by batch."""
+
+    def __init__(self, steps=None, n_neighbors=5, batch_size=1024):
+        self.steps = DEFAULT_STEPS if steps is None else steps
+        self.n_neighbors = n_neighbors
+        self.batch_size = batch_size
+
+    @property
+    def columns(self):
+        columns = []
+        for step in self.steps:
+            columns += [c for c in step['auxiliary'] + step['targets'] if c not in columns]
+        return columns
+
+    def _make(self, step):
+        kwargs = {'auxiliary': step['auxiliary'], 'targets': step['targets']}
+        if step['method'] == 'bayes':
+            kwargs['min_value'] = step.get('min_value')
+        elif step['method'] == 'knn':
+            kwargs['n_neighbors'] = self.n_neighbors
+            kwargs['categorical'] = step.get('categorical', False)
+        return IMPUTERS[step['method']](**kwargs)
+
+    def fit(self, df):
+        """Fit every group on the reference cohort `df`, feeding each group the output of the previous ones."""
+        df = _as_float(df, self.columns)
+        self.imputers_ = []
+        for step in self.steps:
+            imputer = self._make(step).fit(df)
+            df[step['targets']] = imputer.transform(_values(df, step['auxiliary'] + step['targets']))
+            self.imputers_.append(imputer)
+        return self
+
+    def transform(self, df):
+        """Return a copy of `df` with every group imputed, processed `batch_size` rows at a time."""
+        batches = [df.iloc[start:start + self.batch_size] for start in range(0, len(df), self.batch_size)]
+        return pd.concat(list(self.transform_batches(batches or [df])))
+
+    def transform_batches(self, batches):
+        """Impute an iterable of DataFrames lazily, yielding one imputed frame per input batch."""
+        for batch in batches:
+            batch = _as_float(batch, self.columns)
+            if not len(batch):
+                # Nothing to impute; sklearn's imputers reject empty input
+                yield batch
+                continue
+            for step, imputer in zip(self.steps, self.imputers_):
+                batch[step['targets']] = imputer.transform(_values(batch, step['auxiliary'] + step['targets']))
+            yield batch
+
+    def impute_csv(self, path, out_path, chunksize=None):
+        """Stream a csv of participants through the engine without loading it whole."""
+        chunks = pd.read_csv(path, chunksize=chunksize or self.batch_size)
+        for i, batch in enumerate(self.transform_batches(chunks)):
+            batch.to_csv(out_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fit or apply the HBN imputation engine.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    fit = commands.add_parser('fit', help='fit the engine on a reference cohort and save it')
+    fit.add_argument('engine', help='output path of the fitted engine (.joblib)')
+    fit.add_argument('--source', default='train_df', choices=sorted(data.SOURCES))
+    apply = commands.add_parser('apply', help='impute a csv of new participants in batches')
+    apply.add_argument('engine', help='path of a fitted engine (.joblib)')
+    apply.add_argument('input')
+    apply.add_argument('output')
+    apply.add_argument('--chunksize', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == 'fit':
+        engine = ImputationEngine()
+        engine.fit(data.load(args.source, columns=engine.columns))
+        engine.save(args.engine)
+        print(f'Saved imputation engine to {args.engine}')
+    else:
+        ImputationEngine.load(args.engine).impute_csv(args.input, args.output, args.chunksize)
+        print(f'Imputed {args.input} -> {args.output}')
+
+
+if __name__ == '__main__':
+    main()
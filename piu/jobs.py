@@ -0,0 +1,64 @@
+"""Plumbing shared by the batch jobs: process-pool worker state and atomic file writes.
+
+The evaluation, stacking and tuning jobs fan their tasks out to a process pool. The arrays every task
+reads are handed to each worker once, by the pool initializer, and kept in the module-level `state`
+instead of being pickled with every task; with n_jobs=1 the tasks run in this process against the
+same state.
+
+Caches written while other processes (pool workers, concurrent app sessions) may read or rebuild the
+same file go through `atomic_write`, which writes a temporary file unique to the process and thread
+and moves it into place.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# State of the current worker process (or of this process when n_jobs == 1), set by init_worker
+state = {}
+
+
+def init_worker(values, setup=None):
+    """Replace the worker state by `values`, then let `setup(state)` derive the rest from it."""
+    state.clear()
+    state.update(values)
+    if setup is not None:
+        setup(state)
+
+
+def executor(n_jobs, values, setup=None):
+    """Process pool of `n_jobs` workers (-1: all cores) sharing `values`.
+
+    With n_jobs=1 there is no pool: the state is set in this process and None is returned.
+    """
+    if n_jobs == 1:
+        init_worker(values, setup)
+        return None
+    return ProcessPoolExecutor(max_workers=None if n_jobs == -1 else n_jobs, initializer=init_worker,
+                               initargs=(values, setup))
+
+
+def map_tasks(func, tasks, n_jobs, values, setup=None):
+    """[func(*task) for task in tasks], run by `n_jobs` workers sharing `values`."""
+    if not tasks:
+        return []
+    pool = executor(n_jobs, values, setup)
+    if pool is None:
+        return [func(*task) for task in tasks]
+    with pool:
+        return list(pool.map(func, *zip(*tasks)))
+
+
+def atomic_write(path, save):
+    """Call `save(tmp_path)` and move the result to `path`, so readers never see a partial file.
+
+    The temporary name is unique per process and thread, so concurrent writers of the same file never
+    share one; the last complete write wins.
+    """
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        save(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
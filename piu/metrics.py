@@ -0,0 +1,215 @@
+"""Process-wide performance metrics, exported in the Prometheus text format.
+
+The app records the wall-clock time of every page run, the bytes of every figure it sends and the
+hit/miss counts of its caches in the module-level `REGISTRY`. Timers keep their totals (Prometheus
+summaries with `_sum` / `_count`) plus a rolling window of the last `WINDOW` samples, from which the
+p50 and p95 are computed. Values owned by other objects (figure store counters, process RSS) are
+read at export time through collectors.
+
+Export is opt-in through environment variables, read once per process by `start_exporters`:
+
+- PIU_METRICS_PORT: serve the metrics on http://127.0.0.1:<port>/metrics;
+- PIU_METRICS_FILE: rewrite this file every PIU_METRICS_INTERVAL seconds (default 15), e.g. for the
+  node_exporter textfile collector.
+"""
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from piu import jobs
+
+WINDOW = 500
+QUANTILES = (0.5, 0.95)
+STATM_PATH = '/proc/self/statm'
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def process_rss():
+    """Resident set size of this process in bytes (peak RSS where /proc is unavailable)."""
+    if os.path.exists(STATM_PATH):
+        with open(STATM_PATH) as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def quantile(values, q):
+    """Linearly interpolated quantile of a non-empty sequence (numpy's default method)."""
+    values = sorted(values)
+    position = q * (len(values) - 1)
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+class Registry:
+    """Thread-safe counters, timers and collectors of one process."""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.descriptions = {}
+        self._counters = defaultdict(float)
+        self._timers = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def describe(self, name, text):
+        self.descriptions[name] = text
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self._counters[(name, _labels(labels))] += value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            timer = self._timers.get(key)
+            if timer is None:
+                timer = self._timers[key] = {'sum': 0.0, 'count': 0, 'window': deque(maxlen=self.window)}
+            timer['sum'] += seconds
+            timer['count'] += 1
+            timer['window'].append(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def add_collector(self, collector, key=None):
+        """Register a callable returning (name, type, labels dict, value) samples at export time.
+
+        A collector registered again under the same `key` replaces the previous one.
+        """
+        with self._lock:
+            if key is not None:
+                self._collectors = [(k, c) for k, c in self._collectors if k != key]
+            self._collectors.append((key, collector))
+
+    def summaries(self, name):
+        """Rolling count, p50, p95 and totals of every label set of timer `name`."""
+        with self._lock:
+            timers = [(dict(labels), timer['sum'], timer['count'], list(timer['window']))
+                      for (timer_name, labels), timer in self._timers.items() if timer_name == name]
+        rows = []
+        for labels, total, count, window in timers:
+            p50, p95 = (quantile(window, q) for q in QUANTILES)
+            rows.append({**labels, 'runs': count, 'p50_ms': 1000 * p50, 'p95_ms': 1000 * p95,
+                         'total_s': total})
+        return rows
+
+    def samples(self):
+        """Every (name, type, labels, value) sample: counters, collector values and timer summaries."""
+        with self._lock:
+            samples = [(name, 'counter', labels, value) for (name, labels), value in self._counters.items()]
+            timers = [(name, labels, timer['sum'], timer['count'], list(timer['window']))
+                      for (name, labels), timer in self._timers.items()]
+            collectors = [collector for _, collector in self._collectors]
+        for collector in collectors:
+            samples += [(name, kind, _labels(labels), value) for name, kind, labels, value in collector()]
+        for name, labels, total, count, window in timers:
+            for q in QUANTILES:
+                samples.append((name, 'summary', labels + (('quantile', str(q)),), quantile(window, q)))
+            samples.append((name + '_sum', 'summary', labels, total))
+            samples.append((name + '_count', 'summary', labels, count))
+        return samples
+
+    def render(self):
+        """The Prometheus text exposition of all samples."""
+        lines = []
+        seen = set()
+        for name, kind, labels, value in sorted(self.samples(), key=lambda s: s[0]):
+            family = name[:-len('_sum')] if name.endswith('_sum') and kind == 'summary' else name
+            family = family[:-len('_count')] if family.endswith('_count') and kind == 'summary' else family
+            if family not in seen:
+                seen.add(family)
+                if family in self.descriptions:
+                    lines.append(f'# HELP {family} {self.descriptions[family]}')
+                lines.append(f'# TYPE {family} {kind}')
+            lines.append(f'{name}{_format_labels(labels)} {float(value)!r}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+REGISTRY.describe('piu_page_seconds', 'Wall-clock time of one run of an app page.')
+REGISTRY.describe('piu_image_bytes_total', 'Bytes of figures sent to the browser.')
+REGISTRY.describe('piu_cache_requests_total', 'Cache lookups by cache and result (hit or miss).')
+REGISTRY.describe('piu_process_resident_memory_bytes', 'Resident set size of the app process.')
+REGISTRY.add_collector(lambda: [('piu_process_resident_memory_bytes', 'gauge', {}, process_rss())])
+
+
+def cache_collector(name, counts):
+    """Collector reporting the (hits, misses) returned by `counts()` for the cache `name`."""
+    def collect():
+        hits, misses = counts()
+        return [('piu_cache_requests_total', 'counter', {'cache': name, 'result': 'hit'}, hits),
+                ('piu_cache_requests_total', 'counter', {'cache': name, 'result': 'miss'}, misses)]
+    return collect
+
+
+def serve(port, registry=REGISTRY, host='127.0.0.1'):
+    """Serve `registry` on http://host:port/metrics from a daemon thread; returns the server."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _write_text(text, path):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def write_textfile(path, registry=REGISTRY):
+    text = registry.render()
+    jobs.atomic_write(path, lambda tmp_path: _write_text(text, tmp_path))
+
+
+def start_exporters(registry=REGISTRY):
+    """Start the endpoint and / or file exporter configured by the PIU_METRICS_* variables."""
+    exporters = {}
+    port = os.environ.get('PIU_METRICS_PORT')
+    if port:
+        exporters['server'] = serve(int(port), registry)
+    path = os.environ.get('PIU_METRICS_FILE')
+    if path:
+        interval = float(os.environ.get('PIU_METRICS_INTERVAL', 15))
+
+        def export():
+            while True:
+                write_textfile(path, registry)
+                time.sleep(interval)
+
+        exporters['file'] = threading.Thread(target=export, daemon=True)
+        exporters['file'].start()
+    return exporters
@@ -0,0 +1,171 @@
+"""Missingness profiler backed by a packed bitmap index.
+
+`MissingnessIndex` stores one bit per (row, column) cell that is missing, packed eight rows to a
+byte column by column, with the columns grouped by their HBN instrument (data_dictionary.csv). Two
+extra bitmaps per instrument mark the participants with every / any column of that instrument
+missing. Queries such as "PCIAT present but Physical Measures missing" are then a few bitwise ANDs
+over ~500-byte vectors and a popcount, and co-missingness, pattern frequencies and completeness are
+computed for all columns or instruments at once.
+
+    python -m piu.missingness train --present "Parent-Child Internet Addiction Test" \\
+        --missing "Physical Measures"
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from piu import columnar, data
+
+# Number of set bits of every byte value
+POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+OTHER_INSTRUMENT = 'Other'
+
+
+def popcount(bits, axis=0):
+    """Number of set bits of packed bitmaps along `axis`."""
+    return POPCOUNT[bits].sum(axis=axis, dtype=np.int64)
+
+
+class MissingnessIndex:
+    """Packed missingness bitmaps of a DataFrame, per column and per instrument."""
+
+    def __init__(self, df, instruments=None):
+        columns = [c for c in df.columns if c not in data.ID_COLUMNS]
+        if instruments is None:
+            instruments = columnar.column_instruments(columns)
+        instruments = {c: instruments.get(c) or OTHER_INSTRUMENT for c in columns}
+        # Group the columns by instrument, instruments in order of first appearance
+        self.instruments = list(dict.fromkeys(instruments.values()))
+        self.columns = sorted(columns, key=lambda c: self.instruments.index(instruments[c]))
+        self.column_instrument = {c: instruments[c] for c in self.columns}
+        self.ids = df['id'].to_numpy() if 'id' in df.columns else np.arange(len(df))
+        self.n_rows = len(df)
+
+        # (bytes, columns): column j is a bit vector over the rows
+        self.bits = np.packbits(df[self.columns].isna().to_numpy(), axis=0)
+        self.instrument_all = np.empty((len(self.bits), len(self.instruments)), dtype=np.uint8)
+        self.instrument_any = np.empty_like(self.instrument_all)
+        for i, instrument in enumerate(self.instruments):
+            block = self.bits[:, self.instrument_slice(instrument)]
+            self.instrument_all[:, i] = np.bitwise_and.reduce(block, axis=1)
+            self.instrument_any[:, i] = np.bitwise_or.reduce(block, axis=1)
+        # Masks the padding bits of the last byte, which the complements in query() would set
+        self._valid = np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    @classmethod
+    def from_source(cls, name, instruments=None):
+        """Index of source `name`, reading only the columns of `instruments` if given."""
+        if instruments is None:
+            return cls(data.load(name))
+        return cls(data.load_instruments(name, instruments))
+
+    def instrument_slice(self, instrument):
+        positions = [j for j, c in enumerate(self.columns) if self.column_instrument[c] == instrument]
+        return slice(positions[0], positions[-1] + 1)
+
+    def missing_bits(self, name, how='all'):
+        """Bitmap of the rows where column `name` is missing, or instrument `name` (all/any columns)."""
+        if name in self.column_instrument:
+            return self.bits[:, self.columns.index(name)]
+        i = self.instruments.index(name)
+        return (self.instrument_all if how == 'all' else self.instrument_any)[:, i]
+
+    def query(self, present=(), missing=(), how='all'):
+        """Bitmap of the rows where every `present` column/instrument is observed and every `missing` one is not.
+
+        An instrument counts as missing when all its columns are missing (how='all') or any of them
+        is (how='any'); present is the complement.
+        """
+        bits = self._valid.copy()
+        for name in missing:
+            bits &= self.missing_bits(name, how)
+        for name in present:
+            bits &= ~self.missing_bits(name, how)
+        return bits
+
+    def count(self, present=(), missing=(), how='all'):
+        return int(popcount(self.query(present, missing, how)))
+
+    def rows(self, bits):
+        """Row positions set in a bitmap."""
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+
+    def matching_ids(self, present=(), missing=(), how='all'):
+        return self.ids[self.rows(self.query(present, missing, how))]
+
+    def missing_counts(self, level='column'):
+        bits, names = self._level(level)
+        return pd.Series(popcount(bits), index=names, name='missing')
+
+    def co_missingness(self, level='instrument', normalize=True):
+        """Rows missing both of every pair of columns (or instruments), as a square DataFrame."""
+        bits, names = self._level(level)
+        counts = np.empty((len(names), len(names)), dtype=np.int64)
+        for j in range(len(names)):
+            counts[:, j] = popcount(bits & bits[:, [j]])
+        table = pd.DataFrame(counts, index=names, columns=names)
+        return table / self.n_rows if normalize else table
+
+    def pattern_frequencies(self, level='instrument', top=None):
+        """Distinct missingness patterns (True = missing) with their row counts, most frequent first."""
+        bits, names = self._level(level)
+        patterns = np.unpackbits(bits, axis=0, count=self.n_rows).astype(bool)
+        unique, counts = np.unique(np.packbits(patterns, axis=1), axis=0, return_counts=True)
+        order = np.argsort(-counts, kind='stable')[:top]
+        table = pd.DataFrame(np.unpackbits(unique[order], axis=1, count=len(names)).astype(bool),
+                             columns=names)
+        table['count'] = counts[order]
+        table['percent'] = 100 * table['count'] / self.n_rows
+        return table
+
+    def completeness(self):
+        """Per instrument: share of observed cells, of fully observed and of fully missing participants."""
+        missing_cells = popcount(self.bits)
+        rows = []
+        for i, instrument in enumerate(self.instruments):
+            columns = self.instrument_slice(instrument)
+            n_columns = columns.stop - columns.start
+            rows.append({
+                'Instrument': instrument,
+                'Columns': n_columns,
+                'Observed cells (%)': 100 * (1 - missing_cells[columns].sum() / (n_columns * self.n_rows)),
+                'Complete participants (%)': 100 * (1 - popcount(self.instrument_any[:, i]) / self.n_rows),
+                'Missing participants (%)': 100 * popcount(self.instrument_all[:, i]) / self.n_rows,
+            })
+        return pd.DataFrame(rows).round(2)
+
+    def _level(self, level):
+        if level == 'column':
+            return self.bits, self.columns
+        return self.instrument_all, self.instruments
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the missingness of a source file.')
+    parser.add_argument('source', nargs='?', default='train', choices=['train', 'train_df', 'cleaned'])
+    parser.add_argument('--present', nargs='*', default=[], help='columns or instruments that must be observed')
+    parser.add_argument('--missing', nargs='*', default=[], help='columns or instruments that must be missing')
+    parser.add_argument('--any', action='store_true', help='an instrument is missing if any column is')
+    args = parser.parse_args()
+
+    instruments = None
+    if args.present or args.missing:
+        # A query only needs the instruments it names (or the instruments of the columns it names)
+        names = args.present + args.missing
+        columns = set(data.column_names(args.source))
+        column_instruments = columnar.column_instruments([n for n in names if n in columns])
+        instruments = {column_instruments.get(n, n) for n in names}
+        if OTHER_INSTRUMENT in instruments:
+            instruments.add(None)
+    index = MissingnessIndex.from_source(args.source, instruments)
+    how = 'any' if args.any else 'all'
+    if args.present or args.missing:
+        print(f'{index.count(args.present, args.missing, how)} of {index.n_rows} participants')
+    else:
+        print(index.completeness().to_string(index=False))
+        print(index.pattern_frequencies(top=10).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""sii classification pipeline and its versioned artifacts.
+
+The pipeline reproduces Notebooks/Modeling.ipynb end to end: StandardScaler on the continuous
+features and OrdinalEncoder on sex / internet use, a PCA keeping 95% of the variance (the notebook's
+12 components, see `piu.reduction`), SMOTE with the tuned
+parameters (memoized through `piu.resample`) and the tuned GradientBoosting or RandomForest
+classifier.
+
+The 'hgb' backend is a histogram-binned HistGradientBoosting with the GBM's tuned size. It splits on
+the scaled / encoded features directly and sends missing values down a learned branch, so it can be
+trained on train_df.csv without the imputation of the Missingness Handling section; PCA and SMOTE
+need complete rows, so it skips them and balances the classes with sample weights instead. A fitted
+pipeline is stored in
+models/ as a joblib file named after the sha256 of its content, next to a json file with its
+metadata, and is loaded at most once per process.
+
+    python -m piu.model train --model gbm
+    python -m piu.model train --model hgb --source train_df
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+from functools import lru_cache
+
+import joblib
+import numpy as np
+import pandas as pd
+from imblearn.pipeline import Pipeline
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.preprocessing import OrdinalEncoder, StandardScaler
+
+from piu import data
+from piu.reduction import StreamingPCA
+from piu.resample import CachedSMOTE
+
+MODELS_DIR = os.path.join(os.path.dirname(data.DATA_DIR), 'models')
+
+# Features, in the column order of the notebook's final_df
+SCALED_COLUMNS = [
+    'Basic_Demos-Age', 'CGAS-CGAS_Score', 'Physical-BMI', 'Physical-Height', 'Physical-Weight',
+    'Physical-Waist_Circumference', 'Physical-Diastolic_BP', 'Physical-Systolic_BP', 'Physical-HeartRate',
+    'FGC-FGC_CU', 'FGC-FGC_GSND', 'FGC-FGC_GSD', 'FGC-FGC_PU', 'FGC-FGC_SRL', 'FGC-FGC_SRR', 'FGC-FGC_TL',
+    'SDS-SDS_Total_Raw', 'SDS-SDS_Total_T',
+]
+ENCODED_COLUMNS = {
+    'Basic_Demos-Sex': [0.0, 1.0],
+    'PreInt_EduHx-computerinternet_hoursday': [0.0, 1.0, 2.0, 3.0],
+}
+FEATURES = SCALED_COLUMNS + list(ENCODED_COLUMNS)
+# Positions of the ordinal-encoded features in the preprocessed matrix
+CATEGORICAL_POSITIONS = list(range(len(SCALED_COLUMNS), len(FEATURES)))
+TARGET = 'sii'
+CLASSES = [0, 1, 2, 3]
+# Share of the variance the PCs must explain (12 PCs on train_df_cleaned.csv)
+EXPLAINED_VARIANCE = 0.95
+
+# Best parameters found by the grid searches of the Modeling section
+SMOTE_PARAMS = {'sampling_strategy': 'minority', 'k_neighbors': 5}
+BEST_PARAMS = {
+    'gbm': {'n_estimators': 100, 'learning_rate': 0.1, 'max_depth': 7},
+    'rf': {'n_estimators': 300, 'max_depth': 10, 'class_weight': 'balanced_subsample', 'max_features': 'sqrt',
+           'min_samples_leaf': 1, 'min_samples_split': 10},
+    'hgb': {'max_iter': 100, 'learning_rate': 0.1, 'max_depth': 7, 'class_weight': 'balanced',
+            'early_stopping': False},
+}
+CLASSIFIERS = {'gbm': GradientBoostingClassifier, 'rf': RandomForestClassifier,
+               'hgb': HistGradientBoostingClassifier}
+# Classifiers trained on the preprocessed features as they are, missing values included
+NATIVE_MISSING = {'hgb'}
+
+
+def make_classifier(name, random_state=42, **params):
+    return CLASSIFIERS[name](random_state=random_state, **{**BEST_PARAMS[name], **params})
+
+
+def make_preprocessor(allow_missing=False):
+    """Scaler and ordinal encoder; with allow_missing, missing or unknown categories encode as NaN."""
+    if allow_missing:
+        encoder = OrdinalEncoder(categories=list(ENCODED_COLUMNS.values()), handle_unknown='use_encoded_value',
+                                 unknown_value=np.nan)
+    else:
+        encoder = OrdinalEncoder(categories=list(ENCODED_COLUMNS.values()))
+    return ColumnTransformer([
+        ('scale', StandardScaler(), SCALED_COLUMNS),
+        ('encode', encoder, list(ENCODED_COLUMNS)),
+    ])
+
+
+def build_pipeline(name='gbm', random_state=42, **params):
+    if name in NATIVE_MISSING:
+        return Pipeline(steps=[
+            ('preprocess', make_preprocessor(allow_missing=True)),
+            ('classifier', make_classifier(name, random_state=random_state,
+                                           categorical_features=CATEGORICAL_POSITIONS, **params)),
+        ])
+    return Pipeline(steps=[
+        ('preprocess', make_preprocessor()),
+        ('pca', StreamingPCA(variance=EXPLAINED_VARIANCE)),
+        ('smote', CachedSMOTE(random_state=random_state, **SMOTE_PARAMS)),
+        ('classifier', make_classifier(name, random_state=random_state, **params)),
+    ])
+
+
+def feature_frame(df):
+    """The model features of `df` as a float64 frame (nullable integers become NaN-aware floats)."""
+    missing = [c for c in FEATURES if c not in df.columns]
+    if missing:
+        raise KeyError(f'Missing feature columns: {missing}')
+    return pd.DataFrame(df[FEATURES].to_numpy(dtype='float64', na_value=np.nan), columns=FEATURES, index=df.index)
+
+
+def training_data(source='cleaned'):
+    df = data.load(source, columns=['id'] + FEATURES + [TARGET])
+    df = df[df[TARGET].notna()]
+    return feature_frame(df), df[TARGET].to_numpy(dtype=int)
+
+
+def fit_pipeline(name='gbm', source='cleaned', **params):
+    X, y = training_data(source)
+    return build_pipeline(name, **params).fit(X, y)
+
+
+# Artifacts
+def _artifact_paths(name, version):
+    stem = os.path.join(MODELS_DIR, f'sii_{name}-{version}')
+    return stem + '.joblib', stem + '.json'
+
+
+def save_artifact(pipeline, name, source='cleaned'):
+    """Serialize a fitted pipeline under its content hash and mark it as the latest `name` model."""
+    buffer = io.BytesIO()
+    joblib.dump(pipeline, buffer)
+    payload = buffer.getvalue()
+    version = hashlib.sha256(payload).hexdigest()[:12]
+
+    metadata = {
+        'model': name,
+        'version': version,
+        'features': FEATURES,
+        'classes': CLASSES,
+        'source': data.SOURCES[source],
+        'source_key': list(data.source_key(source)),
+        'trained_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    model_path, metadata_path = _artifact_paths(name, version)
+    with open(model_path, 'wb') as f:
+        f.write(payload)
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    with open(os.path.join(MODELS_DIR, f'sii_{name}.latest'), 'w') as f:
+        f.write(version)
+    return version
+
+
+def latest_version(name):
+    path = os.path.join(MODELS_DIR, f'sii_{name}.latest')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip()
+
+
+def load_artifact(name='gbm', version=None):
+    """Return (pipeline, metadata) of a stored model; the latest version unless `version` is given."""
+    version = version or latest_version(name)
+    if version is None:
+        raise FileNotFoundError(f'No trained {name!r} model in {MODELS_DIR}; run `python -m piu.model train`')
+    return _load_version(name, version)
+
+
+# Every version is deserialized at most once per process
+@lru_cache(maxsize=None)
+def _load_version(name, version):
+    model_path, metadata_path = _artifact_paths(name, version)
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+    return joblib.load(model_path), metadata
+
+
+def load_or_train(name='gbm'):
+    """Load the latest `name` model, training and saving one first if none exists yet."""
+    if latest_version(name) is None:
+        save_artifact(fit_pipeline(name), name)
+    return load_artifact(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train and store the sii classification pipeline.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    train = commands.add_parser('train', help='fit the pipeline and save it')
+    train.add_argument('--model', default='gbm', choices=sorted(CLASSIFIERS))
+    train.add_argument('--source', default='cleaned', choices=['train_df', 'cleaned'],
+                       help='train_df keeps the missing features (hgb only)')
+    args = parser.parse_args()
+    if args.model not in NATIVE_MISSING and training_data(args.source)[0].isna().any(axis=None):
+        train.error(f'{args.model} needs imputed features; {args.source!r} has missing values (use --source cleaned)')
+
+    version = save_artifact(fit_pipeline(args.model, args.source), args.model, args.source)
+    print(f'Saved {args.model} model version {version} to {MODELS_DIR}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Ordinal sii model: regression on PCIAT_Total (or sii) with cut points tuned for QWK.
+
+sii is an ordered bucketing of PCIAT_Total (0-30, 31-49, 50-79, 80-100), so instead of four
+unrelated classes `OrdinalClassifier` regresses the total (or sii itself) and turns the regression
+output into sii with three cut points. The cut points start at the sii boundaries and are then
+chosen to maximize the quadratic weighted kappa (QWK) of out-of-fold predictions on the training
+data.
+
+`optimize_cuts` is a coordinate descent over the sorted predictions: with the cumulative true-class
+counts of the sorted rows precomputed, the confusion matrix of every candidate position of one cut
+(between the two neighbouring cuts) is a difference of two count rows, and the QWK of all
+candidates is computed at once. A full search takes a few milliseconds, so it runs inside every CV
+fold (`piu.evaluation` config 'ordinal').
+"""
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.model_selection import StratifiedKFold
+
+from piu import data, model, pciat
+from piu.evaluation import quadratic_weighted_kappa
+
+TARGETS = {'total': pciat.TOTAL_COLUMN, 'sii': model.TARGET}
+# sii boundaries on the scale of each target
+INITIAL_CUTS = {'total': [t - 0.5 for t in pciat.SII_THRESHOLDS], 'sii': [0.5, 1.5, 2.5]}
+# The tuned size of the hgb classifier; the regressor splits on the scaled / encoded features
+REGRESSOR_PARAMS = {k: v for k, v in model.BEST_PARAMS['hgb'].items() if k != 'class_weight'}
+
+
+def apply_cuts(predictions, cuts):
+    """sii of each regression output: the number of cut points at or below it."""
+    return np.digitize(predictions, cuts)
+
+
+def optimize_cuts(predictions, y, cuts, n_classes=len(model.CLASSES), max_iter=20):
+    """(cut points, QWK) maximizing the QWK of `apply_cuts(predictions, cuts)` against `y`."""
+    order = np.argsort(predictions, kind='stable')
+    sorted_predictions = np.asarray(predictions, dtype='float64')[order]
+    n = len(sorted_predictions)
+    # counts[i, c]: rows of true class c among the i lowest predictions
+    counts = np.zeros((n + 1, n_classes), dtype=np.int64)
+    np.cumsum(np.eye(n_classes, dtype=np.int64)[np.asarray(y)[order]], axis=0, out=counts[1:])
+    # A cut at position i puts the i lowest predictions below it; only positions between distinct
+    # predictions can be realized by a cut value
+    valid = np.ones(n + 1, dtype=bool)
+    valid[1:n] = sorted_predictions[1:] > sorted_predictions[:-1]
+    positions = np.searchsorted(sorted_predictions, cuts).astype(np.int64)
+
+    def kappa(candidates, k):
+        bounds = np.tile(np.r_[0, positions, n], (len(candidates), 1))
+        bounds[:, k + 1] = candidates
+        # Predicted class j holds the rows between bounds j and j + 1
+        confusion = (counts[bounds[:, 1:]] - counts[bounds[:, :-1]]).transpose(0, 2, 1)
+        return quadratic_weighted_kappa(confusion)
+
+    best = kappa(positions[None, 0], 0)[0]
+    for _ in range(max_iter):
+        improved = False
+        for k in range(n_classes - 1):
+            low = positions[k - 1] if k > 0 else 0
+            high = positions[k + 1] if k < n_classes - 2 else n
+            candidates = np.flatnonzero(valid[low:high + 1]) + low
+            scores = kappa(candidates, k)
+            i = int(np.argmax(scores))
+            if scores[i] > best + 1e-12:
+                best, positions[k], improved = scores[i], candidates[i], True
+        if not improved:
+            break
+
+    # Cut values halfway between the predictions on either side of each position
+    padded = np.r_[-np.inf, sorted_predictions, np.inf]
+    below, above = padded[positions], padded[positions + 1]
+    values = np.where(np.isinf(below), above - 0.5, np.where(np.isinf(above), below + 0.5, (below + above) / 2))
+    return values, float(best)
+
+
+class OrdinalClassifier(ClassifierMixin, BaseEstimator):
+    """Regressor on PCIAT_Total (target='total') or sii, with QWK-optimized cut points to sii."""
+
+    def __init__(self, regressor=None, target='total', threshold_folds=5, random_state=42):
+        self.regressor = regressor
+        self.target = target
+        self.threshold_folds = threshold_folds
+        self.random_state = random_state
+
+    def _make_regressor(self):
+        if self.regressor is not None:
+            return clone(self.regressor)
+        return HistGradientBoostingRegressor(random_state=self.random_state,
+                                             categorical_features=model.CATEGORICAL_POSITIONS, **REGRESSOR_PARAMS)
+
+    def fit(self, X, y, totals=None):
+        """Fit on features X and sii y; target='total' also needs the PCIAT totals of the rows."""
+        X = np.asarray(X, dtype='float64')
+        y = np.asarray(y, dtype=int)
+        if self.target == 'total':
+            if totals is None:
+                raise ValueError("target='total' needs the PCIAT_Total of every training row")
+            values = np.asarray(totals, dtype='float64')
+        else:
+            values = y.astype('float64')
+
+        # Cut points are tuned on out-of-fold predictions, so they are not fitted to training noise
+        if self.threshold_folds:
+            predictions = np.empty(len(y))
+            folds = StratifiedKFold(self.threshold_folds, shuffle=True, random_state=self.random_state)
+            for train_idx, val_idx in folds.split(X, y):
+                predictions[val_idx] = self._make_regressor().fit(X[train_idx], values[train_idx]).predict(X[val_idx])
+        self.regressor_ = self._make_regressor().fit(X, values)
+        if not self.threshold_folds:
+            predictions = self.regressor_.predict(X)
+        self.cuts_, self.oof_kappa_ = optimize_cuts(predictions, y, INITIAL_CUTS[self.target])
+        self.classes_ = np.array(model.CLASSES)
+        return self
+
+    def predict_value(self, X):
+        return self.regressor_.predict(np.asarray(X, dtype='float64'))
+
+    def predict(self, X):
+        return self.classes_[apply_cuts(self.predict_value(X), self.cuts_)]
+
+
+def training_totals(source='cleaned'):
+    """PCIAT_Total of the rows of `model.training_data(source)`, in the same order."""
+    df = data.load(source, columns=[model.TARGET, pciat.TOTAL_COLUMN])
+    return df.loc[df[model.TARGET].notna(), pciat.TOTAL_COLUMN].to_numpy(dtype='float64', na_value=np.nan)
@@ -0,0 +1,64 @@
+"""Batch scoring of participants with a stored sii model.
+
+Reads a csv of participants in chunks, optionally imputes missing features with a fitted
+`piu.impute.ImputationEngine`, and scores each chunk with one vectorized `predict_proba` call. When
+the csv has the PCIAT item scores, the observed sii (items imputed as in `piu.pciat`) is written next
+to the prediction.
+
+    python -m piu.predict participants.csv -o scores.csv --model gbm
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from piu import model, pciat
+
+
+def score(pipeline, df):
+    """Class probabilities and predicted sii for every row of `df` in a single vectorized call."""
+    proba = pipeline.predict_proba(model.feature_frame(df))
+    classes = pipeline.classes_
+    out = pd.DataFrame(proba, columns=[f'proba_{c}' for c in classes], index=df.index)
+    out.insert(0, 'sii_pred', classes[np.argmax(proba, axis=1)])
+    if set(pciat.ITEM_COLUMNS) <= set(df.columns):
+        _, _, sii = pciat.score_items(df[pciat.ITEM_COLUMNS].to_numpy(dtype='float64', na_value=np.nan))
+        out.insert(0, 'sii_observed', sii)
+    if 'id' in df.columns:
+        out.insert(0, 'id', df['id'])
+    return out
+
+
+def score_csv(path, out_path, name='gbm', version=None, imputer=None, chunksize=10000):
+    """Score a csv chunk by chunk and write the predictions; returns the number of rows scored."""
+    pipeline, _ = model.load_artifact(name, version)
+    engine = None
+    if imputer is not None:
+        from piu.impute import ImputationEngine
+        engine = ImputationEngine.load(imputer)
+
+    n_rows = 0
+    for i, chunk in enumerate(pd.read_csv(path, chunksize=chunksize)):
+        if engine is not None:
+            chunk = next(engine.transform_batches([chunk]))
+        score(pipeline, chunk).to_csv(out_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        n_rows += len(chunk)
+    return n_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score a csv of participants with a stored sii model.')
+    parser.add_argument('input', help='csv with an id column and the model features')
+    parser.add_argument('-o', '--output', required=True, help='output csv of predictions')
+    parser.add_argument('--model', default='gbm', choices=sorted(model.CLASSIFIERS))
+    parser.add_argument('--version', default=None, help='model version (default: latest)')
+    parser.add_argument('--imputer', default=None, help='fitted imputation engine for missing features')
+    parser.add_argument('--chunksize', type=int, default=10000)
+    args = parser.parse_args()
+
+    n_rows = score_csv(args.input, args.output, args.model, args.version, args.imputer, args.chunksize)
+    print(f'Scored {n_rows} participants -> {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""Memoized SMOTE resampling shared by every search, evaluation and training run.
+
+SMOTE is deterministic for fixed parameters, a fixed random_state and a fixed training fold, yet the
+Modeling grids re-ran it for every classifier candidate of every fold. `ResampleCache` keys each
+resampling on (data hash, fold indices, SMOTE parameters), stores the resampled arrays once as .npy
+files under Data/cache/smote/ and hands them out memory-mapped, so all candidates, worker processes
+and later runs reuse the same nearest-neighbor work.
+
+`CachedSMOTE` is a drop-in SMOTE for imblearn pipelines: it hashes the training fold it receives,
+so GridSearchCV / cross-validation candidates with the same SMOTE parameters share one resampling.
+
+Both levels are bounded: the in-process level keeps the `max_entries` most recently used pairs of
+memory maps (each holds two open files), and after every write the directory is pruned to
+`max_bytes`, deleting the least recently used resamplings first (a disk hit refreshes the file
+times). The directory can also be pruned or inspected by hand:
+
+    python -m piu.resample info
+    python -m piu.resample prune --max-mb 100
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from imblearn.over_sampling import SMOTE
+
+from piu import data, jobs, metrics
+
+CACHE_DIR = os.path.join(data.DATA_DIR, 'cache', 'smote')
+MAX_ENTRIES = 128
+MAX_BYTES = 512 * 2 ** 20
+
+
+def array_hash(*arrays):
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.dtype, array.shape)).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _save_array(array, path):
+    with open(path, 'wb') as f:
+        np.save(f, np.asarray(array))
+
+
+class ResampleCache:
+    """Two-level (in-process, then memory-mapped on disk) cache of SMOTE-resampled training folds."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, data_key, indices, params):
+        indices_key = 'all' if indices is None else array_hash(np.asarray(indices, dtype=np.int64))
+        text = json.dumps([data_key, indices_key, params], sort_keys=True, default=str)
+        return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+    def resample(self, X, y, params, indices=None, data_key=None):
+        """SMOTE(**params) applied to X[indices], y[indices] (the whole arrays if indices is None).
+
+        `data_key` identifies X and y; pass it when resampling many folds of the same data to avoid
+        rehashing the arrays for every fold.
+        """
+        if params.get('random_state') is None:
+            # Not reproducible, so not cacheable
+            return self._smote(X, y, params, indices)
+
+        key = self.key(data_key or array_hash(X, y), indices, params)
+        with self._lock:
+            if key in self._memory:
+                self.hits += 1
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        X_path, y_path = (os.path.join(self.cache_dir, f'{key}_{name}.npy') for name in ('X', 'y'))
+        if os.path.exists(X_path) and os.path.exists(y_path):
+            self.hits += 1
+            for path in (X_path, y_path):
+                os.utime(path)
+        else:
+            self.misses += 1
+            X_res, y_res = self._smote(X, y, params, indices)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for path, array in ((X_path, X_res), (y_path, y_res)):
+                # Atomic write, so concurrent workers never read a half-written file
+                jobs.atomic_write(path, lambda tmp_path: _save_array(array, tmp_path))
+            self.prune(self.max_bytes, keep=key)
+
+        result = np.load(X_path, mmap_mode='r'), np.load(y_path, mmap_mode='r')
+        with self._lock:
+            self._memory[key] = result
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return result
+
+    def entries(self):
+        """[(key, bytes, last use)] of the resamplings on disk, least recently used first."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = {}
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.npy'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            key = name.rsplit('_', 1)[0]
+            size, used = entries.get(key, (0, 0.0))
+            entries[key] = (size + stat.st_size, max(used, stat.st_mtime))
+        return sorted(((key, size, used) for key, (size, used) in entries.items()), key=lambda e: e[2])
+
+    def prune(self, max_bytes, keep=None):
+        """Delete the least recently used resamplings until the directory holds at most `max_bytes`.
+
+        Memory maps already handed out stay valid (the data lives until they are closed); `keep` is
+        never deleted. Returns the number of resamplings removed.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for key, size, _ in entries:
+            if total <= max_bytes:
+                break
+            if key == keep:
+                continue
+            for name in ('X', 'y'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, f'{key}_{name}.npy'))
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                self._memory.pop(key, None)
+            total -= size
+            removed += 1
+        return removed
+
+    def resample_folds(self, X, y, folds, params):
+        """Resample every (train_idx, val_idx) fold; returns [(X_res, y_res, val_idx), ...]."""
+        data_key = array_hash(X, y)
+        return [(*self.resample(X, y, params, train_idx, data_key), val_idx) for train_idx, val_idx in folds]
+
+    @staticmethod
+    def _smote(X, y, params, indices):
+        if indices is not None:
+            X, y = X[indices], y[indices]
+        return SMOTE(**params).fit_resample(X, y)
+
+
+_default_cache = ResampleCache()
+metrics.REGISTRY.add_collector(metrics.cache_collector('smote', lambda: (_default_cache.hits, _default_cache.misses)))
+
+
+def default_cache():
+    return _default_cache
+
+
+class CachedSMOTE(SMOTE):
+    """SMOTE whose fit_resample goes through the process-wide `ResampleCache`."""
+
+    def fit_resample(self, X, y, **params):
+        X = np.asarray(X, dtype='float64')
+        y = np.asarray(y)
+        settings = {'sampling_strategy': self.sampling_strategy, 'k_neighbors': self.k_neighbors,
+                    'random_state': self.random_state}
+        if not isinstance(settings['random_state'], (int, np.integer, type(None))):
+            return super().fit_resample(X, y, **params)
+        X_res, y_res = default_cache().resample(X, y, settings)
+        return np.asarray(X_res), np.asarray(y_res)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or prune the SMOTE resampling cache.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('info', help='size and number of cached resamplings')
+    prune = commands.add_parser('prune', help='delete the least recently used resamplings')
+    prune.add_argument('--max-mb', type=float, default=0, help='size to prune down to (default: clear all)')
+    args = parser.parse_args()
+
+    cache = default_cache()
+    if args.command == 'prune':
+        removed = cache.prune(args.max_mb * 2 ** 20)
+        print(f'Removed {removed} resamplings')
+    entries = cache.entries()
+    print(f'{cache.cache_dir}: {len(entries)} resamplings, {sum(size for _, size, _ in entries) / 2 ** 20:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
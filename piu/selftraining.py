@@ -0,0 +1,180 @@
+"""Self-training on the participants without sii (pseudo-labeling).
+
+The row-wise deletion of the missing targets (Missingness Handling) keeps 2733 of the 3960
+participants of train_df.csv. `SelfTrainer` puts the other 1227 to use:
+
+- round 0 fits the usual pipeline (`model.build_pipeline`) on the labeled rows;
+- every round scores the remaining unlabeled pool with the current model, adds the rows whose
+  highest class probability is at least `threshold` (the `max_per_round` most confident of them)
+  to the training set with their predicted sii, and refits.
+
+Refits are warm-started instead of retraining the pipeline: the preprocessing (and PCA) stay fitted
+on the labeled rows and the pool is transformed once, SMOTE resamples the enlarged set, and the
+classifier keeps its trees and only grows `trees_per_round` more on it (GradientBoosting stages,
+RandomForest trees or HistGradientBoosting iterations). A round therefore costs about
+`trees_per_round` trees instead of a whole fit.
+
+Every round records its time and, given a held-out labeled set, its accuracy, QWK and weighted F1
+and the gain over round 0. The unlabeled features are imputed with `piu.impute` (fitted on
+train_df.csv), except for the classifiers that handle missing values themselves.
+
+    python -m piu.selftraining --model gbm --rounds 5 --threshold 0.9 --scratch
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from piu import data, model
+from piu.evaluation import confusion_matrices, fold_scores
+
+# Parameter counting the trees / iterations of each classifier, grown by warm starts
+SIZE_PARAMS = {'gbm': 'n_estimators', 'rf': 'n_estimators', 'hgb': 'max_iter'}
+
+
+def unlabeled_data(native=False):
+    """Model features of the train_df.csv participants without sii, imputed unless `native`."""
+    df = data.load('train_df')
+    unlabeled = df[df[model.TARGET].isna()]
+    if not native:
+        from piu.impute import ImputationEngine
+
+        engine = ImputationEngine()
+        engine.fit(df[engine.columns])
+        unlabeled = engine.transform(unlabeled)
+    return model.feature_frame(unlabeled)
+
+
+def transformed(pipeline, X):
+    """X through the fitted steps of `pipeline` before the classifier (samplers only act in fit)."""
+    for _, step in pipeline.steps[:-1]:
+        if not hasattr(step, 'fit_resample'):
+            X = step.transform(X)
+    return np.asarray(X, dtype='float64')
+
+
+def holdout_scores(classifier, X, y):
+    """Accuracy, QWK and weighted F1 of `classifier` on transformed features X."""
+    scores = fold_scores(confusion_matrices(y, classifier.predict(X))[None]).iloc[0]
+    return {'accuracy': scores['accuracy'], 'qwk': scores['qwk'], 'f1_weighted': scores['f1_weighted']}
+
+
+class SelfTrainer:
+    """Pseudo-labeling rounds over a `model.build_pipeline` pipeline, warm-starting its classifier."""
+
+    def __init__(self, name='gbm', rounds=5, threshold=0.9, max_per_round=None, trees_per_round=None,
+                 random_state=42):
+        self.name = name
+        self.rounds = rounds
+        self.threshold = threshold
+        self.max_per_round = max_per_round
+        self.trees_per_round = trees_per_round
+        self.random_state = random_state
+
+    def _record(self, round_, added, size, seconds, X_test, y_test):
+        entry = {'round': round_, 'added': added, 'pseudo_labeled': len(self.pseudo_labels_),
+                 'trees': size, 'seconds': seconds}
+        if X_test is not None:
+            entry.update(holdout_scores(self.pipeline_.named_steps['classifier'], X_test, y_test))
+            entry['accuracy_gain'] = entry['accuracy'] - self.history_[0]['accuracy'] if self.history_ else 0.0
+        self.history_.append(entry)
+
+    def fit(self, X, y, X_pool, X_test=None, y_test=None):
+        """Fit on labeled X, y plus pseudo-labeled rows of X_pool; X_test, y_test score every round."""
+        y = np.asarray(y)
+        size_param = SIZE_PARAMS[self.name]
+        self.history_ = []
+        self.pseudo_index_ = np.empty(0, dtype=np.int64)
+        self.pseudo_labels_ = np.empty(0, dtype=y.dtype)
+
+        start = time.perf_counter()
+        self.pipeline_ = model.build_pipeline(self.name, random_state=self.random_state).fit(X, y)
+        classifier = self.pipeline_.named_steps['classifier']
+        sampler = self.pipeline_.named_steps.get('smote')
+        seconds = time.perf_counter() - start
+        Z, Z_pool = transformed(self.pipeline_, X), transformed(self.pipeline_, X_pool)
+        Z_test = None if X_test is None else transformed(self.pipeline_, X_test)
+        size = classifier.get_params()[size_param]
+        per_round = self.trees_per_round or max(1, size // 5)
+        self._record(0, 0, size, seconds, Z_test, y_test)
+
+        pool = np.arange(len(Z_pool))
+        for round_ in range(1, self.rounds + 1):
+            start = time.perf_counter()
+            proba = classifier.predict_proba(Z_pool[pool])
+            confidence = proba.max(axis=1)
+            chosen = np.flatnonzero(confidence >= self.threshold)
+            if self.max_per_round is not None:
+                chosen = chosen[np.argsort(-confidence[chosen], kind='stable')[:self.max_per_round]]
+            if not len(chosen):
+                break
+            self.pseudo_index_ = np.r_[self.pseudo_index_, pool[chosen]]
+            self.pseudo_labels_ = np.r_[self.pseudo_labels_, classifier.classes_[proba[chosen].argmax(axis=1)]]
+            pool = np.delete(pool, chosen)
+
+            X_fit = np.vstack([Z, Z_pool[self.pseudo_index_]])
+            y_fit = np.r_[y, self.pseudo_labels_]
+            if sampler is not None:
+                X_fit, y_fit = sampler.fit_resample(X_fit, y_fit)
+            size += per_round
+            classifier.set_params(warm_start=True, **{size_param: size})
+            classifier.fit(X_fit, y_fit)
+            self._record(round_, len(chosen), size, time.perf_counter() - start, Z_test, y_test)
+        return self
+
+    def predict(self, X):
+        return self.pipeline_.predict(X)
+
+    def predict_proba(self, X):
+        return self.pipeline_.predict_proba(X)
+
+    def report(self):
+        return pd.DataFrame(self.history_)
+
+    def scratch_baseline(self, X, y, X_pool, X_test=None, y_test=None):
+        """Time (and hold-out scores) of refitting the whole pipeline on the training set of every round."""
+        rows = []
+        for entry in self.history_:
+            n = entry['pseudo_labeled']
+            X_fit = pd.concat([X, X_pool.iloc[self.pseudo_index_[:n]]])
+            y_fit = np.r_[np.asarray(y), self.pseudo_labels_[:n]]
+            start = time.perf_counter()
+            pipeline = model.build_pipeline(self.name, random_state=self.random_state,
+                                            **{SIZE_PARAMS[self.name]: entry['trees']}).fit(X_fit, y_fit)
+            row = {'round': entry['round'], 'scratch_seconds': time.perf_counter() - start}
+            if X_test is not None:
+                scores = holdout_scores(pipeline.named_steps['classifier'], transformed(pipeline, X_test), y_test)
+                row.update({f'scratch_{key}': value for key, value in scores.items()})
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Self-train a sii model on the participants without sii.')
+    parser.add_argument('--model', default='gbm', choices=sorted(SIZE_PARAMS))
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.9, help='minimum class probability of a pseudo-label')
+    parser.add_argument('--max-per-round', type=int, default=None, help='most confident rows added per round')
+    parser.add_argument('--trees-per-round', type=int, default=None, help='trees added per round (default: 20%%)')
+    parser.add_argument('--test-size', type=float, default=0.2, help='held-out labeled share for the scores')
+    parser.add_argument('--scratch', action='store_true', help='also time full refits on the same rows')
+    args = parser.parse_args()
+
+    native = args.model in model.NATIVE_MISSING
+    X, y = model.training_data('train_df' if native else 'cleaned')
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=args.test_size, random_state=42)
+    X_pool = unlabeled_data(native)
+    trainer = SelfTrainer(args.model, args.rounds, args.threshold, args.max_per_round, args.trees_per_round)
+    trainer.fit(X_train, y_train, X_pool, X_test, y_test)
+    report = trainer.report()
+    if args.scratch:
+        report = report.merge(trainer.scratch_baseline(X_train, y_train, X_pool, X_test, y_test), on='round')
+    print(f'{args.model}: {len(X_train)} labeled rows, {len(X_pool)} unlabeled, '
+          f'{len(trainer.pseudo_labels_)} pseudo-labeled {np.bincount(trainer.pseudo_labels_, minlength=len(model.CLASSES))}')
+    print(report.to_string(index=False, float_format=lambda v: f'{v:.3f}'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+"""HTTP scoring service for the intake system, with micro-batched predictions.
+
+A single asyncio process loads a stored pipeline once (through `piu.fastpath`) and serves:
+
+- POST /score: one participant (a json object of the model features, optionally with an id) or a
+  list of them; returns the predicted sii and the class probabilities of each;
+- GET /health: model, version and queue depth, with status 503 while the queue is full;
+- GET /metrics: the `piu.metrics` registry in the Prometheus text format.
+
+Concurrent requests are not scored one by one: their rows go to a bounded queue, and a batcher
+task takes whatever arrives within `window_ms` of the first row (up to `max_batch` rows) and scores
+it with one vectorized predict_proba in a worker thread, at most `workers` batches at a time. When
+the queue is full, or `max_connections` clients are connected, requests are refused with 503 and a
+Retry-After header instead of queueing without bound, so a load balancer can route to another
+instance; a single request with more rows than the queue holds is refused with 413. Features must be
+finite numbers (missing values only for the native-missing models) and the encoded columns known
+category codes, otherwise the request gets a 400.
+
+    python -m piu.service --model gbm --port 8080
+"""
+import argparse
+import asyncio
+import json
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from piu import metrics, model
+
+MAX_BODY_BYTES = 2 ** 20
+IDLE_TIMEOUT = 30.0
+
+metrics.REGISTRY.describe('piu_score_requests_total', 'Scoring requests by HTTP status.')
+metrics.REGISTRY.describe('piu_score_seconds', 'Time from receiving a scoring request to its response.')
+metrics.REGISTRY.describe('piu_score_batch_rows', 'Participants scored per micro-batch.')
+metrics.REGISTRY.describe('piu_score_queue_rows', 'Participants waiting for a micro-batch.')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _reject(rows, invalid, reason):
+    """400 naming the first participant with an `invalid` value and its offending features."""
+    if invalid.any():
+        i = int(np.flatnonzero(invalid.any(axis=1))[0])
+        features = [f for f, bad in zip(model.FEATURES, invalid[i]) if bad]
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f'participant {i}: {reason} in {features}')
+
+
+def feature_rows(payload, allow_missing):
+    """(ids, rows x features matrix) of one participant object or a list of them."""
+    participants = payload if isinstance(payload, list) else [payload]
+    if not participants or not all(isinstance(p, dict) for p in participants):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'expected a participant object or a non-empty list of them')
+    rows = np.empty((len(participants), len(model.FEATURES)))
+    for i, participant in enumerate(participants):
+        missing = [f for f in model.FEATURES if participant.get(f) is None]
+        if missing and not allow_missing:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'participant {i}: missing features {missing}')
+        if any(isinstance(participant.get(f), bool) for f in model.FEATURES):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'participant {i}: features must be numbers')
+        try:
+            rows[i] = [np.nan if participant.get(f) is None else float(participant[f]) for f in model.FEATURES]
+        except (TypeError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'participant {i}: features must be numbers')
+
+    # NaN stands for a missing value, accepted only by the native-missing models
+    _reject(rows, np.isinf(rows) | (np.isnan(rows) & (not allow_missing)), 'non-finite values')
+    unknown = np.zeros(rows.shape, dtype=bool)
+    for j, categories in enumerate(model.ENCODED_COLUMNS.values(), start=len(model.SCALED_COLUMNS)):
+        unknown[:, j] = ~np.isin(rows[:, j], categories) & ~np.isnan(rows[:, j])
+    _reject(rows, unknown, 'unknown category codes')
+    return [p.get('id') for p in participants], rows
+
+
+class MicroBatcher:
+    """Bounded queue of feature rows, scored in batches by a pool of `workers` threads."""
+
+    def __init__(self, predict_proba, window_ms=5.0, max_batch=64, max_queue=1024, workers=1):
+        self.predict_proba = predict_proba
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.queued_rows = 0
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(workers)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='piu-score')
+        self._task = None
+
+    @property
+    def full(self):
+        return self.queued_rows >= self.max_queue
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        self._executor.shutdown(wait=True)
+
+    async def score(self, rows):
+        """Class probabilities of `rows`, scored together with the rows of concurrent requests."""
+        if len(rows) > self.max_queue:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            f'{len(rows)} participants exceed the scoring queue size ({self.max_queue})')
+        if self.queued_rows + len(rows) > self.max_queue:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, 'scoring queue is full', {'Retry-After': '1'})
+        future = asyncio.get_running_loop().create_future()
+        self.queued_rows += len(rows)
+        self._queue.put_nowait((rows, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            n_rows = len(batch[0][0])
+            deadline = loop.time() + self.window
+            while n_rows < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                n_rows += len(item[0])
+            self.queued_rows -= n_rows
+            await self._slots.acquire()
+            loop.create_task(self._score_batch(batch, n_rows))
+
+    async def _score_batch(self, batch, n_rows):
+        try:
+            rows = np.vstack([rows for rows, _ in batch])
+            proba = await asyncio.get_running_loop().run_in_executor(self._executor, self.predict_proba, rows)
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            metrics.REGISTRY.observe('piu_score_batch_rows', n_rows)
+            start = 0
+            for rows, future in batch:
+                if not future.done():
+                    future.set_result(proba[start:start + len(rows)])
+                start += len(rows)
+        finally:
+            self._slots.release()
+
+
+class ScoringService:
+    """Minimal HTTP/1.1 server around a `MicroBatcher` of one stored model."""
+
+    def __init__(self, name='gbm', version=None, window_ms=5.0, max_batch=64, max_queue=1024, workers=1,
+                 max_connections=256):
+        from piu.fastpath import CompiledPipeline
+
+        pipeline, self.metadata = model.load_artifact(name, version)
+        self.compiled = CompiledPipeline(pipeline)
+        self.name = name
+        self.allow_missing = name in model.NATIVE_MISSING
+        self.batcher = MicroBatcher(self.compiled.predict_proba, window_ms, max_batch, max_queue, workers)
+        self.max_connections = max_connections
+        self.connections = 0
+        self.server = None
+        metrics.REGISTRY.add_collector(
+            lambda: [('piu_score_queue_rows', 'gauge', {}, self.batcher.queued_rows)])
+
+    async def start(self, host='127.0.0.1', port=8080):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.close()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            if self.connections > self.max_connections:
+                await self._respond(writer, HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'too many connections'},
+                                    {'Retry-After': '1', 'Connection': 'close'})
+                return
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), IDLE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except HTTPError as error:
+                    await self._respond(writer, error.status, {'error': str(error)}, {'Connection': 'close'})
+                    return
+                if request is None:
+                    return
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._dispatch(writer, method, path, body, keep_alive)
+                if not keep_alive:
+                    return
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'malformed request line')
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'invalid Content-Length')
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'invalid Content-Length')
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'request body too large')
+        body = await reader.readexactly(length) if length else b''
+        return method, target.split('?')[0], headers, body
+
+    async def _dispatch(self, writer, method, path, body, keep_alive):
+        connection = {} if keep_alive else {'Connection': 'close'}
+        if path == '/health' and method == 'GET':
+            status = HTTPStatus.SERVICE_UNAVAILABLE if self.batcher.full else HTTPStatus.OK
+            await self._respond(writer, status, {
+                'status': 'ok' if status == HTTPStatus.OK else 'overloaded', 'model': self.name,
+                'version': self.metadata['version'], 'queued_rows': self.batcher.queued_rows,
+            }, connection)
+        elif path == '/metrics' and method == 'GET':
+            await self._respond(writer, HTTPStatus.OK, metrics.REGISTRY.render(), connection,
+                                'text/plain; version=0.0.4')
+        elif path == '/score' and method == 'POST':
+            start = time.perf_counter()
+            try:
+                status, payload, headers = HTTPStatus.OK, await self._score(body), {}
+            except HTTPError as error:
+                status, payload, headers = error.status, {'error': str(error)}, error.headers
+            metrics.REGISTRY.inc('piu_score_requests_total', status=int(status))
+            metrics.REGISTRY.observe('piu_score_seconds', time.perf_counter() - start)
+            await self._respond(writer, status, payload, {**headers, **connection})
+        elif path in ('/health', '/metrics', '/score'):
+            await self._respond(writer, HTTPStatus.METHOD_NOT_ALLOWED, {'error': f'{method} not allowed'},
+                                connection)
+        else:
+            await self._respond(writer, HTTPStatus.NOT_FOUND, {'error': f'no route {path}'}, connection)
+
+    async def _score(self, body):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'body is not valid json')
+        ids, rows = feature_rows(payload, self.allow_missing)
+        proba = await self.batcher.score(rows)
+        classes = self.compiled.classes_
+        predictions = [{
+            'id': participant_id,
+            'sii_pred': int(classes[np.argmax(p)]),
+            'proba': {str(int(c)): float(value) for c, value in zip(classes, p)},
+        } for participant_id, p in zip(ids, proba)]
+        result = predictions if isinstance(payload, list) else predictions[0]
+        return {'model': self.name, 'version': self.metadata['version'], 'predictions': result}
+
+    @staticmethod
+    async def _respond(writer, status, payload, headers=None, content_type='application/json'):
+        body = (payload if isinstance(payload, str) else json.dumps(payload)).encode()
+        lines = [f'HTTP/1.1 {int(status)} {status.phrase}', f'Content-Type: {content_type}',
+                 f'Content-Length: {len(body)}']
+        lines += [f'{key}: {value}' for key, value in (headers or {}).items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(args):
+    service = ScoringService(args.model, args.version, args.window_ms, args.max_batch, args.max_queue,
+                             args.workers, args.max_connections)
+    server = await service.start(args.host, args.port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    print(f'Serving {args.model} model version {service.metadata["version"]} on '
+          f'http://{args.host}:{server.sockets[0].getsockname()[1]}', flush=True)
+    await stop.wait()
+    await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a stored sii model over HTTP with micro-batching.')
+    parser.add_argument('--model', default='gbm', choices=sorted(model.CLASSIFIERS))
+    parser.add_argument('--version', default=None, help='model version (default: latest)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--window-ms', type=float, default=5.0, help='how long a batch waits for more rows')
+    parser.add_argument('--max-batch', type=int, default=64, help='rows per micro-batch')
+    parser.add_argument('--max-queue', type=int, default=1024, help='queued rows before refusing requests')
+    parser.add_argument('--workers', type=int, default=1, help='batches scored concurrently')
+    parser.add_argument('--max-connections', type=int, default=256)
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
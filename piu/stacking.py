@@ -0,0 +1,251 @@
+"""Stacking / soft-voting ensembles of the CV model configs, over cached out-of-fold predictions.
+
+The Model Comparison page puts GradientBoosting and RandomForest side by side; `StackingEnsemble`
+combines them (or any `piu.evaluation` configs):
+
+- every base model gets out-of-fold (OOF) predictions from stratified k-fold CV (class
+  probabilities, or the regression output of the ordinal configs) and one fit on all rows for new
+  participants; every (model, fold) fit is one task of a process pool, so the base models train
+  concurrently;
+- the OOF predictions and full fits are cached under Data/cache/stacking/ per model, with the key
+  of the evaluation cache (config, CV settings, source file hash), so adding or swapping a base
+  model only computes that model's;
+- the meta-learner is fitted on the OOF matrix in milliseconds: a multinomial logistic regression
+  ('logistic') or the mean of the base probabilities ('vote'). Its scores come from the same folds,
+  refitting it on the OOF rows of each training part.
+
+    python -m piu.stacking gbm rf --jobs 4
+    python -m piu.stacking gbm rf ordinal --meta vote
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from piu import data, jobs, model
+from piu.evaluation import (CONFIGS, CVResult, N_SPLITS, cache_key, comparison, confusion_matrices, cv_folds,
+                            fit_config, fold_transformers, native_features, training_data)
+
+CACHE_DIR = os.path.join(data.DATA_DIR, 'cache', 'stacking')
+META_LEARNERS = ['logistic', 'vote']
+
+
+def meta_values(estimator, X):
+    """Meta-features of one base model: class probabilities, or the ordinal regression output."""
+    if hasattr(estimator, 'predict_proba'):
+        return estimator.predict_proba(X)
+    return estimator.predict_value(X)[:, None]
+
+
+class SoftVote:
+    """Mean of the class-probability blocks of the meta-features (regression columns are ignored)."""
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def fit(self, Z, y):
+        if not self.blocks:
+            raise ValueError('Soft voting needs at least one base model with class probabilities')
+        self.classes_ = np.unique(y)
+        return self
+
+    def predict_proba(self, Z):
+        return np.mean([Z[:, block] for block in self.blocks], axis=0)
+
+    def predict(self, Z):
+        return self.classes_[np.argmax(self.predict_proba(Z), axis=1)]
+
+
+def make_meta_learner(kind, blocks, random_state=42):
+    if kind == 'vote':
+        return SoftVote(blocks)
+    return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000, random_state=random_state))
+
+
+class BaseModel:
+    """Cached OOF meta-features and predictions of one config, and optionally its fit on all rows."""
+
+    def __init__(self, name, config, values, predictions, seconds, pipeline=None):
+        self.name = name
+        self.config = config
+        self.values = values
+        self.predictions = predictions
+        self.seconds = seconds
+        self.pipeline = pipeline
+
+    def predict_values(self, X):
+        transformer, estimator = self.pipeline[:-1], self.pipeline[-1]
+        return meta_values(estimator, transformer.transform(X))
+
+
+def _fit_task(name, fold):
+    """(meta-features, predictions, seconds) of config `name` on one fold; fold -1 fits all rows instead."""
+    X, y, totals = jobs.state['X'], jobs.state['y'], jobs.state['totals']
+    config = jobs.state['configs'][name]
+    train_idx = np.arange(len(y)) if fold < 0 else jobs.state['folds'][fold][0]
+
+    start = time.perf_counter()
+    steps = fold_transformers(native_features(config))
+    X_train = X.iloc[train_idx]
+    for _, step in steps:
+        X_train = step.fit_transform(X_train)
+    estimator = fit_config(config, X_train, y[train_idx], None if totals is None else totals[train_idx],
+                           jobs.state['random_state'])
+    if fold < 0:
+        return Pipeline(steps + [('classifier', estimator)]), None, time.perf_counter() - start
+    X_val = X.iloc[jobs.state['folds'][fold][1]]
+    for _, step in steps:
+        X_val = step.transform(X_val)
+    return meta_values(estimator, X_val), estimator.predict(X_val), time.perf_counter() - start
+
+
+def _save_arrays(arrays, path):
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def base_models(names, configs=None, source='cleaned', n_splits=N_SPLITS, refit=True, n_jobs=1, random_state=42,
+                cache_dir=CACHE_DIR, compute=True):
+    """{name: BaseModel} of the named configs, computing only the OOF predictions / full fits not cached.
+
+    With compute=False nothing is fitted, and missing cache entries raise FileNotFoundError.
+    """
+    configs = {name: (configs or CONFIGS)[name] for name in names}
+    paths = {name: os.path.join(cache_dir, f'{name}-{cache_key(config, source, n_splits, 1, random_state)}')
+             for name, config in configs.items()}
+    X, y, totals = training_data(configs, source)
+    folds = cv_folds(y, n_splits, 1, random_state)
+
+    tasks = []
+    for name in names:
+        if not os.path.exists(paths[name] + '.npz'):
+            tasks += [(name, fold) for fold in range(n_splits)]
+        if refit and not os.path.exists(paths[name] + '.joblib'):
+            tasks.append((name, -1))
+    if tasks and not compute:
+        raise FileNotFoundError(f'No cached OOF predictions / fits of {sorted({name for name, _ in tasks})} '
+                                f'in {cache_dir}')
+    if tasks:
+        todo = {name: configs[name] for name in {name for name, _ in tasks}}
+        outputs = jobs.map_tasks(_fit_task, tasks, n_jobs, {'X': X, 'y': y, 'totals': totals, 'folds': folds,
+                                                            'configs': todo, 'random_state': random_state})
+
+        os.makedirs(cache_dir, exist_ok=True)
+        done = dict(zip(tasks, outputs))
+        for name in todo:
+            if (name, 0) in done:
+                fold_outputs = [done[(name, fold)] for fold in range(n_splits)]
+                values = np.empty((len(y), fold_outputs[0][0].shape[1]))
+                predictions = np.empty(len(y), dtype=y.dtype)
+                for (_, val_idx), (fold_values, fold_predictions, _) in zip(folds, fold_outputs):
+                    values[val_idx] = fold_values
+                    predictions[val_idx] = fold_predictions
+                seconds = sum(output[2] for output in fold_outputs)
+                arrays = {'values': values, 'predictions': predictions, 'seconds': seconds}
+                jobs.atomic_write(paths[name] + '.npz', lambda tmp_path: _save_arrays(arrays, tmp_path))
+            if (name, -1) in done:
+                pipeline = done[(name, -1)][0]
+                jobs.atomic_write(paths[name] + '.joblib', lambda tmp_path: joblib.dump(pipeline, tmp_path))
+
+    models = {}
+    for name, config in configs.items():
+        with np.load(paths[name] + '.npz') as arrays:
+            values, predictions, seconds = arrays['values'], arrays['predictions'], float(arrays['seconds'])
+        pipeline = joblib.load(paths[name] + '.joblib') if refit else None
+        models[name] = BaseModel(name, config, values, predictions, seconds, pipeline)
+    return models
+
+
+class StackingEnsemble:
+    """Meta-learner over the OOF predictions of several `piu.evaluation` configs."""
+
+    def __init__(self, names=('gbm', 'rf'), meta='logistic', source='cleaned', n_splits=N_SPLITS, n_jobs=1,
+                 random_state=42, cache_dir=CACHE_DIR):
+        self.names = list(names)
+        self.meta = meta
+        self.source = source
+        self.n_splits = n_splits
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.cache_dir = cache_dir
+
+    @property
+    def label(self):
+        kind = 'Stacking' if self.meta == 'logistic' else 'Soft voting'
+        return f'{kind} ({" + ".join(CONFIGS[name]["label"] for name in self.names)})'
+
+    def _meta_features(self, blocks):
+        columns, proba_blocks, start = [], [], 0
+        for values in blocks:
+            if values.shape[1] == len(model.CLASSES):
+                proba_blocks.append(slice(start, start + values.shape[1]))
+            columns.append(values)
+            start += values.shape[1]
+        return np.hstack(columns), proba_blocks
+
+    def fit(self, refit=True, compute=True):
+        """Base models (cached) and the meta-learner on the training rows of `source`.
+
+        With compute=False the base models must already be cached (see `base_models`).
+        """
+        self.base_ = base_models(self.names, source=self.source, n_splits=self.n_splits, refit=refit,
+                                 n_jobs=self.n_jobs, random_state=self.random_state, cache_dir=self.cache_dir,
+                                 compute=compute)
+        _, self.y_ = model.training_data(self.source)
+        self.Z_, self.blocks_ = self._meta_features([self.base_[name].values for name in self.names])
+        start = time.perf_counter()
+        self.meta_ = make_meta_learner(self.meta, self.blocks_, self.random_state).fit(self.Z_, self.y_)
+        self.meta_seconds_ = time.perf_counter() - start
+        return self
+
+    def cv_results(self):
+        """CVResults of the base models and of the ensemble on the folds of the OOF predictions."""
+        folds = cv_folds(self.y_, self.n_splits, 1, self.random_state)
+        confusion = []
+        for train_idx, val_idx in folds:
+            meta = make_meta_learner(self.meta, self.blocks_, self.random_state).fit(self.Z_[train_idx],
+                                                                                     self.y_[train_idx])
+            confusion.append(confusion_matrices(self.y_[val_idx], meta.predict(self.Z_[val_idx])))
+        results = [CVResult(name, base.config, [confusion_matrices(self.y_[val_idx], base.predictions[val_idx])
+                                                for _, val_idx in folds], 1 / self.n_splits, base.seconds)
+                   for name, base in self.base_.items()]
+        config = {'label': self.label, 'base': self.names, 'meta': self.meta}
+        results.append(CVResult(self.meta, config, confusion, 1 / self.n_splits, self.meta_seconds_))
+        return results
+
+    def predict_proba(self, X):
+        Z, _ = self._meta_features([self.base_[name].predict_values(X) for name in self.names])
+        return self.meta_.predict_proba(Z)
+
+    def predict(self, X):
+        return self.meta_.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stack or soft-vote the CV model configs on cached OOF predictions.')
+    parser.add_argument('models', nargs='*', default=None,
+                        help=f'base model configs among {", ".join(sorted(CONFIGS))} (default: gbm rf)')
+    parser.add_argument('--meta', default='logistic', choices=META_LEARNERS)
+    parser.add_argument('--source', default='cleaned', choices=['train_df', 'cleaned'])
+    parser.add_argument('--splits', type=int, default=N_SPLITS)
+    parser.add_argument('--jobs', type=int, default=1, help='worker processes (-1: all cores)')
+    parser.add_argument('--no-refit', action='store_true', help='skip the fits on all rows (OOF scores only)')
+    args = parser.parse_args()
+    unknown = [name for name in args.models or [] if name not in CONFIGS]
+    if unknown:
+        parser.error(f'unknown model configs {unknown}; choose from {sorted(CONFIGS)}')
+
+    start = time.perf_counter()
+    ensemble = StackingEnsemble(args.models or ['gbm', 'rf'], args.meta, args.source, args.splits, args.jobs)
+    ensemble.fit(refit=not args.no_refit)
+    print(f'{ensemble.label}: {time.perf_counter() - start:.1f}s, meta-learner fit {ensemble.meta_seconds_ * 1000:.1f}ms')
+    print(comparison(ensemble.cv_results()).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Summary tables shown in the EDA and Missingness sections, computed from the loaded data or its cube."""
+import numpy as np
+import pandas as pd
+
+AGE_GROUPS = ['Children (5-12)', 'Teenager (13-19)', 'Young Adults (20-22)']
+AGE_BINS = [4, 12, 19, 22]
+SEX_LABELS = {0: 'Male', 1: 'Female'}
+SII_LABELS = {0: '0 (None)', 1: '1 (Mild)', 2: '2 (Moderate)', 3: '3 (Severe)'}
+INTERNET_USE_LABELS = {0: '< 1hr/day', 1: '~ 1hr/day', 2: '~ 2hr/day', 3: '> 3hr/day'}
+MISSING = 'Missing'
+
+
+def age_group(ages):
+    return pd.cut(ages, AGE_BINS, labels=AGE_GROUPS)
+
+
+def count_pct(counts, total, digits=1):
+    """Format counts as 'count (pct%)' strings, the layout used throughout the app."""
+    return [f'{int(c)} ({100 * c / t:.{digits}f}%)' for c, t in zip(counts, total)]
+
+
+# Tables answered from the aggregate cube (piu.cube) instead of the participant rows
+CUBE_TABLES = ['age_group_counts', 'sex_counts', 'sii_by_age_group', 'internet_use_by_sex']
+
+
+def age_group_counts(cube):
+    counts = cube.marginal('age_group').reindex(AGE_GROUPS)
+    return pd.DataFrame({'Age Group': AGE_GROUPS,
+                         'Count (%)': count_pct(counts, [counts.sum()] * len(counts), digits=2)})
+
+
+def sex_counts(cube):
+    counts = cube.marginal('sex').reindex(list(SEX_LABELS))
+    return pd.DataFrame({'Basic_Demos-Sex-Category': list(SEX_LABELS.values()),
+                         'Count (%)': count_pct(counts, [counts.sum()] * len(counts), digits=2)})
+
+
+def crosstab_with_missing(table, labels, index_name, index_order, index_labels):
+    """Format a cube crosstab with a leading 'Missing' column and row totals."""
+    table = table.reindex(index=index_order, columns=[MISSING] + list(labels))
+    totals = table.sum(axis=1)
+    out = pd.DataFrame({index_name: index_labels})
+    for level in table.columns:
+        out[MISSING if level == MISSING else labels[level]] = count_pct(table[level], totals)
+    out['Total'] = totals.to_numpy()
+    return out
+
+
+def sii_by_age_group(cube):
+    return crosstab_with_missing(cube.table('age_group', 'sii'), SII_LABELS, 'Age Group', AGE_GROUPS,
+                                 AGE_GROUPS)
+
+
+def internet_use_by_sex(cube):
+    order = [1, 0]
+    return crosstab_with_missing(cube.table('sex', 'internet_use'), INTERNET_USE_LABELS, 'Gender', order,
+                                 [SEX_LABELS[code] for code in order])
+
+
+def pciat_range_by_sii(df):
+    ranges = df.groupby('sii', observed=True)['PCIAT-PCIAT_Total'].agg(['min', 'max']).astype(float)
+    return pd.DataFrame({'SII Category': ranges.index.astype(float),
+                         'Minimum PCIAT Total Score': ranges['min'].to_numpy(),
+                         'Maximum PCIAT Total Score': ranges['max'].to_numpy()})
+
+
+def pciat_imputation_summary(df):
+    """Participants with a sii by number of missing PCIAT items, and what the imputation does with them."""
+    from piu import pciat
+
+    items = df.loc[df['sii'].notna(), pciat.ITEM_COLUMNS].to_numpy(dtype='float64', na_value=np.nan)
+    n_missing = np.isnan(items).sum(axis=1)
+    _, totals, _ = pciat.score_items(items)
+    groups = [n_missing == 0, (n_missing > 0) & (n_missing <= pciat.MAX_MISSING), np.isnan(totals)]
+    return pd.DataFrame({
+        'Missing PCIAT Items': ['0', f'1-{pciat.MAX_MISSING}', f'> {pciat.MAX_MISSING}'],
+        'Participants': [int(group.sum()) for group in groups],
+        'Outcome': ['Kept as is', 'Mean-imputed (rounded)', 'PCIAT Total and sii set to missing'],
+    })
+
+
+def to_markdown(table):
+    """Render a small DataFrame as a GitHub-flavoured markdown table."""
+    header = '| ' + ' | '.join(map(str, table.columns)) + ' |'
+    rule = '|' + '|'.join('---' for _ in table.columns) + '|'
+    rows = ['| ' + ' | '.join(map(str, row)) + ' |' for row in table.itertuples(index=False)]
+    return '\n'.join([header, rule] + rows)
@@ -0,0 +1,246 @@
+"""Compiled tree ensembles: low-latency scoring of single participants and small batches in NumPy.
+
+sklearn scores a forest tree by tree, each call validating its input and walking one `Tree` object,
+so a single participant through the tuned 300-tree RandomForest costs hundreds of Python-level calls.
+`CompiledEnsemble` flattens all trees of a fitted classifier into one set of contiguous node arrays
+(split feature, float32 threshold, first child, missing-value direction; nodes in breadth-first
+order so that siblings are adjacent) plus a table of leaf outputs, and routes the rows through
+every tree at once: a few gathers and one compare per tree level over a (rows x trees) matrix of
+node positions.
+
+This removes the per-call overhead, not the per-row work: a single row is scored about 5x (boosting)
+to 100x (forest) faster than by sklearn, but sklearn's compiled traversal wins on large batches. Batches
+above `MAX_ROWS` rows are therefore handed to the original sklearn classifier, which returns the same
+probabilities.
+
+That fallback is a memory trade-off: by default a `CompiledEnsemble` keeps the sklearn classifier
+alongside its node arrays, so the process holds both (`nbytes` counts both; about 15 MiB for the
+tuned RandomForest instead of its 11.5 MiB alone). With fallback=False the classifier is dropped and
+every batch goes through the compiled arrays, which then take about a third of sklearn's memory, at
+the cost of slower large batches.
+
+The probabilities are identical to sklearn's, not just close:
+
+- sklearn compares float32 features with float64 thresholds; since a float32 x satisfies x <= t
+  exactly when x <= t rounded down to float32, thresholds are stored as float32 rounded down;
+- leaf outputs are the class fractions stored in each tree (forest) or learning_rate x leaf value
+  (boosting), precomputed with sklearn's own arithmetic;
+- the leaf outputs are summed in sklearn's order (tree by tree, stage by stage after the init
+  prediction; a reduction over a non-contiguous axis adds sequentially), then averaged (forest) or
+  passed through the same softmax (boosting).
+
+    python -m piu.trees --model rf
+"""
+import argparse
+import pickle
+import time
+
+import numpy as np
+from scipy.stats import gmean
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.utils.extmath import softmax
+
+# Rows per block of the vectorized traversal (the node matrix is rows x trees)
+BLOCK_ROWS = 1024
+# Largest batch scored by the compiled traversal; above it sklearn is faster (see `python -m piu.trees`)
+MAX_ROWS = {'forest': 2048, 'boosting': 128}
+
+
+def _threshold_float32(threshold):
+    """Largest float32 <= each float64 threshold, so float32 x <= t32 iff x <= t."""
+    low = threshold.astype(np.float32)
+    above = low.astype(np.float64) > threshold
+    low[above] = np.nextafter(low[above], np.float32(-np.inf))
+    return low
+
+
+def _breadth_first(roots, left, right, leaf):
+    """Node order visiting every tree level by level, and the new position of every node."""
+    order = []
+    for root in roots:
+        level = [root]
+        while level:
+            order.extend(level)
+            level = [child for node in level if not leaf[node] for child in (left[node], right[node])]
+    order = np.array(order)
+    new_ids = np.empty(len(order), dtype=np.int64)
+    new_ids[order] = np.arange(len(order))
+    return order, new_ids
+
+
+class CompiledEnsemble:
+    """Flattened nodes of a fitted RandomForestClassifier or GradientBoostingClassifier."""
+
+    def __init__(self, classifier, fallback=True):
+        if isinstance(classifier, RandomForestClassifier):
+            self.kind = 'forest'
+            trees = [estimator.tree_ for estimator in classifier.estimators_]
+        elif isinstance(classifier, GradientBoostingClassifier):
+            if classifier.init_ == 'zero' or getattr(classifier.init_, 'strategy', None) != 'prior':
+                raise ValueError('Only the default (prior) init estimator of GradientBoosting is supported')
+            if classifier.n_trees_per_iteration_ == 1:
+                raise ValueError('Only multiclass GradientBoosting (one tree per class and stage) is supported')
+            self.kind = 'boosting'
+            # Stage-major, like sklearn's accumulation
+            trees = [estimator.tree_ for estimator in classifier.estimators_.ravel()]
+            self.learning_rate = classifier.learning_rate
+        else:
+            raise TypeError(f'Cannot compile {type(classifier).__name__}')
+        # The sklearn classifier is only kept (and its memory held) to score the large batches
+        self.classifier = classifier if fallback else None
+        self.max_rows = MAX_ROWS[self.kind] if fallback else None
+        self.classes_ = classifier.classes_
+        self.n_features_in_ = classifier.n_features_in_
+        n_classes = len(self.classes_)
+
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        node_offsets = np.repeat(offsets, sizes)
+        left = np.concatenate([tree.children_left for tree in trees])
+        right = np.concatenate([tree.children_right for tree in trees])
+        leaf = left == -1
+        left = np.where(leaf, -1, left + node_offsets)
+        right = np.where(leaf, -1, right + node_offsets)
+        self.depth = max(tree.max_depth for tree in trees)
+
+        # Breadth-first order puts the two children of a node next to each other, so the next node
+        # is left + (x > threshold). Leaves point to themselves with an infinite threshold, so extra
+        # levels leave the rows that reached them in place.
+        order, new_ids = _breadth_first(offsets, left, right, leaf)
+        self.roots = new_ids[offsets].astype(np.int32)
+        self.left = np.where(leaf, new_ids, new_ids[left]).astype(np.int32)[order]
+        feature = np.concatenate([tree.feature for tree in trees])
+        self.feature = np.where(leaf, 0, feature).astype(np.min_scalar_type(self.n_features_in_))[order]
+        threshold = _threshold_float32(np.concatenate([tree.threshold for tree in trees]))
+        self.threshold = np.where(leaf, np.float32(np.inf), threshold)[order]
+        missing_left = np.concatenate([tree.missing_go_to_left for tree in trees]).astype(bool)
+        self.missing_right = (~missing_left & ~leaf)[order]
+
+        # Leaf outputs in a table of their own; inner nodes map to row 0
+        self.leaf_index = np.zeros(len(left), dtype=np.int32)
+        self.leaf_index[leaf] = np.arange(leaf.sum())
+        self.leaf_index = self.leaf_index[order]
+        if self.kind == 'forest':
+            # Classification trees store the class fractions of every node
+            self.leaf_value = np.concatenate([tree.value[:, 0, :n_classes] for tree in trees])[leaf]
+        else:
+            self.leaf_value = (self.learning_rate * np.concatenate([tree.value[:, 0, 0] for tree in trees]))[leaf]
+            self.n_stages = classifier.estimators_.shape[0]
+            prior = np.clip(classifier.init_.predict_proba(np.zeros((1, self.n_features_in_))),
+                            np.finfo(np.float64).eps, 1 - np.finfo(np.float64).eps, dtype=np.float64)
+            # The symmetric multinomial logit of sklearn's multinomial loss
+            self.init_raw = np.log(prior / gmean(prior, axis=1)[:, None])[0]
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def compiled_nbytes(self):
+        """Bytes of the compiled node arrays and leaf table."""
+        arrays = [self.roots, self.left, self.feature, self.threshold, self.missing_right, self.leaf_index,
+                  self.leaf_value]
+        return sum(array.nbytes for array in arrays)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the ensemble: the compiled arrays plus the (pickled size of the) sklearn fallback."""
+        fallback = 0 if self.classifier is None else len(pickle.dumps(self.classifier))
+        return self.compiled_nbytes + fallback
+
+    def _leaves(self, X):
+        """(rows x trees) leaf-table rows reached by a block of float32 rows."""
+        flat = X.ravel()
+        row_offsets = (np.arange(len(X)) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        has_missing = np.isnan(flat).any()
+        for _ in range(self.depth):
+            values = np.take(flat, row_offsets + np.take(self.feature, nodes))
+            go_right = values > np.take(self.threshold, nodes)
+            if has_missing:
+                go_right |= np.isnan(values) & np.take(self.missing_right, nodes)
+            nodes = np.take(self.left, nodes) + go_right
+        return np.take(self.leaf_index, nodes)
+
+    def _raw(self, X):
+        """Summed tree outputs of a block, added tree by tree in sklearn's order."""
+        values = np.take(self.leaf_value, self._leaves(X), axis=0)
+        if self.kind == 'forest':
+            return np.add.reduce(values, axis=1)
+        # (rows, stages, classes), with the init prediction as stage -1
+        values = values.reshape(len(X), self.n_stages, len(self.classes_))
+        init = np.broadcast_to(self.init_raw, (len(X), 1, len(self.classes_)))
+        return np.add.reduce(np.concatenate([init, values], axis=1), axis=1)
+
+    def predict_proba(self, X):
+        """Class probabilities: compiled traversal up to `max_rows` rows, the sklearn classifier above."""
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X[None, :]
+        if self.max_rows is not None and len(X) > self.max_rows:
+            return self.classifier.predict_proba(X)
+        return self.compiled_proba(X)
+
+    def compiled_proba(self, X, block_rows=BLOCK_ROWS):
+        """Class probabilities from the compiled traversal, whatever the batch size."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        raw = np.concatenate([self._raw(np.ascontiguousarray(X[start:start + block_rows]))
+                              for start in range(0, len(X), block_rows)])
+        if self.kind == 'forest':
+            return raw / self.n_trees
+        return softmax(raw)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def compile_classifier(classifier):
+    """`CompiledEnsemble` of a RandomForest / GradientBoosting classifier, other classifiers unchanged."""
+    if isinstance(classifier, (RandomForestClassifier, GradientBoostingClassifier)):
+        return CompiledEnsemble(classifier)
+    return classifier
+
+
+def _throughput(predict_proba, X, batch_size, min_seconds=0.5):
+    """Rows per second of `predict_proba` over X in batches of `batch_size`."""
+    n_rows = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        for i in range(0, len(X), batch_size):
+            predict_proba(X[i:i + batch_size])
+            n_rows += len(X[i:i + batch_size])
+            if batch_size == 1 and n_rows >= 200:
+                break
+    return n_rows / (time.perf_counter() - start)
+
+
+def main():
+    from piu import model
+    from piu.features import FeatureStore
+
+    parser = argparse.ArgumentParser(description='Compile a stored forest / boosting model and compare it with sklearn.')
+    parser.add_argument('--model', default='rf', choices=['gbm', 'rf'])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 64, 512, 4096])
+    args = parser.parse_args()
+
+    pipeline, metadata = model.load_or_train(args.model)
+    classifier = pipeline.named_steps['classifier']
+    compiled = CompiledEnsemble(classifier)
+    X = np.asarray(FeatureStore('cleaned').get('pcs')['X'])
+    difference = np.abs(compiled.compiled_proba(X) - classifier.predict_proba(X)).max()
+    print(f'{args.model} {metadata["version"]}: {compiled.n_trees} trees, max |proba difference| {difference:.3g}')
+    print(f'memory: sklearn {len(pickle.dumps(classifier)) / 2 ** 20:.1f} MiB, '
+          f'compiled with sklearn fallback {compiled.nbytes / 2 ** 20:.1f} MiB, '
+          f'compiled only (fallback=False) {compiled.compiled_nbytes / 2 ** 20:.1f} MiB')
+    for batch_size in args.batch_sizes:
+        before = _throughput(classifier.predict_proba, X, batch_size)
+        after = _throughput(compiled.compiled_proba, X, batch_size)
+        used = 'compiled' if batch_size <= compiled.max_rows else 'sklearn'
+        print(f'batch {batch_size:>5}: sklearn {before:10.0f} rows/s  compiled {after:10.0f} rows/s  '
+              f'({after / before:.1f}x, predict_proba uses {used})')
+
+
+if __name__ == '__main__':
+    main()
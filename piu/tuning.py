@@ -0,0 +1,257 @@
+"""Successive-halving hyperparameter search for the SMOTE + classifier pipelines.
+
+Replaces the exhaustive GridSearchCV runs of the Modeling section (e.g. 1536 RandomForest candidates
+x 5 folds, with SMOTE re-run in every fold of every candidate):
+
+- All candidates start on a small, nested subsample of each training fold; after every rung only
+  the best of them (1/eta, or fewer for large grids) move on to eta times more data, so only a
+  handful are ever trained on the full folds.
+- SMOTE is run once per (fold, SMOTE parameters) through `piu.resample`, and the resampled folds
+  are shared by every candidate with those SMOTE parameters (and by later runs, from disk).
+- Candidates are evaluated in a process pool; every worker memory-maps the resampled folds once.
+- Scores are checkpointed to a json file after every evaluation, and an interrupted search with the
+  same data and search space resumes where it stopped.
+
+The data, folds and scoring follow the notebook: the PCs explaining 95% of the variance (12), 80/20 split with random_state=42, 5-fold
+stratified CV on the training part and weighted F1.
+
+    python -m piu.tuning --space rf --jobs 4 --checkpoint models/tuning_rf.json
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import as_completed
+
+import numpy as np
+from sklearn.metrics import f1_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+
+from piu import jobs, model, resample
+from piu.features import FeatureStore
+
+# Search spaces of the Modeling section, with the notebook's parameter names
+SEARCH_SPACES = {
+    'smote': {
+        'classifier': 'gbm',
+        'base_params': {},
+        'grid': {
+            'smote__sampling_strategy': ['auto', 'minority'],
+            'smote__k_neighbors': [3, 4, 5, 6, 10],
+        },
+    },
+    'gbm': {
+        'classifier': 'gbm',
+        'base_params': {},
+        'grid': {
+            'classifier__n_estimators': [50, 100, 200, 300],
+            'classifier__learning_rate': [0.01, 0.05, 0.1, 0.15],
+            'classifier__max_depth': [3, 5, 7],
+        },
+    },
+    'rf': {
+        'classifier': 'rf',
+        'base_params': {},
+        'grid': {
+            'classifier__n_estimators': [50, 100, 200, 300],
+            'classifier__max_depth': [5, 10, 20, None],
+            'classifier__class_weight': ['balanced', 'balanced_subsample'],
+            'classifier__max_features': ['sqrt', 'log2', None],
+            'classifier__min_samples_split': [2, 5, 10, 20],
+            'classifier__min_samples_leaf': [1, 2, 5, 10],
+        },
+    },
+}
+
+
+def prepare_data(random_state=42):
+    """Training split of the notebook: PCs of the scaled/encoded features, 80/20 split."""
+    pcs, y = FeatureStore('cleaned').labeled('pcs')
+    X_train, _, y_train, _ = train_test_split(pcs, y, test_size=0.2, random_state=random_state)
+    return X_train, y_train
+
+
+def smote_params(params):
+    """The SMOTE settings a candidate uses (the tuned ones unless the candidate overrides them)."""
+    settings = dict(model.SMOTE_PARAMS)
+    settings.update({k.split('__', 1)[1]: v for k, v in params.items() if k.startswith('smote__')})
+    return settings
+
+
+def smote_key(params):
+    return json.dumps(smote_params(params), sort_keys=True)
+
+
+def resample_folds(X, y, folds, settings_list, random_state=42):
+    """SMOTE-resampled folds per distinct SMOTE settings: {smote_key: [(X_res, y_res, val_idx), ...]}."""
+    cache = resample.default_cache()
+    resampled = {}
+    for settings in settings_list:
+        key = json.dumps(settings, sort_keys=True)
+        if key not in resampled:
+            resampled[key] = cache.resample_folds(X, y, folds, {**settings, 'random_state': random_state})
+    return resampled
+
+
+def _setup_worker(state):
+    # The parent has already filled the resample cache, so this only memory-maps the folds
+    resampled = resample_folds(state['X'], state['y'], state.pop('folds'), state.pop('settings_list'),
+                               state['random_state'])
+    rng = np.random.default_rng(state['random_state'])
+    state['resampled'] = resampled
+    # One fixed permutation per resampled fold, so the subsamples of successive rungs are nested
+    state['orders'] = {key: [rng.permutation(len(y_res)) for _, y_res, _ in folds]
+                       for key, folds in resampled.items()}
+
+
+def _evaluate(params, fraction):
+    """Mean weighted F1 of one candidate over the folds, trained on `fraction` of each resampled fold."""
+    state = jobs.state
+    classifier_params = {**state['base_params'],
+                         **{k.split('__', 1)[1]: v for k, v in params.items() if k.startswith('classifier__')}}
+    key = smote_key(params)
+    scores = []
+    for (X_res, y_res, val_idx), order in zip(state['resampled'][key], state['orders'][key]):
+        rows = order[:max(int(math.ceil(len(order) * fraction)), 50)]
+        estimator = model.CLASSIFIERS[state['classifier']](random_state=state['random_state'], **classifier_params)
+        estimator.fit(X_res[rows], y_res[rows])
+        y_pred = estimator.predict(state['X'][val_idx])
+        scores.append(f1_score(state['y'][val_idx], y_pred, average='weighted'))
+    return float(np.mean(scores))
+
+
+def candidate_key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def _write_json(value, path):
+    with open(path, 'w') as f:
+        json.dump(value, f, indent=1)
+
+
+class SuccessiveHalvingSearch:
+    """Successive halving over a parameter grid, with shared SMOTE folds, a process pool and checkpoints."""
+
+    def __init__(self, space='rf', eta=3, min_fraction=1 / 27, n_candidates=None, cv=5, n_jobs=1,
+                 checkpoint=None, random_state=42, verbose=1):
+        self.space = space
+        self.eta = eta
+        self.min_fraction = min_fraction
+        self.n_candidates = n_candidates
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.checkpoint = checkpoint
+        self.random_state = random_state
+        self.verbose = verbose
+
+    def _candidates(self):
+        candidates = list(ParameterGrid(SEARCH_SPACES[self.space]['grid']))
+        if self.n_candidates is not None and self.n_candidates < len(candidates):
+            rng = np.random.default_rng(self.random_state)
+            picked = rng.choice(len(candidates), size=self.n_candidates, replace=False)
+            candidates = [candidates[i] for i in sorted(picked)]
+        return candidates
+
+    def _schedule(self, n_candidates):
+        """Data fraction of every rung, and the factor by which the candidates shrink between rungs.
+
+        The data grows by eta per rung from at least `min_fraction` up to the full folds; when that
+        leaves fewer rungs than needed to get down to one candidate at eta, the cut is made steeper.
+        """
+        n_rungs = min(int(math.ceil(math.log(n_candidates, self.eta))),
+                      int(math.floor(math.log(1 / self.min_fraction, self.eta) + 1e-9))) + 1
+        fractions = [float(self.eta) ** (i - n_rungs + 1) for i in range(n_rungs)]
+        shrink = max(self.eta, n_candidates ** (1 / (n_rungs - 1))) if n_rungs > 1 else 1
+        return fractions, shrink
+
+    def _signature(self, X, y, candidates):
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(X).tobytes())
+        digest.update(np.ascontiguousarray(y).tobytes())
+        digest.update(json.dumps([self.space, candidates, self.eta, self.min_fraction, self.cv,
+                                  self.random_state], sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _load_checkpoint(self, signature):
+        if self.checkpoint and os.path.exists(self.checkpoint):
+            with open(self.checkpoint) as f:
+                state = json.load(f)
+            if state.get('signature') == signature:
+                return state
+        return {'signature': signature, 'rungs': []}
+
+    def _save_checkpoint(self, state):
+        if not self.checkpoint:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint)), exist_ok=True)
+        jobs.atomic_write(self.checkpoint, lambda tmp_path: _write_json(state, tmp_path))
+
+    def fit(self, X, y):
+        start = time.perf_counter()
+        candidates = self._candidates()
+        fractions, shrink = self._schedule(len(candidates))
+        state = self._load_checkpoint(self._signature(X, y, candidates))
+
+        folds = list(StratifiedKFold(n_splits=self.cv).split(X, y))
+        settings_list = [smote_params(c) for c in candidates]
+        resample_folds(X, y, folds, settings_list, self.random_state)
+        spec = SEARCH_SPACES[self.space]
+        executor = jobs.executor(self.n_jobs, {'X': X, 'y': y, 'folds': folds, 'settings_list': settings_list,
+                                               'classifier': spec['classifier'], 'base_params': spec['base_params'],
+                                               'random_state': self.random_state}, _setup_worker)
+        try:
+            for rung, fraction in enumerate(fractions):
+                if rung == len(state['rungs']):
+                    state['rungs'].append({'fraction': fraction, 'scores': {}})
+                scores = state['rungs'][rung]['scores']
+                todo = [c for c in candidates if candidate_key(c) not in scores]
+                if self.verbose:
+                    print(f'Rung {rung}: {len(candidates)} candidates on {fraction:.0%} of each fold '
+                          f'({len(candidates) - len(todo)} restored from checkpoint)')
+
+                if executor is None:
+                    for params in todo:
+                        scores[candidate_key(params)] = _evaluate(params, fraction)
+                        self._save_checkpoint(state)
+                else:
+                    futures = {executor.submit(_evaluate, params, fraction): params for params in todo}
+                    for future in as_completed(futures):
+                        scores[candidate_key(futures[future])] = future.result()
+                        self._save_checkpoint(state)
+
+                ranked = sorted(candidates, key=lambda c: scores[candidate_key(c)], reverse=True)
+                candidates = ranked[:max(int(round(len(candidates) / shrink)), 1)]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        final_scores = state['rungs'][-1]['scores']
+        self.best_params_ = candidates[0]
+        self.best_score_ = final_scores[candidate_key(self.best_params_)]
+        self.history_ = state['rungs']
+        self.elapsed_ = time.perf_counter() - start
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Successive-halving search of the sii pipelines.')
+    parser.add_argument('--space', default='rf', choices=sorted(SEARCH_SPACES))
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--min-fraction', type=float, default=1 / 27)
+    parser.add_argument('--candidates', type=int, default=None, help='random subset of the grid')
+    parser.add_argument('--jobs', type=int, default=1, help='worker processes (-1: all cores)')
+    parser.add_argument('--checkpoint', default=None, help='json file to checkpoint to and resume from')
+    args = parser.parse_args()
+
+    X, y = prepare_data()
+    search = SuccessiveHalvingSearch(args.space, eta=args.eta, min_fraction=args.min_fraction,
+                                     n_candidates=args.candidates, n_jobs=args.jobs,
+                                     checkpoint=args.checkpoint).fit(X, y)
+    print(f'Best {args.space} parameters: {search.best_params_}')
+    print(f'Best weighted F1: {search.best_score_:.3f} ({search.elapsed_:.0f}s)')
+
+
+if __name__ == '__main__':
+    main()